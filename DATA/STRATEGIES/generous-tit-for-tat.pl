@@ -0,0 +1,9 @@
+% Generous tit-for-tat: begin with the default move and then copy the opponent's
+% last move, except that a deviation from the default move is forgiven one time in three.
+select(P, O, S, M):-
+    \+ holds(last_move(O, _LMo), S),
+    holds(default_move(P, M), S).
+select(P, O, S, M):-
+    holds(last_move(O, Mo), S),
+    holds(default_move(P, D), S),
+    (Mo == D -> M = D ; random(R), (R < 1/3 -> M = D ; M = Mo)).
\ No newline at end of file
@@ -0,0 +1,9 @@
+% Grim trigger: select the default move until the opponent deviates from it once,
+% then select the opposite of the default move for the rest of the game.
+select(P, O, S, M):-
+    holds(default_move(P, D), S),
+    (holds(last_move(O, Mo), S), Mo \= D ; holds(own_last_move(P, Mp), S), Mp \= D),
+    !,
+    opposite_move(D, M).
+select(P, _O, S, M):-
+    holds(default_move(P, M), S).
\ No newline at end of file
@@ -0,0 +1,10 @@
+% Pavlov (win-stay, lose-shift): begin with the default move. Then select the default
+% move if both players made the same move in the last round, and its opposite otherwise.
+select(P, _O, S, M):-
+    \+ holds(own_last_move(P, _Mp), S),
+    holds(default_move(P, M), S).
+select(P, O, S, M):-
+    holds(own_last_move(P, Mp), S),
+    holds(last_move(O, Mo), S),
+    holds(default_move(P, D), S),
+    (Mp == Mo -> M = D ; opposite_move(D, M)).
\ No newline at end of file
@@ -0,0 +1,5 @@
+% Seeded random: select a move at random with uniform probability. The random
+% generator of the engine is seeded by the agent, so a run can be repeated exactly.
+select(P, _O, S, M) :-
+    setof(Mi, possible(move(P, Mi), S), Moves),
+    random_member(M, Moves).
\ No newline at end of file
@@ -0,0 +1,10 @@
+% Tit-for-two-tats: select the default move unless the opponent deviated from it
+% in each of the last two rounds, then select the opposite of the default move.
+select(P, O, S, M):-
+    holds(default_move(P, D), S),
+    holds(last_move(O, Mo), S), Mo \= D,
+    holds(previous_move(O, Mp), S), Mp \= D,
+    !,
+    opposite_move(D, M).
+select(P, _O, S, M):-
+    holds(default_move(P, M), S).
\ No newline at end of file
@@ -1,11 +1,14 @@
+import asyncio
 import configparser
 from magif.agent.agent import Agent
 from magif.environment.environment import Environment
+from magif.environment.match_maker import ClonePairing
 from magif.environment.agent_pool import AgentPool
-from magif.utils.utils import read_file, Mode, normalize_path
+from magif.utils.utils import read_file, Mode, normalize_path, CacheMode
 from magif.utils.data_object import DataObject
 from lms.gpt4 import GPT4
 from lms.claude import Claude
+from magif.utils.cached_lm import CachedLM, ResponseCache
 import logging
 import os
 import pandas as pd
@@ -41,11 +44,16 @@ def main():
 	num_rounds = config.getint("Params", "num_rounds")
 	max_attempts = config.getint("Params", "max_attempts")
 
+	# Record the language models' responses, or replay them to rerun offline (modes: record, replay, passthrough)
+	llm_cache = ResponseCache(normalize_path(config.get("Paths", "LLM_CACHE")))
+	llm_cache_mode = CacheMode(config.get("Params", "llm_cache_mode"))
+
 	# Step 5: Load game descriptions
 	games_payoffs = pd.read_csv(normalize_path("DATA/MISC/payoff_sums_adjusted.csv"))
 
 	# Step 6: Run the tournament for each LLM and each game description
 	for llm_name, llm in zip(["gpt4", "claude35"],[GPT4, Claude]):
+		llm = CachedLM.wrap(llm, llm_cache, llm_cache_mode)
 		experiment_name = "experiment_1_"+llm_name
 		for idx, row in games_payoffs.iterrows():
 			game_desc_file = row["Game File"]
@@ -60,7 +68,8 @@ def main():
 									   feedback_prompt=read_file(feedback_template_path),
 									   mode=Mode.AUTOFORMALIZATION)
 				strategy_data = DataObject(rules_path=strategy_path, mode=Mode.RULES_PATH)
-				agent = Agent(game_data, strategy_data, llm=llm, max_attempts=max_attempts)
+				agent = Agent(llm=llm, max_attempts=max_attempts)
+				asyncio.run(agent.initialize(game_data, strategy_data))
 				agent_pool.add_agent(agent)
 
 			# Record original number of agents
@@ -69,13 +78,13 @@ def main():
 			# Add copies of an agent with tat-for-tit strategy
 			for i in range(valid_agents_num):
 				agent = agent_pool.valid_agents[i]
-				clone_game_data = DataObject(rules_string=agent.game.game_rules, mode=Mode.RULES_STRING)
 				clone_strategy_data = DataObject(rules_path=normalize_path("DATA/STRATEGIES/anti-tit-for-tat.pl"), mode=Mode.RULES_PATH)
-				clone = Agent(game_data=clone_game_data, strategy_data=clone_strategy_data, autoformalization_on=False)
+				# The clone shares the agent's compiled game and loads only its strategy.
+				clone = asyncio.run(agent.clone(clone_strategy_data))
 				agent_pool.add_agent(clone)
 
 			# Create matching: (original_agent, clone)
-			match_maker = lambda agents: [(agents[i], agents[i + valid_agents_num]) for i in range(valid_agents_num)]
+			match_maker = ClonePairing(valid_agents_num)
 
 			tournament = Environment(
 				agent_pool=agent_pool,
@@ -85,7 +94,7 @@ def main():
 			)
 
 			# Run the tournament
-			tournament.play_tournament()
+			asyncio.run(tournament.play_tournament())
 
 			# Remove clones for the evaluation
 			agent_pool.truncate_pool(valid_agents_num)
@@ -100,7 +109,7 @@ def main():
 			# Print winners
 			print("Winners are:")
 			for winner in winners:
-				print(f"Agent {winner.name} with strategy {winner.strategy_name} and payoff {winner.mind.get_total_payoff()}")
+				print(f"Agent {winner.name} with strategy {winner.strategy_name} and payoff {tournament.scoreboard.total(winner)}")
 
 			agent_pool.clean_agents()
 
@@ -1,9 +1,13 @@
-import itertools
+import asyncio
 import configparser
-from magif.agent.agent import Agent
+import json
+from magif.agent.agent_factory import AgentFactory
 from magif.environment.agent_pool import AgentPool
 from magif.environment.environment import Environment
-from magif.utils.utils import Mode, generate_agent_name, normalize_path
+from magif.environment.match_cache import MatchCache
+from magif.environment.match_maker import RoundRobin
+from magif.environment.evolution import payoff_matrix, replicator_dynamics, summarize_shares
+from magif.utils.utils import Mode, normalize_path
 from magif.utils.data_object import DataObject
 import logging
 import os
@@ -30,34 +34,44 @@ def main():
 	strategies_path = normalize_path(config.get("Paths", "STRATEGIES_PATH"))
 	agents_path = normalize_path(config.get("Paths", "AGENTS_PATH"))
 	num_rounds = config.getint("Params", "num_rounds")
+	generations = config.getint("Params", "generations", fallback=1000)
+	num_seeds = config.getint("Params", "num_seeds", fallback=100)
+	num_replicates = config.getint("Params", "num_replicates", fallback=0)
 
 	# Step 3: Read agents and strategies
 	strategies = [os.path.join(strategies_path, strat_name) for strat_name in os.listdir(strategies_path)]
 	agent_jsons_dir = [os.path.join(agents_path, agent) for agent in os.listdir(agents_path)]
 
-	match_maker = lambda agents: list(itertools.combinations_with_replacement(agents, 2))
+	match_maker = RoundRobin(self_play=True)
+	# The same agent is loaded for every strategy, so the matches of deterministic strategies repeat.
+	match_cache = MatchCache(config.get("Paths", "MATCH_CACHE_PATH", fallback=None))
 
 	# Step 4: Run the tournament for each agent (game definition)
 	experiment_name = "experiment_3"
 	for agent_json_dir in agent_jsons_dir:
 
+		# Each game is compiled once, and its agents load only their strategies into the engine of the game.
+		factories = []
+		for agent_json in os.listdir(agent_json_dir):
+			with open(os.path.join(agent_json_dir, agent_json)) as f:
+				game_rules = json.load(f)["game_rules"]
+			factories.append(AgentFactory(DataObject(rules_string=game_rules, mode=Mode.RULES_STRING)))
+
 		agent_pool = AgentPool()
 		for strategy_path in strategies:
-			for agent_json in os.listdir(agent_json_dir):
-				agent = Agent(agent_json=os.path.join(agent_json_dir,agent_json), autoformalization_on=False)
+			for factory in factories:
 				strategy_data = DataObject(rules_path=strategy_path, mode=Mode.RULES_PATH)
-				agent.set_strategy(strategy_data)
-				agent.name = generate_agent_name(3)
-				agent_pool.add_agent(agent)
+				agent_pool.add_agent(asyncio.run(factory.create(strategy_data)))
 
 		tournament = Environment(
 			agent_pool=agent_pool,
 			num_rounds=num_rounds,
-			match_maker=match_maker
+			match_maker=match_maker,
+			match_cache=match_cache
 		)
 
 		# Run the tournament
-		tournament.play_tournament()
+		asyncio.run(tournament.play_tournament())
 		winners = tournament.get_winners()
 
 		exp_dir = os.path.join(OUT_DIR, experiment_name)
@@ -66,9 +80,26 @@ def main():
 		# Print winners
 		print("Winners are:")
 		for winner in winners:
-			print(f"Agent {winner.name} with strategy {winner.strategy_name} and payoff {winner.mind.get_total_payoff()}")
+			print(f"Agent {winner.name} with strategy {winner.strategy_name} and payoff {tournament.scoreboard.total(winner)}")
+
+		# Evolve populations of the strategies with the average payoffs of the tournament
+		strategy_names, matrix = payoff_matrix(tournament.match_summaries)
+		mean_shares, std_shares = summarize_shares(
+			replicator_dynamics(matrix, generations=generations, num_seeds=num_seeds, seed=0))
+		print(f"Strategy shares after {generations} generations of replicator dynamics:")
+		for strategy_name, mean_share, std_share in zip(strategy_names, mean_shares[-1], std_shares[-1]):
+			print(f"{strategy_name}: {mean_share:.3f} +/- {std_share:.3f}")
+
+		# Replicate the tournament with seeded stochastic strategies
+		if num_replicates > 0:
+			replication = asyncio.run(tournament.replicate(num_replicates, base_seed=0))
+			print(f"Strategy payoffs over {num_replicates} replicates (95% confidence intervals):")
+			for strategy_name, payoff in replication.strategy_payoffs.items():
+				print(f"{strategy_name}: {payoff.mean:.2f} [{payoff.low:.2f}, {payoff.high:.2f}]")
 
 		agent_pool.clean_agents()
+		for factory in factories:
+			factory.release()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,15 @@
+import asyncio
 import itertools
 import configparser
 from magif.agent.agent import Agent
 from magif.environment.agent_pool import AgentPool
 from magif.environment.environment import Environment
-from magif.utils.utils import read_file, Mode, generate_agent_name, normalize_path
+from magif.environment.match_maker import ClonePairing
+from magif.utils.utils import read_file, Mode, generate_agent_name, normalize_path, CacheMode
 from magif.utils.data_object import DataObject
 from lms.gpt4 import GPT4
 from lms.claude import Claude
+from magif.utils.cached_lm import CachedLM, ResponseCache
 import logging
 import os
 
@@ -41,8 +44,13 @@ def main():
 	target_payoffs = [int(payoff) for payoff in target_payoffs.split(";")]
 	max_attempts = config.getint("Params", "max_attempts")
 
+	# Record the language models' responses, or replay them to rerun offline (modes: record, replay, passthrough)
+	llm_cache = ResponseCache(normalize_path(config.get("Paths", "LLM_CACHE")))
+	llm_cache_mode = CacheMode(config.get("Params", "llm_cache_mode"))
+
 	# Step 3: Run the tournament providing the path to strategies descriptions
 	for llm_name, llm in zip(["gpt4", "claude35"],[GPT4, Claude]):
+		llm = CachedLM.wrap(llm, llm_cache, llm_cache_mode)
 		experiment_name = "experiment_4_"+llm_name
 		for i in range(5):
 			agent_pool = AgentPool()
@@ -52,11 +60,12 @@ def main():
 					strategy_desc = read_file(os.path.join(strategies_path,strategy_path))
 					prompt = read_file(strategy_template_path).format(strategy_description=strategy_desc)
 
-					agent = Agent(agent_json=agent_json, max_attempts=max_attempts)
+					agent = Agent(llm=llm, max_attempts=max_attempts)
+					asyncio.run(agent.initialize(agent_json_path=agent_json))
 					strategy_data = DataObject(nl_description=strategy_desc, instruction_prompt=prompt,
 											   feedback_prompt=read_file(feedback_template_path),
 											   mode=Mode.AUTOFORMALIZATION, name=strategy_name)
-					agent.set_strategy(strategy_data)
+					asyncio.run(agent.set_strategy(strategy_data))
 					agent.name = generate_agent_name(3)
 					agent_pool.add_agent(agent)
 
@@ -66,13 +75,13 @@ def main():
 			# Add copies of an agent with tat-for-tit strategy
 			for i in range(valid_agents_num):
 				agent = agent_pool.valid_agents[i]
-				clone_game_data = DataObject(rules_string=agent.game.game_rules, mode=Mode.RULES_STRING)
-				clone_strategy_data = DataObject(rules_path="../DATA/STRATEGIES/anti-tit-for-tat.pl", mode=Mode.RULES_PATH)
-				clone = Agent(game_data=clone_game_data, strategy_data=clone_strategy_data, autoformalization_on=False)
+				clone_strategy_data = DataObject(rules_path=normalize_path("DATA/STRATEGIES/anti-tit-for-tat.pl"), mode=Mode.RULES_PATH)
+				# The clone shares the agent's compiled game and loads only its strategy.
+				clone = asyncio.run(agent.clone(clone_strategy_data))
 				agent_pool.add_agent(clone)
 
 			# Create matching: (original_agent, clone)
-			match_maker = lambda agents: [(agents[i], agents[i + valid_agents_num]) for i in range(valid_agents_num)]
+			match_maker = ClonePairing(valid_agents_num)
 
 			tournament = Environment(
 				agent_pool=agent_pool,
@@ -82,7 +91,7 @@ def main():
 			)
 
 			# Run the tournament
-			tournament.play_tournament()
+			asyncio.run(tournament.play_tournament())
 
 			# Remove clones for the evaluation
 			agent_pool.truncate_pool(valid_agents_num)
@@ -97,7 +106,7 @@ def main():
 			# Print winners
 			print("Winners are:")
 			for winner in winners:
-				print(f"Agent {winner.name} with strategy {winner.strategy_name} and payoff {winner.mind.get_total_payoff()}")
+				print(f"Agent {winner.name} with strategy {winner.strategy_name} and payoff {tournament.scoreboard.total(winner)}")
 
 			agent_pool.clean_agents()
 
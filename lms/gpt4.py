@@ -1,13 +1,15 @@
-from magif.utils.base_lm import BaseLM
+from magif.utils.base_lm import BaseLM, ERROR_RESPONSE
 from magif.utils.setup_logger import logger
-from openai import OpenAI
-from typing import List, Optional, Dict
+from openai import AsyncOpenAI, OpenAI
+from typing import Any, List, Optional, Dict
+import asyncio
 
 
 class GPT4(BaseLM):
 	"""
 	GPT-4 class for managing interactions specific to the GPT-4 model.
 	"""
+	provider = "openai"
 
 	def __init__(
 			self,
@@ -27,6 +29,9 @@ class GPT4(BaseLM):
 		"""
 		super().__init__()
 		self.client = OpenAI()
+		# The async client, created in the event loop it is used in.
+		self._async_client: Optional[AsyncOpenAI] = None
+		self._async_loop: Optional[asyncio.AbstractEventLoop] = None
 		self._save_history = save_history
 		self.temperature = temperature
 		self.model = model
@@ -57,6 +62,39 @@ class GPT4(BaseLM):
 		Returns:
 			str: The response from the GPT-4 model.
 		"""
+		self._prepare(instruction)
+
+		# Generate response from GPT-4
+		try:
+			response = self.client.chat.completions.create(**self._request(max_tokens))
+			return self._receive(response)
+		except Exception as e:
+			logger.error(f"Error while prompting GPT-4: {e}")
+			return ERROR_RESPONSE
+
+	async def _aprompt(self, instruction: str, max_tokens: int) -> str:
+		"""
+		Prompt the GPT-4 model with an instruction through the async client.
+		"""
+		self._prepare(instruction)
+		try:
+			response = await self._get_async_client().chat.completions.create(**self._request(max_tokens))
+			return self._receive(response)
+		except Exception as e:
+			logger.error(f"Error while prompting GPT-4: {e}")
+			return ERROR_RESPONSE
+
+	def _get_async_client(self) -> AsyncOpenAI:
+		# The client's connections belong to an event loop, so a new loop gets a new client.
+		loop = asyncio.get_running_loop()
+		if self._async_loop is not loop:
+			self._async_client, self._async_loop = AsyncOpenAI(), loop
+		return self._async_client
+
+	def _prepare(self, instruction: str) -> None:
+		"""
+		Add the instruction to the messages, resetting them first if history is not saved.
+		"""
 		logger.debug(f"Prompting instruction: {instruction}")
 
 		# Prepare the message for the current prompt
@@ -65,25 +103,26 @@ class GPT4(BaseLM):
 			self.__set_messages()  # Reset messages if history is not saved
 		self.messages.append(user_message)
 
-		# Generate response from GPT-4
-		try:
-			response = self.client.chat.completions.create(
-				model=self.model,
-				messages=self.messages,
-				max_tokens=max_tokens,
-				temperature=self.temperature
-			)
-			content = response.choices[0].message.content
-			logger.debug(f"Received response: {content}")
-
-			# Add the response to history if saving is enabled
-			if self.save_history:
-				self.add_response(content)
-
-			return content
-		except Exception as e:
-			logger.error(f"Error while prompting GPT-4: {e}")
-			return "An error occurred while generating the response."
+	def _request(self, max_tokens: int) -> Dict[str, Any]:
+		return {
+			"model": self.model,
+			"messages": self.messages,
+			"max_tokens": max_tokens,
+			"temperature": self.temperature
+		}
+
+	def _receive(self, response) -> str:
+		"""
+		Extract the content of a response, adding it to the history if saving is enabled.
+		"""
+		content = response.choices[0].message.content
+		logger.debug(f"Received response: {content}")
+
+		# Add the response to history if saving is enabled
+		if self.save_history:
+			self.add_response(content)
+
+		return content
 
 	def add_response(self, response: str) -> None:
 		"""
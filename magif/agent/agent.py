@@ -1,16 +1,29 @@
+import asyncio
+import copy
+import itertools
 import json
 from lms.gpt4 import GPT4
 import os.path
 from magif.game.game import Game
+from magif.game.payoff_tensor import PayoffTensor
 from magif.agent.mind import Mind
 from magif.agent.memory import Memory
+from magif.agent.seat import Seat, seat_seed
+from magif.agent.snapshot import RuleStore, read_snapshot, write_snapshot
+from magif.agent.strategy_library import NativeStrategy, STRATEGY_LIBRARY, create_native_strategy
 from magif.autoformalizer.autoformalizer import Autoformalizer
 from magif.solver.solver import Solver
+from magif.solver.solver_utils import solver_source
 from magif.utils.setup_logger import logger
 from magif.utils.data_object import DataObject
 from magif.utils.base_lm import BaseLM
-from magif.utils.utils import AgentStatus, Mode, generate_agent_name, read_file, parse_axioms, process_trace, set_default, normalize_path
-from typing import Optional
+from magif.utils.utils import AgentStatus, Mode, generate_agent_name, read_file, parse_axioms, process_trace, set_default
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+# Names of the strategy modules of agents sharing a solver engine.
+_strategy_modules = itertools.count()
+
 
 class Agent:
 	"""
@@ -27,6 +40,11 @@ class Agent:
 	    autoformalizer (Optional[Autoformalizer]): Handles autoformalization logic; None if disabled.
 	    mind (Mind): Handles the agent's interaction with the environment and decision-making.
 	    strategy_name (str): Name of the strategy used by the agent (default: "unnamed_strategy").
+	    native_strategy (Optional[NativeStrategy]): Native implementation of a library strategy, used instead of
+	        solver queries to select moves; None if the strategy is not in the library.
+	    native_check_interval (int): Every how many moves the native strategy is cross-checked against the solver.
+	    seed (Optional[int]): Seed of the solver's and the native strategy's random generators.
+	    default_seat (Seat): The legacy seat, playing with the agent's own memory and solver state.
 	    moves (list): List of moves made by the agent during the game.
 	    payoffs (list): List of payoffs received by the agent in different rounds.
 		websocket (WebSocket): A websocket instance to send messages to UI.
@@ -36,7 +54,8 @@ class Agent:
 				 llm: Optional[BaseLM] = GPT4,
 				 max_attempts: Optional[int] = 1,
 				 autoformalization_on: Optional[bool] = True,
-				 websocket: Optional["WebSocket"] = None):
+				 websocket: Optional["WebSocket"] = None,
+				 num_candidates: Optional[int] = 1):
 		"""
 		Initializes an empty Agent.
 
@@ -45,19 +64,19 @@ class Agent:
 		    max_attempts (Optional[int]): Maximum number of attempts for autoformalization attempts (default is 1).
 		    autoformalization_on (Optional[bool]): Flag to enable autoformalization functionality (default is True).
 			websocket (WebSocket): A websocket instance to send messages to UI.
-
+		    num_candidates (Optional[int]): Number of candidates drafted concurrently in the first autoformalization
+		        attempt (default is 1).
 
 		Raises:
 		    ValueError: If neither the required data nor the JSON configuration is provided.
 		"""
 		# Initialize memory and game objects to manage state.
-		self.memory = Memory()
 		self.game = Game()
+		self.memory = Memory(table=self.game.move_table)
 		self.websocket = websocket
 
-		# Load the solver logic and initialize the solver.
-		solver_string = read_file(normalize_path("magif/solver/solver.pl"))
-		self.solver = Solver(solver_string)
+		# Initialize the solver with the game-independent logic; its engine starts when first used.
+		self.solver = Solver(solver_source())
 
 		# Set status
 		self.status = AgentStatus.INITIALIZING
@@ -65,11 +84,20 @@ class Agent:
 		# Set the agent's status and initialize autoformalizer if enabled.
 		self.autoformalization_on = autoformalization_on
 		self.max_attempts = max_attempts
-		self.autoformalizer = Autoformalizer(llm, max_attempts=max_attempts) if self.autoformalization_on else None
+		self.autoformalizer = Autoformalizer(llm, max_attempts=max_attempts, num_candidates=num_candidates) if self.autoformalization_on else None
 
 		self.mind = None
 		self.strategy_name = "unnamed_strategy"
 
+		# Native implementations of library strategies, cross-checked against the solver.
+		self.use_native_strategy = True
+		self.native_strategy: Optional[NativeStrategy] = None
+		self.native_check_interval = 10
+		self.seed: Optional[int] = None
+
+		# The seat used when the agent plays outside of a match-local seat.
+		self.default_seat = Seat(self, legacy=True)
+
 	async def initialize(self,
 				   game_data: Optional[DataObject] = None,
 				   strategy_data: Optional[DataObject] = None,
@@ -130,7 +158,7 @@ class Agent:
 			"gameMoves": game.game_moves,
 			"gamePlayers": game.game_players,
 			"defaultMove": game.default_move,
-			"moves": self.memory.moves,
+			"moves": list(self.memory.moves),
 			"traceMessages": trace_messages,
 			"attempts": attempts
 		}
@@ -167,6 +195,55 @@ class Agent:
 		"""
 		await self.initialize(agent_json=agent_json)
 	
+	@staticmethod
+	async def load_many(agent_json_paths: Sequence[str], max_concurrency: int = 4,
+						progress: Optional[Callable[[int, int, "Agent"], None]] = None) -> List["Agent"]:
+		"""
+		Load agents from JSON files concurrently.
+
+		Every file is parsed, and its agent's rules validated, in a pool of worker threads; the solver of each agent
+		runs in its own Prolog process, so the validations proceed in parallel. A file that cannot be loaded fails
+		only its own agent, whose status is set to LOAD_ERROR.
+
+		Args:
+		    agent_json_paths (Sequence[str]): The paths of the agent JSON files.
+		    max_concurrency (int): The maximum number of agents loaded at once (default: 4).
+		    progress (Optional[Callable[[int, int, Agent], None]]): Called with the number of agents loaded, the
+		        number of files and the agent just loaded, as each agent is loaded.
+
+		Returns:
+		    List[Agent]: The agents, in the order of the paths.
+		"""
+		loop = asyncio.get_running_loop()
+		agents: List[Optional[Agent]] = [None] * len(agent_json_paths)
+
+		with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+			async def load(i: int, path: str):
+				return i, await loop.run_in_executor(executor, Agent._load_json_file, path)
+
+			loads = [load(i, path) for i, path in enumerate(agent_json_paths)]
+			for loaded, next_load in enumerate(asyncio.as_completed(loads), 1):
+				i, agent = await next_load
+				agents[i] = agent
+				if progress is not None:
+					progress(loaded, len(agents), agent)
+		return agents
+
+	@staticmethod
+	def _load_json_file(agent_json_path: str) -> "Agent":
+		"""
+		Load an agent from a JSON file in a worker thread, with an event loop of its own.
+		"""
+		agent = Agent(autoformalization_on=False)
+		try:
+			asyncio.run(agent.initialize(agent_json_path=agent_json_path))
+		except Exception as e:
+			logger.error(f"Could not load agent from {agent_json_path}: {e}")
+			agent.release_solver()
+			agent.name = os.path.splitext(os.path.basename(agent_json_path))[0]
+			agent.status = AgentStatus.LOAD_ERROR
+		return agent
+
 	async def iterate_rules(self, prolog_code: str):
 		"""
 		Iterate through the rules of the solver, game, and strategy.
@@ -198,12 +275,60 @@ class Agent:
   
 		await self.send_message(f"User interaction recorded: { move }", logger.debug)
   
+	def take_seat(self, match_index: Optional[int] = None, position: int = 0) -> Seat:
+		"""
+		Take a new seat for a match, with its own history and round facts over the agent's shared rules.
+
+		The seat's native strategy draws its own random sequence: for a seeded agent, one derived from the agent's
+		seed, the match index and the seat's position in the match; otherwise, or without a match index, an
+		unseeded one.
+
+		Args:
+			match_index (Optional[int]): Position of the match in the tournament's match order.
+			position (int): Position of the seat in the match (default: 0).
+
+		Returns:
+			Seat: The match-local seat.
+		"""
+		seed = None if self.seed is None or match_index is None else seat_seed(self.seed, match_index, position)
+		return Seat(self, seed=seed)
+
+	def leave_seat(self, seat: Seat) -> None:
+		"""
+		Merge the history and status of a finished match into the agent.
+
+		Args:
+			seat (Seat): A seat taken with `take_seat`.
+		"""
+		if seat.legacy:
+			return
+		self.memory.moves.extend(seat.memory.moves)
+		self.memory.opponent_moves.extend(seat.memory.opponent_moves)
+		self.memory.payoffs.extend(seat.memory.payoffs)
+		if seat.status != AgentStatus.CORRECT:
+			self.status = seat.status
+		if seat.native_strategy is None and self.native_strategy is not None:
+			# The native strategy did not match the solver in this match.
+			self.native_strategy = None
+
 	def release_solver(self):
 		"""
 		Releases Prolog solver thread.
 		"""
 		self.solver.release()
 
+	def __enter__(self) -> "Agent":
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback) -> None:
+		self.release_solver()
+
+	async def __aenter__(self) -> "Agent":
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+		self.release_solver()
+
 	async def _init_from_data(self, game_data: DataObject, strategy_data: DataObject):
 		"""
 		Initializes the agent using game and strategy data.
@@ -248,7 +373,7 @@ class Agent:
 		else:
 			await self.send_message(f"Agent's {self.name} initialization failed with status {self.status.value}.", logger.info)
 
-	def autoformalize(self, parser, trace_processor):
+	async def autoformalize(self, parser, trace_processor):
 		"""
 		Uses the autoformalizer to generate formal game rules and process feedback.
 
@@ -261,7 +386,7 @@ class Agent:
 			tuple: A pair containing the formalized rules (str) and the status (AgentStatus).
 		"""
 		# Delegates the autoformalization process to the autoformalizer.
-		rules, status = self.autoformalizer.autoformalize(self, parser, trace_processor)
+		rules, status = await self.autoformalizer.autoformalize(self, parser, trace_processor)
 		return rules, status
 
 	async def set_game(self, game_object: DataObject, reload_solver=True):
@@ -277,11 +402,12 @@ class Agent:
 		    tuple: A tuple containing a boolean indicating success (True if the game is set correctly)
 		           and the current status of the agent.
 		"""
-		# Clear the current game string in the solver.
+		# Clear the current game string in the solver and the payoffs extracted from it.
 		self.solver.game_string = None
+		self.game.payoff_tensor = None
 
 		# Process the game data object to extract rules and update status.
-		self.game.game_rules, self.status = self._process_data_object(game_object, reload_solver)
+		self.game.game_rules, self.status = await self._process_data_object(game_object, reload_solver)
 		self.solver.game_string = self.game.game_rules
 
 		# If not in autoformalization mode, load the rules into the solver.
@@ -294,6 +420,9 @@ class Agent:
 			valid_move = self._extract_default_move()
 			if not valid_variables or not valid_move:
 				self.status = AgentStatus.MISSING_PREDICATES
+			else:
+				self._extract_payoff_tensor()
+				self._set_native_strategy()
 
 		# Return whether the game setup was successful and the current status.
 		return self.status == AgentStatus.CORRECT, self.status
@@ -313,9 +442,10 @@ class Agent:
 		"""
 		# Clear the current strategy string in the solver.
 		self.solver.strategy_string = None
+		self.native_strategy = None
 
 		# Process the strategy data object to extract rules and update status.
-		self.game.strategy_rules, self.status = self._process_data_object(strategy_object, reload_solver)
+		self.game.strategy_rules, self.status = await self._process_data_object(strategy_object, reload_solver)
 		self.solver.strategy_string = self.game.strategy_rules
 
 		# If not in autoformalization mode, load the rules into the solver.
@@ -330,21 +460,47 @@ class Agent:
 				# Extract the strategy name from the file path.
 				self.strategy_name = strategy_object.rules_path.split(os.path.sep)[-1][:-3]
 
+			# Use the native implementation if the strategy is in the library.
+			self._set_native_strategy()
+
 		# Return whether the strategy setup was successful and the current status.
 		return self.status == AgentStatus.CORRECT, self.status
 
-	def clone(self, agent_json_path, strategy_path="DATA/STRATEGIES/anti-tit-for-tat.pl"):
-		clone = Agent(agent_json=agent_json_path, autoformalization_on=False)  # load a dummy agent from json file
-		clone.name = generate_agent_name(3)
+	async def clone(self, strategy_data: DataObject, name: Optional[str] = None) -> "Agent":
+		"""
+		Create an agent for this agent's game with another strategy, copying the game instead of loading it again.
 
-		game_data = DataObject(rules_string=self.game.game_rules, mode=Mode.RULES_STRING)  # copy the game formalization to the clone
-		strategy_data = DataObject(rules_path=normalize_path(strategy_path), mode=Mode.RULES_PATH)  # the clone should use the anti-tit-for-tat strategy
-		clone.set_game(game_data)
-		clone.set_strategy(strategy_data)
+		The clone shares this agent's solver engine, where the game is already compiled and validated, and loads
+		only its strategy, into a Prolog module of its own. It plays in match-local seats, selecting moves in the
+		state of each match. Releasing the clone unloads its strategy, and the engine stops once this agent and
+		all its clones are released. While they share the engine, their default move cannot be updated and they
+		cannot play in legacy seats, whose round facts are kept in the engine.
 
+		Args:
+		    strategy_data (DataObject): The strategy data object of the clone.
+		    name (Optional[str]): The name of the clone (default: a generated name).
+
+		Returns:
+		    Agent: The clone, whose status is this agent's if the game has not been set up correctly.
+		"""
+		clone = Agent(autoformalization_on=False, websocket=self.websocket)
+		clone.name = name if name is not None else generate_agent_name(3)
+		clone.use_native_strategy = self.use_native_strategy
+		clone.native_check_interval = self.native_check_interval
+		clone.game = copy.copy(self.game)
+		clone.game.strategy_rules = None
+		clone.memory = Memory(table=clone.game.move_table)
+		clone.solver = self.solver.with_strategy_module(f"strategy_{next(_strategy_modules)}")
+		clone.mind = Mind(clone)
+
+		if not self.game.game_players or self.game.default_move is None:
+			clone.status = self.status
+			return clone
+
+		await clone.set_strategy(strategy_data, reload_solver=False)
 		return clone
 
-	def _process_data_object(self, data_object: DataObject, reload_solver=True):
+	async def _process_data_object(self, data_object: DataObject, reload_solver=True):
 		"""
 		Processes a data object to extract rules based on its mode.
 
@@ -377,7 +533,7 @@ class Agent:
 				self.reload_solver()
 
 			# Perform autoformalization and return the results.
-			return self.autoformalize(parse_axioms, process_trace)
+			return await self.autoformalize(parse_axioms, process_trace)
 		else:
 			raise RuntimeError(f"Unknown mode {data_object.mode}")
 
@@ -425,11 +581,80 @@ class Agent:
 
 		return names_success and moves_success
 
+	def _extract_payoff_tensor(self) -> bool:
+		"""
+		Extract the payoffs of all players for every move profile from the solver in a single enumeration.
+
+		The tensor is optional: if the game cannot be enumerated, payoffs are queried from the solver each round.
+
+		Returns:
+			bool: True if a non-empty payoff tensor was extracted, False otherwise.
+		"""
+		success, payoff_tensor = self.solver.get_payoff_tensor(self.game.game_players)
+		if success and len(payoff_tensor) > 0:
+			self.game.set_payoff_tensor(payoff_tensor)
+			return True
+
+		logger.debug(f"Payoff tensor not extracted for agent {self.name}, payoffs will be queried from the solver.")
+		return False
+
+	def _set_native_strategy(self) -> bool:
+		"""
+		Set the native implementation of the agent's strategy if it is a library strategy used in a two-player game.
+
+		Returns:
+			bool: True if a native strategy is used, False if moves are selected by the solver.
+		"""
+		self.native_strategy = None
+		name = self.strategy_name.replace('.', '')
+		if not self.use_native_strategy or name not in STRATEGY_LIBRARY or self.game.strategy_rules is None:
+			return False
+		if len(self.game.game_players) != 2 or self.game.default_move is None:
+			return False
+
+		success, opposite_move = self.solver.get_opposite_move(self.game.default_move)
+		if not success:
+			logger.debug(f"No opposite move for agent {self.name}, strategy {name} will be run by the solver.")
+			return False
+
+		self.native_strategy = create_native_strategy(name, self.game.default_move, opposite_move[0],
+													  self.game.game_moves, seed=self.seed)
+		return True
+
+	def set_seed(self, seed: int) -> bool:
+		"""
+		Seed the solver's and the native strategy's random generators, so that stochastic strategies can be replayed.
+
+		Args:
+			seed (int): The seed.
+
+		Returns:
+			bool: True if the solver was seeded, False otherwise.
+		"""
+		self.seed = seed
+		if self.native_strategy is not None:
+			self.native_strategy.reseed(seed)
+		success, _ = self.solver.set_seed(seed)
+		return success
+
 	def reload_solver(self):
 		"""
-		Reloads the solver. Note that each time the solver is reloaded it has to be updated in the agent's mind.
+		Reloads the solver, releasing the previous one. Note that each time the solver is reloaded it has to be updated
+		in the agent's mind.
+		"""
+		self.replace_solver(Solver(*self.solver.get_params()))
+
+	def replace_solver(self, solver: Solver):
+		"""
+		Replaces the solver, e.g. with one where rules were validated, releasing the previous one and updating the
+		agent's mind.
+
+		Args:
+		    solver (Solver): The new solver.
 		"""
-		self.solver = Solver(*self.solver.get_params())
+		previous = self.solver
+		self.solver = solver
+		previous.release()
 		self.mind.solver = self.solver
 
 	def _extract_default_move(self) -> bool:
@@ -459,13 +684,20 @@ class Agent:
 			bool: True if the update was successful, False otherwise.
 
 		Raises:
-			ValueError: If the move is not in the set of possible moves.
+			ValueError: If the move is not in the set of possible moves, or if the agent shares its solver engine
+				with its clones, which would all see the new default move.
 		"""
 		if not self._is_valid_move(move):
 			raise ValueError(f"The move '{move}' is not in the set of possible moves!")
+		if self.solver.shares_engine:
+			raise ValueError(f"Agent {self.name} shares its solver engine, so its default move cannot be updated.")
 
 		# Apply the default move update in the solver
-		return self.solver.update_default_move(move)
+		success, data = self.solver.update_default_move(move)
+		if success:
+			self.game.default_move = move
+			self._set_native_strategy()
+		return success, data
 
 	def _is_valid_move(self, move: str) -> bool:
 		"""
@@ -495,8 +727,8 @@ class Agent:
 			"game_moves": game.game_moves,
 			"game_players": game.game_players,
 			"default_move": game.default_move,
-			"moves": self.memory.moves,
-			"payoffs": self.memory.payoffs,
+			"moves": list(self.memory.moves),
+			"payoffs": list(self.memory.payoffs),
 			"total_payoff": self.mind.get_total_payoff(),
 			"trace_messages": trace_messages,
 			"attempts": attempts
@@ -522,6 +754,115 @@ class Agent:
 		with open(os.path.join(save_dir, f"agent_{self.name}.json"), "w") as f:
 			json.dump(agent_data, f, indent=2, default=set_default)
 
+	def save_snapshot(self, save_dir: str, rule_store_dir: Optional[str] = None) -> str:
+		"""
+		Saves the agent as a binary snapshot, `agent_<name>.snap`, restored with `Agent.restore`.
+
+		The snapshot holds the agent's metadata, its histories as interned move codes and int64 or float64 payoffs, and the
+		fingerprints of its rules, which are kept once per distinct program in a content-addressed rule store.
+		The JSON written by `save` remains the export format.
+
+		Args:
+		    save_dir (str): The directory where the snapshot will be saved.
+		    rule_store_dir (Optional[str]): The directory of the rule store (default: `rules` in save_dir).
+
+		Returns:
+		    str: The path of the snapshot.
+		"""
+		store = RuleStore(rule_store_dir if rule_store_dir is not None else os.path.join(save_dir, "rules"))
+		game = self.game
+		tensor = game.payoff_tensor
+		meta = {
+			"name": self.name,
+			"strategy_name": self.strategy_name,
+			"status": self.status.value,
+			"game_rules": store.put(game.game_rules),
+			"strategy_rules": store.put(game.strategy_rules),
+			"game_moves": game.game_moves,
+			"game_players": game.game_players,
+			"default_move": game.default_move,
+			"payoff_tensor": [[profile, payoffs] for profile, payoffs in tensor.entries.items()] if tensor else None,
+			"opposite_move": self.native_strategy.opposite_move if self.native_strategy is not None else None,
+			"use_native_strategy": self.use_native_strategy,
+			"seed": self.seed,
+			"trace_messages": self.autoformalizer.trace_messages if self.autoformalizer else [],
+			"attempts": self.autoformalizer.attempts if self.autoformalizer else 0,
+		}
+		path = os.path.join(save_dir, f"agent_{self.name}.snap")
+		write_snapshot(path, meta, self.memory.moves, self.memory.opponent_moves, self.memory.payoffs)
+		return path
+
+	@classmethod
+	async def restore(cls, snapshot_path: str, rule_store_dir: Optional[str] = None) -> "Agent":
+		"""
+		Restores an agent from a snapshot written by `save_snapshot`.
+
+		If the stored rules still match their fingerprints, they are exactly the rules the agent was validated
+		with, so the game is restored from the snapshot's metadata instead of being queried from the rules again.
+		The rules are still consulted and checked by the solver when its engine starts, which is deferred until the
+		agent plays again, unless the agent has a seed to apply. Otherwise the agent is initialized again from the
+		rules found.
+
+		Args:
+		    snapshot_path (str): The path of the snapshot.
+		    rule_store_dir (Optional[str]): The directory of the rule store (default: `rules` next to the snapshot).
+
+		Returns:
+		    Agent: The restored agent.
+
+		Raises:
+		    FileNotFoundError: If the rules of the agent are not in the rule store.
+		"""
+		meta, moves, opponent_moves, payoffs = read_snapshot(snapshot_path)
+		if rule_store_dir is None:
+			rule_store_dir = os.path.join(os.path.dirname(snapshot_path), "rules")
+		store = RuleStore(rule_store_dir)
+
+		rules, unchanged = {}, True
+		for key in ("game_rules", "strategy_rules"):
+			if meta[key] is None:
+				rules[key] = None
+				continue
+			rules[key], matches = store.get(meta[key])
+			if rules[key] is None:
+				raise FileNotFoundError(f"No rules {meta[key]} in rule store {rule_store_dir}")
+			unchanged = unchanged and matches
+
+		agent = cls(autoformalization_on=False)
+		agent.mind = Mind(agent)
+		agent.name = meta["name"]
+		agent.use_native_strategy = meta["use_native_strategy"]
+		agent.seed = meta["seed"]
+		agent.memory.moves = moves
+		agent.memory.opponent_moves = opponent_moves
+		agent.memory.payoffs = payoffs
+
+		if not unchanged:
+			logger.warning(f"Rules of agent {agent.name} changed since its snapshot, validating them again.")
+			await agent._init_game_and_strategy(DataObject(rules_string=rules["game_rules"], mode=Mode.RULES_STRING),
+												DataObject(rules_string=rules["strategy_rules"], mode=Mode.RULES_STRING,
+														   name=meta["strategy_name"]))
+			if agent.seed is not None:
+				agent.set_seed(agent.seed)
+			return agent
+
+		game = agent.game
+		game.game_rules, game.strategy_rules = rules["game_rules"], rules["strategy_rules"]
+		game.game_moves, game.game_players, game.default_move = meta["game_moves"], meta["game_players"], meta["default_move"]
+		if meta["payoff_tensor"] is not None:
+			game.set_payoff_tensor(PayoffTensor(game.game_players, {tuple(profile): tuple(payoffs)
+																	for profile, payoffs in meta["payoff_tensor"]}))
+		agent.strategy_name = meta["strategy_name"]
+		agent.status = AgentStatus(meta["status"])
+		agent.solver = Solver(solver_source(), game.game_rules, game.strategy_rules)
+		if meta["opposite_move"] is not None:
+			agent.native_strategy = create_native_strategy(agent.strategy_name.replace('.', ''), game.default_move,
+														   meta["opposite_move"], game.game_moves, seed=agent.seed)
+		if agent.seed is not None:
+			# The engine's random generator must be seeded too, which starts the engine.
+			agent.set_seed(agent.seed)
+		return agent
+
 	def load(self, agent_json_path: Optional[str], agent_json: Optional[str]):
 		"""
 		Loads the agent's state from a JSON file.
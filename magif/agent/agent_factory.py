@@ -0,0 +1,104 @@
+from typing import Iterable, List, Optional
+from magif.agent.agent import Agent
+from magif.agent.mind import Mind
+from magif.utils.data_object import DataObject
+
+
+class AgentFactory:
+	"""
+	Creates agents for one game that differ only in their strategies.
+
+	The game is validated and compiled once, into the solver engine of a template agent, and its moves, players,
+	default move and payoff tensor are extracted once. Every agent created is a clone of the template: it shares
+	the template's engine and copies its game, and loads only its strategy, into a Prolog module of its own.
+
+	The agents share the state facts of the engine, so they must play in match-local seats, which set the state
+	of their match for every move; this is the default of the tournament environment.
+
+	Attributes:
+		game_data (DataObject): The game data object.
+		template (Optional[Agent]): The agent holding the compiled game, once compiled.
+	"""
+
+	def __init__(self, game_data: Optional[DataObject] = None):
+		"""
+		Initializes the factory.
+
+		Args:
+			game_data (Optional[DataObject]): The game data object; rules given as a string or a path are compiled
+				on the first agent created.
+		"""
+		self.game_data = game_data
+		self.template: Optional[Agent] = None
+
+	@classmethod
+	def from_agent(cls, agent: Agent) -> "AgentFactory":
+		"""
+		Create a factory for the game of an initialized agent, reusing the game compiled in its engine.
+
+		Args:
+			agent (Agent): The agent, which the factory's agents will share the engine of.
+
+		Returns:
+			AgentFactory: The factory.
+		"""
+		factory = cls()
+		factory.template = agent
+		return factory
+
+	@property
+	def valid(self) -> bool:
+		"""
+		Whether the game was compiled and its players, moves and default move extracted.
+		"""
+		return self.template is not None and bool(self.template.game.game_players) and \
+			self.template.game.default_move is not None
+
+	async def compile(self) -> bool:
+		"""
+		Validate and compile the game, if not done yet.
+
+		Returns:
+			bool: True if the game is valid, False otherwise.
+		"""
+		if self.template is None:
+			template = Agent(autoformalization_on=False)
+			template.name = "game"
+			template.mind = Mind(template)
+			await template.set_game(self.game_data, reload_solver=False)
+			self.template = template
+		return self.valid
+
+	async def create(self, strategy_data: DataObject, name: Optional[str] = None) -> Agent:
+		"""
+		Create an agent playing the game with a strategy.
+
+		Args:
+			strategy_data (DataObject): The strategy data object.
+			name (Optional[str]): The name of the agent (default: a generated name).
+
+		Returns:
+			Agent: The agent, whose status is the game's if the game is not valid.
+		"""
+		await self.compile()
+		return await self.template.clone(strategy_data, name)
+
+	async def create_many(self, strategies: Iterable[DataObject]) -> List[Agent]:
+		"""
+		Create one agent per strategy.
+
+		Args:
+			strategies (Iterable[DataObject]): The strategy data objects.
+
+		Returns:
+			List[Agent]: The agents, in the order of the strategies.
+		"""
+		return [await self.create(strategy_data) for strategy_data in strategies]
+
+	def release(self) -> None:
+		"""
+		Release the template's reference to the engine of the compiled game; the engine stops once the factory's
+		agents are released as well.
+		"""
+		if self.template is not None:
+			self.template.release_solver()
@@ -1,5 +1,282 @@
-class Memory:
+from collections.abc import Sequence
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+import numpy as np
+
+
+class MoveTable:
+	"""
+	An intern table of moves: every distinct move, a string or a tuple of the moves observed in an n-player round,
+	gets a small integer code, so histories store codes instead of references to move objects.
+
+	Games have a handful of moves, so the memories of all agents of a game share the game's table.
+
+	Attributes:
+		values (List[Any]): The moves, indexed by code.
+	"""
+
 	def __init__(self):
-		self.payoffs = []  # List to store the agent's payoffs over time
-		self.moves = []  # List to store the agent's moves
-		self.opponent_moves = []  # List to store the opponent's moves
\ No newline at end of file
+		self.values: List[Any] = []
+		self._codes: Dict[Hashable, int] = {}
+
+	def code(self, move: Hashable) -> int:
+		"""
+		Get the code of a move, interning it if it is new.
+		"""
+		code = self._codes.get(move)
+		if code is None:
+			code = self._codes[move] = len(self.values)
+			self.values.append(move)
+		return code
+
+	def __len__(self) -> int:
+		return len(self.values)
+
+
+
+class History(Sequence):
+	"""
+	A typed, growable history of values with the accessors of a list.
+
+	Values are stored in a NumPy array that doubles its capacity as it fills, so appending is amortized constant
+	time and `view` returns the stored values without copying them. Reading an element or a slice returns plain
+	Python values, as from a list.
+
+	With a window, only the last `window` values are kept, in a ring buffer. The history still counts every value
+	appended: `len` and indices are positions since the first value, slices are clipped to the values kept, and
+	reading an element that is no longer kept raises an IndexError.
+
+	Attributes:
+		window (Optional[int]): The number of values kept, or None to keep them all.
+	"""
+	dtype = np.float64
+
+	def __init__(self, values: Iterable = (), window: Optional[int] = None):
+		if window is not None and window < 1:
+			raise ValueError("The window of a history must hold at least one value.")
+		self.window = window
+		self._count = 0
+		self._data = np.empty(window if window is not None else 16, dtype=self.dtype)
+		self.extend(values)
+
+	def _encode(self, values: Iterable) -> np.ndarray:
+		return np.asarray(list(values), dtype=self._data.dtype)
+
+	def _encode_one(self, value: Any) -> Any:
+		return value
+
+	def _decode(self, items: np.ndarray) -> list:
+		return items.tolist()
+
+	def _decode_one(self, item) -> Any:
+		return item.item()
+
+	def append(self, value: Any) -> None:
+		item = self._encode_one(value)
+		if self.window is None:
+			if self._count == len(self._data):
+				self._resize(2 * len(self._data))
+			self._data[self._count] = item
+		else:
+			self._data[self._count % self.window] = item
+		self._count += 1
+
+	def extend(self, values: Iterable) -> None:
+		items = self._encode(values)
+		if len(items) == 0:
+			return
+		if self.window is None:
+			if self._count + len(items) > len(self._data):
+				self._resize(max(2 * len(self._data), self._count + len(items)))
+			self._data[self._count:self._count + len(items)] = items
+		else:
+			# Only the last `window` of the new values can be kept.
+			kept = items[-self.window:]
+			first = self._count + len(items) - len(kept)
+			self._data[np.arange(first, first + len(kept)) % self.window] = kept
+		self._count += len(items)
+
+	def _resize(self, capacity: int) -> None:
+		data = np.empty(capacity, dtype=self._data.dtype)
+		data[:self._count] = self._data[:self._count]
+		self._data = data
+
+	@property
+	def start(self) -> int:
+		"""
+		The position of the oldest value kept.
+		"""
+		return 0 if self.window is None else max(0, self._count - self.window)
+
+	def _items(self, start: int, stop: int, step: int = 1) -> np.ndarray:
+		if self.window is None and step > 0:
+			return self._data[start:stop:step]
+		positions = np.arange(start, stop, step)
+		return self._data[positions if self.window is None else positions % self.window]
+
+	def __len__(self) -> int:
+		return self._count
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(self._count)
+			positions = range(start, stop, step)
+			# Positions of values that are no longer kept are dropped.
+			if step > 0:
+				positions = positions[max(0, -((start - self.start) // step)):] if start < self.start else positions
+			else:
+				positions = range(start, max(stop, self.start - 1), step)
+			if len(positions) == 0:
+				return []
+			return self._decode(self._items(positions.start, positions.stop, positions.step))
+		if index < 0:
+			index += self._count
+		if not self.start <= index < self._count:
+			raise IndexError("history index out of range")
+		return self._decode_one(self._data[index if self.window is None else index % self.window])
+
+	def __iter__(self) -> Iterator:
+		return iter(self[:])
+
+	def __reversed__(self) -> Iterator:
+		return reversed(self[:])
+
+	def __eq__(self, other) -> bool:
+		if isinstance(other, (History, list, tuple)):
+			return self[:] == list(other)
+		return NotImplemented
+
+	def __repr__(self) -> str:
+		return repr(self[:])
+
+	def view(self) -> np.ndarray:
+		"""
+		Get the values kept, oldest first, as a NumPy array.
+
+		The array shares the history's storage unless the window has wrapped around, in which case it is a copy.
+		It stays valid when values are appended, but does not show them.
+		"""
+		if self.window is None or self._count <= self.window:
+			return self._data[:self._count]
+		return self._items(self.start, self._count)
+
+
+class MoveHistory(History):
+	"""
+	A history of moves, stored as codes of a move table in the smallest unsigned integer type that holds them.
+
+	Attributes:
+		table (MoveTable): The table of the codes.
+	"""
+	dtype = np.uint8
+
+	def __init__(self, values: Iterable = (), window: Optional[int] = None, table: Optional[MoveTable] = None):
+		self.table = table if table is not None else MoveTable()
+		super().__init__(values, window)
+
+	def _encode(self, values: Iterable) -> np.ndarray:
+		codes = [self.table.code(value) for value in values]
+		if codes:
+			self._fit(max(codes))
+		return np.asarray(codes, dtype=self._data.dtype)
+
+	def _encode_one(self, value: Any) -> int:
+		code = self.table.code(value)
+		self._fit(code)
+		return code
+
+	def _fit(self, code: int) -> None:
+		"""
+		Widen the stored codes if a code does not fit their type.
+		"""
+		if code > np.iinfo(self._data.dtype).max:
+			self._data = self._data.astype(np.min_scalar_type(code))
+
+	def _decode(self, items: np.ndarray) -> list:
+		values = self.table.values
+		return [values[code] for code in items.tolist()]
+
+	def _decode_one(self, item) -> Any:
+		return self.table.values[int(item)]
+
+	def __contains__(self, value) -> bool:
+		code = self.table._codes.get(value)
+		return code is not None and bool((self.view() == code).any())
+
+
+class PayoffHistory(History):
+	"""
+	A history of payoffs, stored as int64 while every payoff is an integer and widened to float64 by the first
+	fractional payoff, so that integer payoffs read back, and serialize, as integers. Payoffs that are not numbers,
+	e.g. strings or None, raise a TypeError.
+	"""
+	dtype = np.int64
+
+	def _encode(self, values: Iterable) -> np.ndarray:
+		items = np.asarray(list(values))
+		if len(items):
+			self._fit(items.dtype)
+		return items.astype(self._data.dtype)
+
+	def _encode_one(self, value: Any) -> Any:
+		self._fit(np.asarray(value).dtype)
+		return value
+
+	def _fit(self, dtype: np.dtype) -> None:
+		"""
+		Widen the stored payoffs if payoffs of a type do not fit theirs.
+
+		Raises:
+			TypeError: If the payoffs are not numbers.
+		"""
+		if dtype.kind not in "biuf":
+			raise TypeError(f"Payoffs must be numbers, not values of type {dtype}.")
+		if dtype.kind not in "biu" and self._data.dtype.kind != "f":
+			self._data = self._data.astype(np.float64)
+
+
+class Memory:
+	"""
+	The histories of an agent: its moves, the moves it observed and its payoffs.
+
+	Moves are stored as codes of a move table and payoffs as int64 or float64, in histories that behave as lists.
+	Assigning a list to a history replaces it with a history of the list's values.
+
+	Attributes:
+		moves (MoveHistory): The agent's moves.
+		opponent_moves (MoveHistory): The observed moves: the opponent's move in a two-player game, or the tuple
+			of the opponents' moves in an n-player game.
+		payoffs (PayoffHistory): The agent's payoffs.
+		window (Optional[int]): The number of rounds kept, or None to keep all rounds.
+		table (MoveTable): The table of the move codes, usually the game's.
+	"""
+
+	def __init__(self, window: Optional[int] = None, table: Optional[MoveTable] = None):
+		self.window = window
+		self.table = table if table is not None else MoveTable()
+		self.moves = []
+		self.opponent_moves = []
+		self.payoffs = []
+
+	@property
+	def moves(self) -> MoveHistory:
+		return self._moves
+
+	@moves.setter
+	def moves(self, values: Iterable) -> None:
+		self._moves = MoveHistory(values, self.window, self.table)
+
+	@property
+	def opponent_moves(self) -> MoveHistory:
+		return self._opponent_moves
+
+	@opponent_moves.setter
+	def opponent_moves(self, values: Iterable) -> None:
+		self._opponent_moves = MoveHistory(values, self.window, self.table)
+
+	@property
+	def payoffs(self) -> PayoffHistory:
+		return self._payoffs
+
+	@payoffs.setter
+	def payoffs(self, values: Iterable) -> None:
+		self._payoffs = PayoffHistory(values, self.window)
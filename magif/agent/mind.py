@@ -1,7 +1,10 @@
+from magif.agent.seat import Seat
 from magif.utils.setup_logger import logger
 from magif.utils.utils import AgentStatus
 from typing import Optional
+import asyncio
 import json
+import logging
 
 class Mind:
 	"""
@@ -9,12 +12,17 @@ class Mind:
 
     The agent:
     1. Acts, by selecting a move in a given round.
-    2. Perceives the opponent move and adds it to the memory.
+    2. Perceives the opponents' moves and adds them to the memory.
     3. Revises by calculating the payoff based on all players' moves in the given round, and updates the last opponent
     move in the solver, which may influence the strategy in the next round.
 
+    Each step takes the seat the agent plays in; without one, the agent's default seat is used, with the agent's
+    own memory and solver state.
+
     Attributes:
         agent (Agent): The agent instance to manage the decision-making and memory.
+        offload_queries (bool): Whether solver queries run in a worker thread, so that matches of other agents
+            can proceed on the event loop while this agent's engine is busy.
     """
 
 	def __init__(self,
@@ -26,22 +34,56 @@ class Mind:
 			agent (Agent): The agent instance.
 		"""
 		self.agent = agent
+		self.offload_queries = False
+
+	async def _query(self, query, *args):
+		"""
+		Run a blocking solver query, in a worker thread if queries are offloaded.
+
+		Args:
+			query (Callable): A solver method.
+			*args: Arguments of the solver method.
+
+		Returns:
+			Any: The result of the solver method.
+		"""
+		if self.offload_queries:
+			return await asyncio.to_thread(query, *args)
+		return query(*args)
 
-	async def observe(self, opponent_move):
+	async def observe(self, opponent_move, seat: Optional[Seat] = None):
 		"""
 		Observe the opponent move in the current round and add it to memory.
 
 		Args:
-			opponent_move (str): The move made by the opponent in the current round.
+			opponent_move (Union[str, Sequence[str]]): The move made by the opponent in the current round, or the
+				moves of all opponents, in the order of the agent's other players, in an n-player game.
+			seat (Optional[Seat]): The seat the agent plays in (default: the agent's default seat).
 		"""
+		seat = seat or self.agent.default_seat
 		if not self.agent.solver:
 			await self.send_message(f"Agent {self.agent.name} cannot update payoff due to an uninitialized solver.", logger.debug)
-			self.agent.status = AgentStatus.RUNTIME_ERROR
+			seat.status = AgentStatus.RUNTIME_ERROR
 			return False
 
 		# Log the opponent's move
-		self.agent.memory.opponent_moves.append(opponent_move)
-  
+		if isinstance(opponent_move, list):
+			opponent_move = tuple(opponent_move)
+		seat.memory.opponent_moves.append(opponent_move)
+
+	def _reports(self, level: int) -> bool:
+		"""
+		Check whether a message of the given level would be logged or sent to the UI, so that per-move messages are
+		only formatted when someone reads them.
+
+		Args:
+			level (int): The logging level of the message.
+
+		Returns:
+			bool: True if the message would be used.
+		"""
+		return self.agent.websocket is not None or logger.isEnabledFor(level)
+
 	async def send_message(self, message: str, logger):
 		logger(message)
       
@@ -57,92 +99,191 @@ class Mind:
    
 		return
    
-	async def think(self):
+	async def think(self, seat: Optional[Seat] = None):
 		"""
 		Revise the agent's state based on the most recent moves and update its solver.
 
 		This method performs the following steps:
 		1. Validates that the agent's memory of moves and game players is initialized and sufficiently populated.
-		2. Calculates the agent's payoff for the last move using the solver.
-		3. Updates the solver state with the opponent's last move.
+		2. Calculates the agent's payoff for the last moves of all players from the payoff tensor, falling back
+		   to a solver query if the profile is not in the tensor.
+		3. Updates the solver state, or the round facts of a match-local seat, with the opponents' last moves.
 		4. Logs the payoff and the opponent's last move for future reference.
 
+		Args:
+			seat (Optional[Seat]): The seat the agent plays in (default: the agent's default seat).
+
 		Returns:
 		    Optional[bool]:
 		        - `True` if the payoff was successfully calculated and the solver state was updated.
 		        - `False` if the payoff calculation or solver update failed.
 		        - `None` if the memory or game player data is not initialized or too short.
 		"""
-		if not self.agent.memory.moves or not self.agent.memory.opponent_moves or not self.agent.game.game_players:
-			self.agent.status = AgentStatus.RUNTIME_ERROR
+		seat = seat or self.agent.default_seat
+		memory = seat.memory
+		if not memory.moves or not memory.opponent_moves or not self.agent.game.game_players:
+			seat.status = AgentStatus.RUNTIME_ERROR
 			await self.send_message(f"Memory of moves or player names not initialised!", logger.debug)
 			return None
-		if len(self.agent.memory.moves) < 1 or len(self.agent.memory.opponent_moves) < 1 or len(
+		if len(memory.moves) < 1 or len(memory.opponent_moves) < 1 or len(
 				self.agent.game.game_players) < 2:
-			self.agent.status = AgentStatus.RUNTIME_ERROR
+			seat.status = AgentStatus.RUNTIME_ERROR
 			await self.send_message(f"Memory of moves or player names not too short!", logger.debug)
 			return None
 
-		# Step 2: Calculate payoff using the solver
-		opponent_move = self.agent.memory.opponent_moves[-1]
-		opponent_name = self.agent.game.game_players[1]
-		payoff_success, payoff = self.agent.solver.calculate_payoff(self.agent.game.game_players[0], opponent_name,
-													self.agent.memory.moves[-1], opponent_move)
-		if not payoff_success:
-			# TODO re-formalize
-			self.agent.status = AgentStatus.RUNTIME_ERROR
-			await self.send_message(f"Payoff not calculated!", logger.debug)
+		# Step 2: Calculate payoff from the payoff tensor, or using the solver if no tensor was extracted
+		players = self.agent.game.game_players
+		opponent_moves = self._opponent_moves(memory.opponent_moves[-1])
+		moves = [memory.moves[-1]] + opponent_moves
+		if len(moves) != len(players):
+			seat.status = AgentStatus.RUNTIME_ERROR
+			await self.send_message(f"Number of moves does not match the number of players!", logger.debug)
 			return False
 
-		# Step 3: Update the solver state with the opponent's last move
-		update_success, _ = self.agent.solver.update_opponent_last_move(opponent_name, opponent_move)
-		if not update_success:
-			#TODO re-formalize
-			self.agent.status = AgentStatus.RUNTIME_ERROR
-			await self.send_message(f"Opponent's last move not updated!", logger.debug)
-			return False
+		payoff_tensor = self.agent.game.payoff_tensor
+		payoff = payoff_tensor.payoff(moves) if payoff_tensor is not None else None
+		if payoff is None:
+			payoff_success, payoff = await self._query(self.agent.solver.calculate_payoff, players[0], players, moves)
+			if not payoff_success:
+				# TODO re-formalize
+				seat.status = AgentStatus.RUNTIME_ERROR
+				await self.send_message(f"Payoff not calculated!", logger.debug)
+				return False
+
+		# Step 3: Update the round facts with the opponents' last moves. A match-local seat keeps them itself and
+		# sets them in the solver when selecting a move. A native strategy selects moves from memory, so the
+		# solver state of the default seat is only brought up to date when the strategy is cross-checked.
+		opponents = list(zip(players[1:], opponent_moves))
+		if not seat.legacy:
+			seat.record_round(players[0], moves[0], opponents)
+		elif seat.native_strategy is None:
+			update_success, _ = await self._query(self.agent.solver.record_round, players[0], moves[0], opponents)
+			if not update_success:
+				#TODO re-formalize
+				seat.status = AgentStatus.RUNTIME_ERROR
+				await self.send_message(f"Opponent's last move not updated!", logger.debug)
+				return False
 
 		# Step 4: Log the successful update and store the payoff
-		self.agent.memory.payoffs.append(payoff)
-		await self.send_message(f"Agent {self.agent.name} received payoff: {payoff} and logged opponent's move: {opponent_move}", logger.info)
+		memory.payoffs.append(payoff)
+		if self._reports(logging.INFO):
+			await self.send_message(f"Agent {self.agent.name} received payoff: {payoff} and logged opponent's move: {memory.opponent_moves[-1]}", logger.info)
 		return True
 
-	async def act(self):
+	@staticmethod
+	def _opponent_moves(observed) -> list:
+		"""
+		Normalize an observation to the list of opponents' moves.
+
+		Args:
+			observed (Union[str, Sequence[str]]): A single opponent's move or the moves of all opponents.
+
+		Returns:
+			list: The opponents' moves, in the order of the agent's other players.
+		"""
+		if isinstance(observed, (list, tuple)):
+			return list(observed)
+		return [observed]
+
+	async def act(self, seat: Optional[Seat] = None):
 		"""
         The agent makes a move in the tournament.
 
         Uses the solver to determine the next move based on the current game state.
         If a move is successfully selected, it is stored in the agent's move history.
 
+        Args:
+            seat (Optional[Seat]): The seat the agent plays in (default: the agent's default seat).
+
         Returns:
         	Optional[str]: The move selected by the agent, or None if no valid move is made.
         """
+		seat = seat or self.agent.default_seat
 		if not self.agent.solver:
 			# await self.send_message()
-			self.agent.status = AgentStatus.RUNTIME_ERROR
+			seat.status = AgentStatus.RUNTIME_ERROR
 			return None
 
 		if not self.agent.game.game_players:
 			await self.send_message(f"Agent {self.agent.name} is unable to play due to lack of players names.", logger.debug)
-			self.agent.status = AgentStatus.RUNTIME_ERROR
+			seat.status = AgentStatus.RUNTIME_ERROR
 			return None
 
 		agent_name = self.agent.game.game_players[0]
-		await self.send_message(f"Agent {self.agent.name} with strategy {self.agent.strategy_name} is making a move.", logger.debug)
+		if self._reports(logging.DEBUG):
+			await self.send_message(f"Agent {self.agent.name} with strategy {self.agent.strategy_name} is making a move.", logger.debug)
 
-		# Step 1: Attempt to get a move using the solver
-		success, move = self.agent.solver.select_move(agent_name)
+		# Step 1: Attempt to get a move from the native strategy, or using the solver
+		if seat.native_strategy is not None:
+			success, move = await self._select_native_move(agent_name, seat)
+		else:
+			success, move = await self._select_solver_move(agent_name, seat)
 		if success:
 			#TODO re-formalize
-			self.agent.memory.moves.append(move)
-			await self.send_message(f"Agent {self.agent.name} with strategy {self.agent.strategy_name} made move: {move}", logger.info)
+			seat.memory.moves.append(move)
+			if self._reports(logging.INFO):
+				await self.send_message(f"Agent {self.agent.name} with strategy {self.agent.strategy_name} made move: {move}", logger.info)
 			return move
 
 		# If no move is selected, log the error and update status
 		await self.send_message(f"Agent {self.agent.name} did not select a move!", logger.debug)
-		self.agent.status = AgentStatus.RUNTIME_ERROR
+		seat.status = AgentStatus.RUNTIME_ERROR
 		return None
 
+	async def _select_solver_move(self, agent_name: str, seat: Seat):
+		"""
+		Select a move with the solver, from the solver state for the default seat, or with the seat's round facts
+		set in the solver for a match-local seat.
+
+		Args:
+			agent_name (str): The name of the agent's player in the game.
+			seat (Seat): The seat the agent plays in.
+
+		Returns:
+			Tuple[bool, Any]: (True, selected move) or (False, error message).
+		"""
+		if seat.legacy:
+			return await self._query(self.agent.solver.select_move, agent_name)
+		return await self._query(self.agent.solver.select_move_in_state, agent_name, seat.fact_terms())
+
+	async def _select_native_move(self, agent_name: str, seat: Seat):
+		"""
+		Select a move with the agent's native strategy, cross-checking it against the solver every
+		`native_check_interval` moves.
+
+		On a mismatch the native strategy is dropped and the agent falls back to the solver, whose Prolog
+		definition is the reference.
+
+		Args:
+			agent_name (str): The name of the agent's player in the game.
+			seat (Seat): The seat the agent plays in.
+
+		Returns:
+			Tuple[bool, Any]: (True, selected move) or (False, error message).
+		"""
+		native = seat.native_strategy
+		memory = seat.memory
+		own_moves, opponent_moves = memory.moves, memory.opponent_moves
+		if seat.history_start:
+			own_moves, opponent_moves = own_moves[seat.history_start:], opponent_moves[seat.history_start:]
+		move = native.select(own_moves, opponent_moves)
+		if len(memory.moves) % self.agent.native_check_interval != 0:
+			return True, move
+
+		# Bring the solver state of the default seat up to date with the last two rounds and compare the moves.
+		if seat.legacy:
+			opponent_name = self.agent.game.game_players[1]
+			for own_move, opponent_move in zip(own_moves[-2:], opponent_moves[-2:]):
+				await self._query(self.agent.solver.record_round, agent_name, own_move, [(opponent_name, opponent_move)])
+		success, solver_move = await self._select_solver_move(agent_name, seat)
+		if success and str(solver_move) in map(str, native.support(own_moves, opponent_moves)):
+			return True, move
+
+		logger.warning(f"Native strategy {native.name} of agent {self.agent.name} does not match the solver "
+					   f"(native {move}, solver {solver_move}), falling back to the solver.")
+		seat.native_strategy = None
+		return success, solver_move
+
 	def get_total_payoff(self, log=True) -> float:
 		"""
 		Get the total payoff accumulated by the agent.
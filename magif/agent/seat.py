@@ -0,0 +1,137 @@
+import copy
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from magif.agent.memory import Memory
+from magif.agent.strategy_library import DETERMINISTIC_RULES, NativeStrategy
+from magif.utils.utils import AgentStatus, fingerprint
+
+
+def seat_seed(seed: int, match_index: int, position: int) -> int:
+	"""
+	Derive the seed of a seat's native strategy from the agent's seed, so that every match of a stochastic strategy
+	draws its own random sequence, the same however the matches are scheduled.
+
+	Args:
+		seed (int): The agent's seed.
+		match_index (int): Position of the match in the tournament's match order.
+		position (int): Position of the seat in the match.
+
+	Returns:
+		int: A 32-bit seed.
+	"""
+	return int(np.random.SeedSequence([seed, match_index, position]).generate_state(1)[0])
+
+
+class Seat:
+	"""
+	An agent's place in a single match.
+
+	A seat holds everything a match changes: the match history, the round facts read by strategies
+	(`own_last_move`, `last_move` and `previous_move`), the status and the state of a native strategy. The
+	agent's compiled rules stay in its solver and are shared by all of its seats, so one agent can play many
+	matches at once, including against itself, without being copied. The solver selects a move for the seat
+	with the seat's round facts set in the engine for the duration of the query.
+
+	The agent's default seat is the legacy seat: it uses the agent's own memory, status and native strategy,
+	and keeps the round facts in the engine between queries, so they carry over from one match to the next unless
+	the solver state is restored between matches.
+
+	Attributes:
+		agent (Agent): The agent sitting in the seat.
+		legacy (bool): Whether this is the agent's default seat.
+		facts (Dict[Tuple[str, str], str]): The round facts of the match, keyed by predicate and player name.
+		history_start (int): Index in the memory at which the current match starts; only the default seat,
+			whose memory spans all of the agent's matches, sets it.
+	"""
+
+	def __init__(self, agent, legacy: bool = False, seed: Optional[int] = None):
+		"""
+		Initializes a seat for an agent.
+
+		Args:
+			agent (Agent): The agent.
+			legacy (bool): Whether the seat is the agent's default seat (default: False, a match-local seat).
+			seed (Optional[int]): Seed of the random generator of the seat's copy of the native strategy (default:
+				None, seeded from the operating system).
+		"""
+		self.agent = agent
+		self.legacy = legacy
+		self.facts: Dict[Tuple[str, str], str] = {}
+		self.history_start = 0
+		if not legacy:
+			self._memory = Memory(table=agent.game.move_table)
+			self._status = AgentStatus.CORRECT
+			self._native_strategy = copy.deepcopy(agent.native_strategy)
+			# A copy would replay the agent's random sequence in every match.
+			if self._native_strategy is not None:
+				self._native_strategy.reseed(seed)
+
+	@property
+	def memory(self) -> Memory:
+		return self.agent.memory if self.legacy else self._memory
+
+	@property
+	def status(self) -> AgentStatus:
+		return self.agent.status if self.legacy else self._status
+
+	@status.setter
+	def status(self, status: AgentStatus) -> None:
+		if self.legacy:
+			self.agent.status = status
+		else:
+			self._status = status
+
+	@property
+	def native_strategy(self) -> Optional[NativeStrategy]:
+		return self.agent.native_strategy if self.legacy else self._native_strategy
+
+	@native_strategy.setter
+	def native_strategy(self, strategy: Optional[NativeStrategy]) -> None:
+		if self.legacy:
+			self.agent.native_strategy = strategy
+		else:
+			self._native_strategy = strategy
+
+	@property
+	def deterministic(self) -> bool:
+		"""
+		Whether the agent's move in this seat is determined by the round facts, so that a repeated state of a
+		match repeats the rounds that followed it. Strategies are recognised by the fingerprint of their rules, so
+		rules loaded under a library name but edited, or autoformalized, are not trusted.
+		"""
+		if fingerprint(self.agent.game.strategy_rules) not in DETERMINISTIC_RULES:
+			return False
+		return self.native_strategy is None or self.native_strategy.deterministic
+
+	def round_state(self) -> Tuple[Tuple[Tuple[str, str], str], ...]:
+		"""
+		Get the round facts in a hashable, order-independent form.
+
+		Returns:
+			Tuple[Tuple[Tuple[str, str], str], ...]: The sorted fact items.
+		"""
+		return tuple(sorted(self.facts.items()))
+
+	def record_round(self, player: str, move: str, opponents: Sequence[Tuple[str, str]]) -> None:
+		"""
+		Update the seat's round facts with the moves of a finished round, as `record_round/4` does in the solver.
+
+		Args:
+			player (str): Name of the agent's player.
+			move (str): The agent's move.
+			opponents (Sequence[Tuple[str, str]]): Names and moves of the opponents.
+		"""
+		self.facts[("own_last_move", player)] = move
+		for name, opponent_move in opponents:
+			if ("last_move", name) in self.facts:
+				self.facts[("previous_move", name)] = self.facts[("last_move", name)]
+			self.facts[("last_move", name)] = opponent_move
+
+	def fact_terms(self) -> List[str]:
+		"""
+		Get the seat's round facts as Prolog terms.
+
+		Returns:
+			List[str]: Terms such as `last_move(player2, 'D')`.
+		"""
+		return [f"{predicate}({player}, '{move}')" for (predicate, player), move in self.facts.items()]
@@ -0,0 +1,169 @@
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from magif.environment.match_cache import fingerprint
+from magif.utils.utils import set_default
+
+MAGIC = b"MAGIFSNP"
+VERSION = 1
+
+# The magic number, the format version and the length of the JSON metadata that follows.
+HEADER = struct.Struct("<8sHI")
+# The typecode and length of an array that follows, stored little-endian.
+ARRAY_HEADER = struct.Struct("<cQ")
+
+
+class RuleStore:
+	"""
+	A content-addressed store of Prolog rules, one file per distinct program named by its SHA-256 fingerprint.
+
+	Snapshots refer to their rules by fingerprint, so the rules of a game shared by thousands of agents are stored
+	once, and a restored agent can tell that its rules are exactly the ones it was validated with.
+
+	Attributes:
+		root (str): The directory of the store.
+	"""
+
+	def __init__(self, root: str):
+		self.root = root
+
+	def path(self, digest: str) -> str:
+		return os.path.join(self.root, f"{digest}.pl")
+
+	def put(self, rules: Optional[str]) -> Optional[str]:
+		"""
+		Store rules, if not stored yet.
+
+		Args:
+			rules (Optional[str]): The rules.
+
+		Returns:
+			Optional[str]: The fingerprint of the rules, or None if there are no rules.
+		"""
+		if rules is None:
+			return None
+		digest = fingerprint(rules)
+		path = self.path(digest)
+		if not os.path.exists(path):
+			os.makedirs(self.root, exist_ok=True)
+			temp_path = f"{path}.{os.getpid()}.tmp"
+			with open(temp_path, "w") as f:
+				f.write(rules)
+			os.replace(temp_path, path)
+		return digest
+
+	def get(self, digest: str) -> Tuple[Optional[str], bool]:
+		"""
+		Read stored rules.
+
+		Args:
+			digest (str): The fingerprint of the rules.
+
+		Returns:
+			Tuple[Optional[str], bool]: The rules, or None if they are not in the store, and whether their
+			fingerprint matches, i.e. whether they are unchanged since they were stored.
+		"""
+		path = self.path(digest)
+		if not os.path.exists(path):
+			return None, False
+		with open(path, "r") as f:
+			rules = f.read()
+		return rules, fingerprint(rules) == digest
+
+
+def _intern(values: Sequence[Any], table: Dict[Any, int]) -> array:
+	"""
+	Encode values as their indices in an intern table, adding new values to the table.
+	"""
+	codes = [table.setdefault(value, len(table)) for value in values]
+	return array("I", codes)
+
+
+def _narrow(codes: array, size: int) -> array:
+	"""
+	Store codes in the smallest unsigned typecode that holds every index of a table of the given size.
+	"""
+	typecode = "B" if size <= 0xFF else "H" if size <= 0xFFFF else "I"
+	return codes if typecode == codes.typecode else array(typecode, codes)
+
+
+def _write_array(f, values: array) -> None:
+	if sys.byteorder == "big":
+		values = array(values.typecode, values)
+		values.byteswap()
+	f.write(ARRAY_HEADER.pack(values.typecode.encode(), len(values)))
+	f.write(values.tobytes())
+
+
+def _read_array(f) -> array:
+	typecode, length = ARRAY_HEADER.unpack(f.read(ARRAY_HEADER.size))
+	values = array(typecode.decode())
+	values.frombytes(f.read(length * values.itemsize))
+	if sys.byteorder == "big":
+		values.byteswap()
+	return values
+
+
+def write_snapshot(path: str, meta: Dict[str, Any], moves: Sequence[Any], opponent_moves: Sequence[Any],
+				   payoffs: Sequence[float]) -> None:
+	"""
+	Write a snapshot: a fixed header, the JSON metadata, then the move histories as codes of an intern table
+	kept in the metadata, and the payoffs as int64 if they are all integers, float64 otherwise.
+
+	The snapshot is written to a temporary file first and moved into place, so a crash never leaves a partial one.
+
+	Args:
+		path (str): The path of the snapshot.
+		meta (Dict[str, Any]): The metadata; the intern table is added under "interned".
+		moves (Sequence[Any]): The agent's moves.
+		opponent_moves (Sequence[Any]): The moves the agent observed, strings or tuples of strings.
+		payoffs (Sequence[float]): The agent's payoffs.
+	"""
+	table: Dict[Any, int] = {}
+	move_codes = _intern(moves, table)
+	opponent_codes = _intern(opponent_moves, table)
+	meta = {**meta, "interned": list(table)}
+	encoded = json.dumps(meta, default=set_default).encode()
+
+	temp_path = f"{path}.{os.getpid()}.tmp"
+	with open(temp_path, "wb") as f:
+		f.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+		f.write(encoded)
+		_write_array(f, _narrow(move_codes, len(table)))
+		_write_array(f, _narrow(opponent_codes, len(table)))
+		# Integer payoffs are kept as integers, as in the agent's memory.
+		_write_array(f, array("q" if all(isinstance(payoff, int) for payoff in payoffs) else "d", payoffs))
+	os.replace(temp_path, path)
+
+
+def read_snapshot(path: str) -> Tuple[Dict[str, Any], List[Any], List[Any], List[float]]:
+	"""
+	Read a snapshot written by `write_snapshot`.
+
+	Args:
+		path (str): The path of the snapshot.
+
+	Returns:
+		Tuple[Dict[str, Any], List[Any], List[Any], List[float]]: The metadata, the moves, the observed moves and
+		the payoffs.
+
+	Raises:
+		ValueError: If the file is not a snapshot or has an unsupported version.
+	"""
+	with open(path, "rb") as f:
+		magic, version, meta_length = HEADER.unpack(f.read(HEADER.size))
+		if magic != MAGIC:
+			raise ValueError(f"{path} is not an agent snapshot.")
+		if version != VERSION:
+			raise ValueError(f"Unsupported snapshot version {version} in {path}.")
+		meta = json.loads(f.read(meta_length))
+		move_codes = _read_array(f)
+		opponent_codes = _read_array(f)
+		payoffs = _read_array(f)
+
+	# JSON turns the observed moves of n-player games into lists; memories hold them as tuples.
+	table = [tuple(value) if isinstance(value, list) else value for value in meta.pop("interned")]
+	return meta, [table[code] for code in move_codes], [table[code] for code in opponent_codes], payoffs.tolist()
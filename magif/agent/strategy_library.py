@@ -0,0 +1,196 @@
+import os
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, FrozenSet, List, Optional, Sequence, Type
+from magif.utils.utils import fingerprint, normalize_path, read_file
+
+
+class NativeStrategy(ABC):
+	"""
+	A Python implementation of a library strategy from `DATA/STRATEGIES`.
+
+	A native strategy selects moves from the agent's memory instead of querying `select/4` in the solver, and it
+	only looks at the same state the Prolog definition sees: the agent's own last move and the opponent's last and
+	previous moves. The Prolog definition remains the reference, and the agent's mind cross-checks the two
+	periodically.
+
+	Attributes:
+	    name (str): The strategy name, equal to the name of the Prolog file without extension.
+	    deterministic (bool): Whether the strategy always selects the same move in the same state.
+	    default_move (str): The agent's default move.
+	    opposite_move (str): The move opposite to the default move.
+	    moves (List[str]): The possible moves of the game.
+	    seed (Optional[int]): Seed of the strategy's random generator.
+	"""
+	name: str = None
+	deterministic: bool = True
+
+	def __init__(self, default_move: str, opposite_move: str, moves: List[str], seed: Optional[int] = None):
+		"""
+		Initializes the strategy for a game.
+
+		Args:
+		    default_move (str): The agent's default move.
+		    opposite_move (str): The move opposite to the default move.
+		    moves (List[str]): The possible moves of the game.
+		    seed (Optional[int]): Seed of the strategy's random generator (default: None, unseeded).
+		"""
+		self.default_move = default_move
+		self.opposite_move = opposite_move
+		self.moves = list(moves)
+		self.seed = seed
+		self.random = random.Random(seed)
+
+	def reseed(self, seed: Optional[int]) -> None:
+		"""
+		Reset the strategy's random generator with a new seed.
+
+		Args:
+		    seed (Optional[int]): The seed.
+		"""
+		self.seed = seed
+		self.random = random.Random(seed)
+
+	@abstractmethod
+	def support(self, own_moves: Sequence[str], opponent_moves: Sequence[str]) -> List[str]:
+		"""
+		Get the moves the strategy may select given the history of the match.
+
+		Args:
+		    own_moves (Sequence[str]): The agent's moves so far.
+		    opponent_moves (Sequence[str]): The opponent's moves so far.
+
+		Returns:
+			List[str]: The moves with a non-zero probability of being selected.
+		"""
+		pass
+
+	def select(self, own_moves: Sequence[str], opponent_moves: Sequence[str]) -> str:
+		"""
+		Select the next move given the history of the match.
+
+		Args:
+		    own_moves (Sequence[str]): The agent's moves so far.
+		    opponent_moves (Sequence[str]): The opponent's moves so far.
+
+		Returns:
+			str: The selected move.
+		"""
+		return self.support(own_moves, opponent_moves)[0]
+
+	def _deviated(self, move) -> bool:
+		"""
+		Check whether a move deviates from the default move.
+		"""
+		return str(move) != str(self.default_move)
+
+
+class GenerousTitForTat(NativeStrategy):
+	"""
+	Copies the opponent's last move, but forgives a deviation from the default move one time in three.
+	"""
+	name = "generous-tit-for-tat"
+	deterministic = False
+	generosity = 1 / 3
+
+	def support(self, own_moves, opponent_moves):
+		if not opponent_moves or not self._deviated(opponent_moves[-1]):
+			return [self.default_move]
+		return [self.default_move, opponent_moves[-1]]
+
+	def select(self, own_moves, opponent_moves):
+		support = self.support(own_moves, opponent_moves)
+		if len(support) == 1 or self.random.random() < self.generosity:
+			return support[0]
+		return support[1]
+
+
+class Pavlov(NativeStrategy):
+	"""
+	Win-stay, lose-shift: selects the default move if both players made the same move in the last round, and its
+	opposite otherwise.
+	"""
+	name = "pavlov"
+
+	def support(self, own_moves, opponent_moves):
+		if not own_moves or not opponent_moves or str(own_moves[-1]) == str(opponent_moves[-1]):
+			return [self.default_move]
+		return [self.opposite_move]
+
+
+class GrimTrigger(NativeStrategy):
+	"""
+	Selects the default move until the opponent deviates from it once, and its opposite from then on.
+
+	Since the strategy deviates only once triggered, its own last move carries the trigger between rounds.
+	"""
+	name = "grim-trigger"
+
+	def support(self, own_moves, opponent_moves):
+		triggered = (opponent_moves and self._deviated(opponent_moves[-1])) or (own_moves and self._deviated(own_moves[-1]))
+		return [self.opposite_move] if triggered else [self.default_move]
+
+
+class TitForTwoTats(NativeStrategy):
+	"""
+	Selects the default move unless the opponent deviated from it in each of the last two rounds.
+	"""
+	name = "tit-for-two-tats"
+
+	def support(self, own_moves, opponent_moves):
+		if len(opponent_moves) >= 2 and self._deviated(opponent_moves[-1]) and self._deviated(opponent_moves[-2]):
+			return [self.opposite_move]
+		return [self.default_move]
+
+
+class SeededRandom(NativeStrategy):
+	"""
+	Selects a move at random with uniform probability from a seeded generator.
+	"""
+	name = "seeded-random"
+	deterministic = False
+
+	def support(self, own_moves, opponent_moves):
+		return sorted(self.moves)
+
+	def select(self, own_moves, opponent_moves):
+		return self.random.choice(self.support(own_moves, opponent_moves))
+
+
+STRATEGY_LIBRARY: Dict[str, Type[NativeStrategy]] = {
+	strategy.name: strategy for strategy in (GenerousTitForTat, Pavlov, GrimTrigger, TitForTwoTats, SeededRandom)
+}
+
+# Strategies in `DATA/STRATEGIES` whose move depends only on the round facts and the game rules.
+DETERMINISTIC_STRATEGIES: FrozenSet[str] = frozenset(
+	{"tit-for-tat", "anti-tit-for-tat", "default_move", "anti-default-move", "best_response"} |
+	{name for name, strategy in STRATEGY_LIBRARY.items() if strategy.deterministic}
+)
+
+# Fingerprints of the rules of the deterministic strategies, so that rules are recognised by their content rather
+# than by the name they were loaded under.
+DETERMINISTIC_RULES: FrozenSet[str] = frozenset(
+	fingerprint(read_file(path)) for path in
+	(normalize_path(f"DATA/STRATEGIES/{name}.pl") for name in DETERMINISTIC_STRATEGIES) if os.path.isfile(path)
+)
+
+
+def create_native_strategy(name: str, default_move: str, opposite_move: str, moves: List[str],
+						   seed: Optional[int] = None) -> Optional[NativeStrategy]:
+	"""
+	Create the native implementation of a library strategy.
+
+	Args:
+		name (str): The strategy name.
+		default_move (str): The agent's default move.
+		opposite_move (str): The move opposite to the default move.
+		moves (List[str]): The possible moves of the game.
+		seed (Optional[int]): Seed of the strategy's random generator.
+
+	Returns:
+		Optional[NativeStrategy]: The strategy, or None if the library has no strategy with this name.
+	"""
+	strategy = STRATEGY_LIBRARY.get(name)
+	if strategy is None:
+		return None
+	return strategy(default_move, opposite_move, moves, seed=seed)
@@ -1,9 +1,38 @@
+import asyncio
+from dataclasses import dataclass
 from magif.utils.base_lm import BaseLM
 from lms.gpt4 import GPT4
-from typing import Optional
-from magif.utils.utils import AgentStatus
+from typing import Any, Optional
+from magif.solver.solver import Solver
+from magif.utils.utils import AgentStatus, parse_trace
 from magif.utils.setup_logger import logger
 
+
+@dataclass
+class Candidate:
+	"""
+	Rules drafted for the instruction prompt by one of the language models of a parallel round.
+
+	Attributes:
+	    llm (BaseLM): The language model that drafted the rules, holding the conversation.
+	    rules (Optional[str]): The parsed rules, or None if the response could not be parsed.
+	    status (AgentStatus): CORRECT, SYNTACTIC_ERROR or INSTRUCTION_ERROR.
+	    lines (Any): The processed trace of rules with syntactic errors.
+	    errors (int): The number of errors and warnings reported for rules with syntactic errors.
+	    solver (Optional[Solver]): The solver the rules were validated in.
+	"""
+	llm: BaseLM
+	rules: Optional[str] = None
+	status: AgentStatus = AgentStatus.INSTRUCTION_ERROR
+	lines: Any = None
+	errors: int = 0
+	solver: Optional[Solver] = None
+
+	def release(self) -> None:
+		if self.solver is not None:
+			self.solver.release()
+
+
 class Autoformalizer:
 	"""
 	Handles the process of autoformalizing game rules and strategies using an LM (Language Model).
@@ -20,21 +49,29 @@ class Autoformalizer:
 	    instruction_prompt (str): The initial prompt provided to the LM.
 	    feedback_prompt (str): The feedback prompt for refining rules based on errors.
 	    trace_messages (list): A list of trace messages collected during the autoformalization process.
+	    num_candidates (int): The number of candidates drafted concurrently for the instruction prompt.
+	    solver_class (type): The class of the solvers the candidates are validated in.
 	"""
 
 	def __init__(self,
 				 llm: Optional[BaseLM] = GPT4,
-				 max_attempts: Optional[int] = 1):
+				 max_attempts: Optional[int] = 1,
+				 num_candidates: Optional[int] = 1):
 		"""
 		Initializes the Autoformalizer with a language model and maximum attempts.
 
 		Args:
 		    llm (Optional[BaseLM]): The language model used for autoformalization (default: GPT4).
 		    max_attempts (Optional[int]): The maximum number of attempts allowed (default: 1).
+		    num_candidates (Optional[int]): The number of candidates drafted concurrently for the instruction
+		        prompt, each by its own instance of the language model (default: 1, a single sequential draft).
 		"""
+		self.llm_class = llm
 		self.llm = llm(save_history=True)
 		self.attempts = 0
 		self.max_attempts = max_attempts
+		self.num_candidates = num_candidates
+		self.solver_class = Solver
 		self.instruction_prompt = None
 		self.feedback_prompt = None
 		self.trace_messages = []
@@ -57,10 +94,17 @@ class Autoformalizer:
 		"""
 		self.feedback_prompt = prompt
 
-	def autoformalize(self, agent, parser, trace_processor, clear_context=True):
+	async def autoformalize(self, agent, parser, trace_processor, clear_context=True):
 		"""
 		Performs the autoformalization process to generate syntactically correct game rules.
 
+		The language model is awaited (see `BaseLM.aprompt`), so many agents can be autoformalized concurrently on
+		one event loop.
+
+		With several candidates, the first attempt drafts them concurrently (see `_draft_candidates`) and accepts
+		the first valid one. If none is valid, the best failing candidate is refined with the feedback prompt in
+		the following attempts, as a single draft is.
+
 		Args:
 		    agent (Agent): An agent with a solver instance to validate the generated rules.
 		    parser (function): A function to parse the LLM's response into formalized rules.
@@ -84,6 +128,15 @@ class Autoformalizer:
 		while self.attempts < self.max_attempts:
 			self.attempts += 1
 
+			# Draft several candidates concurrently in the first attempt, continuing with the best one.
+			if self.attempts == 1 and self.num_candidates > 1:
+				rules, status, lines = await self._draft_candidates(agent, parser, trace_processor)
+				if status == AgentStatus.CORRECT:
+					break
+				if status == AgentStatus.SYNTACTIC_ERROR:
+					self.trace_messages.append(lines)
+				continue
+
 			# Use the instruction prompt for the first attempt; feedback prompt for subsequent attempts.
 			if self.attempts == 1:
 				prompt = self.instruction_prompt
@@ -98,7 +151,7 @@ class Autoformalizer:
 					raise RuntimeError(f"Unknown status {status}")
 
 			# Query the language model with the generated prompt.
-			response = self.llm.prompt(prompt)
+			response = await self.llm.aprompt(prompt)
 
 			try:
 				# Parse the response into formalized rules.
@@ -108,8 +161,8 @@ class Autoformalizer:
 				status = AgentStatus.INSTRUCTION_ERROR
 				continue
 
-			# Validate the generated rules using the solver.
-			correct, trace = agent.solver.validate(rules)
+			# Validate the generated rules using the solver, off the event loop.
+			correct, trace = await asyncio.to_thread(agent.solver.validate, rules)
 			if correct:
 				status = AgentStatus.CORRECT
 				break
@@ -119,3 +172,92 @@ class Autoformalizer:
 				self.trace_messages.append(lines)
 
 		return rules, status
+
+	async def _draft_candidates(self, agent, parser, trace_processor):
+		"""
+		Drafts candidates for the instruction prompt concurrently, each by a new instance of the language model,
+		and validates each in a solver of its own as soon as it is parsed.
+
+		The first valid candidate is accepted: its solver replaces the agent's, and its language model, holding the
+		conversation, becomes the autoformalizer's. The drafts still in progress are cancelled. If no candidate is
+		valid, the best failing one is kept to be refined: rules with the fewest reported errors, or else a response
+		that could not be parsed. A draft that raises an exception counts as a failure, unless every draft does.
+
+		Args:
+		    agent (Agent): The agent whose solver's code the candidates are validated with.
+		    parser (function): A function to parse the LLM's response into formalized rules.
+		    trace_processor (function): A function to process error traces from the solver.
+
+		Returns:
+		    tuple: The rules (str), the status (AgentStatus) and the processed trace of the chosen candidate.
+
+		Raises:
+		    Exception: The exception of the first draft that failed, if every draft failed.
+		"""
+		params = agent.solver.get_params()
+
+		async def draft() -> Candidate:
+			candidate = Candidate(self.llm_class(save_history=True))
+			response = await candidate.llm.aprompt(self.instruction_prompt)
+			try:
+				candidate.rules = parser(response)
+			except ValueError:
+				return candidate
+
+			def validate():
+				candidate.solver = self.solver_class(*params)
+				return candidate.solver.validate(candidate.rules)
+
+			# Starting the engine and consulting the rules block, so they run in a worker thread.
+			validation = asyncio.ensure_future(asyncio.to_thread(validate))
+			try:
+				correct, trace = await asyncio.shield(validation)
+			except BaseException:
+				# A draft cancelled while validating releases its solver once the validation is done.
+				validation.add_done_callback(lambda _: candidate.release())
+				raise
+			if correct:
+				candidate.status = AgentStatus.CORRECT
+			else:
+				candidate.status = AgentStatus.SYNTACTIC_ERROR
+				candidate.lines = trace_processor(trace, candidate.rules)
+				candidate.errors = len(parse_trace(trace or ""))
+			return candidate
+
+		pending = {asyncio.create_task(draft()) for _ in range(self.num_candidates)}
+		candidates, errors = [], []
+		try:
+			while pending and not any(candidate.status == AgentStatus.CORRECT for candidate in candidates):
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					try:
+						candidates.append(task.result())
+					except Exception as e:
+						logger.warning(f"Drafting a candidate failed: {e}")
+						errors.append(e)
+
+			valid = [candidate for candidate in candidates if candidate.status == AgentStatus.CORRECT]
+			# Prefer parsed rules with the fewest errors to responses that could not be parsed.
+			parsed = [candidate for candidate in candidates if candidate.status == AgentStatus.SYNTACTIC_ERROR]
+			if valid:
+				winner = valid[0]
+				agent.replace_solver(winner.solver)
+				winner.solver = None
+			elif parsed:
+				winner = min(parsed, key=lambda candidate: candidate.errors)
+			elif candidates:
+				winner = candidates[0]
+			else:
+				raise errors[0]
+		finally:
+			# Drafts are cancelled while waiting for the language model or for the validation of their rules.
+			for task in pending:
+				task.cancel()
+			await asyncio.gather(*pending, return_exceptions=True)
+			# The failing candidates are refined in the agent's solver, so only the accepted one keeps its solver.
+			for candidate in candidates:
+				candidate.release()
+		logger.debug(f"Drafted {len(candidates)} of {self.num_candidates} candidates; kept one with status {winner.status}.")
+
+		self.llm = winner.llm
+		return winner.rules, winner.status, winner.lines
@@ -1,22 +1,105 @@
+import glob
+import os
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from magif.agent.agent import Agent
+from magif.environment.match_cache import fingerprint
 from magif.utils.utils import AgentStatus
 
+# The index keys of an agent: its name, status, strategy name and game fingerprint.
+IndexKeys = Tuple[str, AgentStatus, str, str]
+
+
+class AgentView(Sequence):
+	"""
+	A read-only, list-like view of an ordered set of agents of a pool.
+
+	Indexing and slicing use a snapshot of the set, taken on first use after the set changes, so that a loop
+	indexing the view costs one snapshot rather than one scan per index.
+	"""
+
+	def __init__(self, agents: Dict[int, Agent]):
+		self._agents = agents
+		self._snapshot: Optional[Tuple[Agent, ...]] = None
+
+	def _invalidate(self) -> None:
+		self._snapshot = None
+
+	def _list(self) -> Tuple[Agent, ...]:
+		if self._snapshot is None:
+			self._snapshot = tuple(self._agents.values())
+		return self._snapshot
+
+	def __getitem__(self, index):
+		result = self._list()[index]
+		return list(result) if isinstance(index, slice) else result
+
+	def __len__(self) -> int:
+		return len(self._agents)
+
+	def __iter__(self) -> Iterator[Agent]:
+		return iter(self._list())
+
+	def __contains__(self, agent) -> bool:
+		return self._agents.get(id(agent)) is agent
+
+	def __add__(self, other: Sequence[Agent]) -> List[Agent]:
+		return list(self) + list(other)
+
+	def __eq__(self, other) -> bool:
+		if isinstance(other, (AgentView, list, tuple)):
+			return list(self) == list(other)
+		return NotImplemented
+
+	def __repr__(self) -> str:
+		return repr(list(self))
+
 
 class AgentPool:
 	"""
     A class to manage a pool of agents participating in the tournament.
 
+    The agents are kept in ordered sets keyed by agent id, so moving an agent between the valid and invalid
+    agents, and looking agents up by name, status, strategy or game, take constant time, while the agents are
+    iterated in the order they joined each set, as match makers expect.
+
     Attributes:
-        valid_agents (list[Agent]): A list to store agents with a status of CORRECT.
-        invalid_agents (list[Agent]): A list to store agents with any status other than CORRECT.
+        valid_agents (AgentView): The agents with a status of CORRECT, as a list-like view.
+        invalid_agents (AgentView): The agents with any status other than CORRECT, as a list-like view.
     """
 
 	def __init__(self):
 		"""
-        Initializes the AgentPool instance with empty valid and invalid agent lists.
+        Initializes the AgentPool instance with empty valid and invalid agent sets.
         """
-		self.valid_agents: list[Agent] = []
-		self.invalid_agents: list[Agent] = []
+		self._valid: Dict[int, Agent] = {}
+		self._invalid: Dict[int, Agent] = {}
+		self.valid_agents = AgentView(self._valid)
+		self.invalid_agents = AgentView(self._invalid)
+
+		# Secondary indexes, each an ordered set of agents per key.
+		self._keys: Dict[int, IndexKeys] = {}
+		self._indexes: Tuple[Dict, ...] = ({}, {}, {}, {})
+
+	@classmethod
+	async def from_directory(cls, directory: str, max_concurrency: int = 4,
+							 progress: Optional[Callable[[int, int, Agent], None]] = None) -> "AgentPool":
+		"""
+		Creates a pool of the agents saved as JSON files in a directory, loaded concurrently.
+
+		Args:
+			directory (str): The directory; its `*.json` files are loaded in name order.
+			max_concurrency (int): The maximum number of agents loaded at once (default: 4).
+			progress (Optional[Callable[[int, int, Agent], None]]): Called as each agent is loaded (see
+				`Agent.load_many`).
+
+		Returns:
+			AgentPool: The pool, with the agents that could not be loaded among the invalid agents.
+		"""
+		pool = cls()
+		paths = sorted(glob.glob(os.path.join(directory, "*.json")))
+		for agent in await Agent.load_many(paths, max_concurrency, progress):
+			pool.add_agent(agent)
+		return pool
 
 	def add_agent(self, agent: Agent):
 		"""
@@ -25,10 +108,12 @@ class AgentPool:
         Args:
             agent (Agent): The agent to be added to the pool.
         """
-		if agent.status == AgentStatus.CORRECT:
-			self.valid_agents.append(agent)
-		else:
-			self.invalid_agents.append(agent)
+		if agent in self:
+			self.move_agent(agent)
+			return
+		self._status_set(agent)[id(agent)] = agent
+		self._index(agent)
+		self._invalidate()
 
 	def move_agent(self, agent: Agent):
 		"""
@@ -37,35 +122,142 @@ class AgentPool:
         If the agent's status is CORRECT and it is currently in the invalid pool,
         it is moved to the valid pool. Similarly, if the agent's status is not
         CORRECT and it is in the valid pool, it is moved to the invalid pool.
+        A moved agent joins the end of its new pool. The agent's index entries are
+        updated as well, e.g. after its strategy changed.
 
         Args:
             agent (Agent): The agent whose status has changed.
         """
-		if agent.status == AgentStatus.CORRECT:
-			if agent in self.invalid_agents:
-				self.invalid_agents.remove(agent)
-				self.valid_agents.append(agent)
-		else:
-			if agent in self.valid_agents:
-				self.valid_agents.remove(agent)
-				self.invalid_agents.append(agent)
+		if agent not in self:
+			return
+		target = self._status_set(agent)
+		if id(agent) not in target:
+			source = self._invalid if target is self._valid else self._valid
+			del source[id(agent)]
+			target[id(agent)] = agent
+			self._invalidate()
+		self._index(agent)
+
+	def remove_agent(self, agent: Agent) -> None:
+		"""
+		Removes an agent from the pool, without releasing its solver.
+
+		Args:
+			agent (Agent): The agent.
+		"""
+		if agent not in self:
+			return
+		self._valid.pop(id(agent), None)
+		self._invalid.pop(id(agent), None)
+		self._unindex(agent)
+		self._invalidate()
+
+	def by_name(self, name: str) -> List[Agent]:
+		"""
+		Get the agents with a name, in the order they joined the pool.
+		"""
+		return list(self._indexes[0].get(name, {}).values())
+
+	def by_status(self, status: AgentStatus) -> List[Agent]:
+		"""
+		Get the agents with a status, in the order they joined the pool.
+		"""
+		return list(self._indexes[1].get(status, {}).values())
+
+	def by_strategy(self, strategy_name: str) -> List[Agent]:
+		"""
+		Get the agents with a strategy, in the order they joined the pool.
+		"""
+		return list(self._indexes[2].get(strategy_name, {}).values())
+
+	def by_game(self, game: Union[str, Agent]) -> List[Agent]:
+		"""
+		Get the agents playing a game, in the order they joined the pool.
+
+		Args:
+			game (Union[str, Agent]): The fingerprint of the game rules (see `match_cache.fingerprint`), or an
+				agent playing the game.
+
+		Returns:
+			List[Agent]: The agents whose game rules have the fingerprint.
+		"""
+		if isinstance(game, Agent):
+			game = fingerprint(game.game.game_rules)
+		return list(self._indexes[3].get(game, {}).values())
 
 	def clean_agents(self):
-		for agent in self.valid_agents+self.invalid_agents:
+		for agent in self.valid_agents + self.invalid_agents:
 			agent.release_solver()
-		self.valid_agents = None
-		self.invalid_agents = None
+		self._valid.clear()
+		self._invalid.clear()
+		self._keys.clear()
+		for index in self._indexes:
+			index.clear()
+		self._invalidate()
+
+	def __enter__(self) -> "AgentPool":
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback) -> None:
+		self.clean_agents()
+
+	async def __aenter__(self) -> "AgentPool":
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+		self.clean_agents()
 
 	def truncate_pool(self, num):
-		self._truncate_list(self.valid_agents, num)
-		self._truncate_list(self.invalid_agents, num)
-
-	def _truncate_list(self, agent_list, num):
-		valid_len = len(agent_list)
-		if valid_len > num:
-			for i in range(num, valid_len):
-				agent_list[-1].reload_solver()
-				agent_list.pop()
+		"""
+		Removes the agents beyond the first num valid and the first num invalid agents, releasing their solvers.
+
+		Args:
+			num (int): The number of agents kept in each set.
+		"""
+		self._truncate_set(self._valid, num)
+		self._truncate_set(self._invalid, num)
+		self._invalidate()
+
+	def _truncate_set(self, agents: Dict[int, Agent], num):
+		while len(agents) > num:
+			_, agent = agents.popitem()
+			agent.release_solver()
+			self._unindex(agent)
+
+	def __contains__(self, agent) -> bool:
+		return id(agent) in self._keys
+
+	def __len__(self) -> int:
+		return len(self._keys)
+
+	def _status_set(self, agent: Agent) -> Dict[int, Agent]:
+		return self._valid if agent.status == AgentStatus.CORRECT else self._invalid
+
+	def _index(self, agent: Agent) -> None:
+		"""
+		Index an agent under its current keys, replacing its previous entries.
+		"""
+		keys = (getattr(agent, "name", None), agent.status, agent.strategy_name, fingerprint(agent.game.game_rules))
+		if self._keys.get(id(agent)) == keys:
+			return
+		self._unindex(agent)
+		self._keys[id(agent)] = keys
+		for index, key in zip(self._indexes, keys):
+			index.setdefault(key, {})[id(agent)] = agent
+
+	def _unindex(self, agent: Agent) -> None:
+		keys = self._keys.pop(id(agent), None)
+		if keys is None:
+			return
+		for index, key in zip(self._indexes, keys):
+			entries = index[key]
+			del entries[id(agent)]
+			if not entries:
+				del index[key]
+
+	def _invalidate(self) -> None:
+		self.valid_agents._invalidate()
+		self.invalid_agents._invalidate()
 
 	def __str__(self) -> str:
 		"""
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from magif.utils.setup_logger import logger
+from magif.utils.utils import set_default
+
+
+class TournamentCheckpoint:
+	"""
+	An append-only JSON Lines log of the completed matches of a tournament.
+
+	The first line is a header describing the tournament, and every following line records one completed match:
+	the match's agents, their histories and statuses, and the match totals. A record is written with a single
+	write followed by a flush (and an fsync by default), so a crash leaves at most one partial line at the end of
+	the log, which is dropped on load. Nothing is ever rewritten, so a checkpoint costs one line per match.
+
+	Attributes:
+		path (str): The path of the log.
+		fsync (bool): Whether every record is synced to disk before the tournament continues.
+	"""
+
+	def __init__(self, path: str, fsync: bool = True):
+		"""
+		Initializes the checkpoint at a path.
+
+		Args:
+			path (str): The path of the log; it is created on the first write.
+			fsync (bool): Whether every record is synced to disk (default: True).
+		"""
+		self.path = path
+		self.fsync = fsync
+		self._file = None
+
+	def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+		"""
+		Read the header and the match records of an existing log, dropping a partial last line and terminating a
+		complete last line that lacks its newline, so that records can be appended after it.
+
+		Returns:
+			Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]: The header, or None if there is no log yet, and
+			the match records in the order they were written.
+		"""
+		if not os.path.exists(self.path):
+			return None, []
+
+		entries = []
+		valid_size = 0
+		terminated = True
+		with open(self.path, "rb") as f:
+			for line in f:
+				try:
+					entries.append(json.loads(line))
+				except json.JSONDecodeError:
+					logger.warning(f"Dropping a partial record at the end of checkpoint {self.path}.")
+					break
+				valid_size += len(line)
+				terminated = line.endswith(b"\n")
+		if valid_size < os.path.getsize(self.path):
+			with open(self.path, "r+b") as f:
+				f.truncate(valid_size)
+		if not terminated:
+			# A complete last record written without its newline would be joined to the next record appended.
+			with open(self.path, "ab") as f:
+				f.write(b"\n")
+
+		if not entries:
+			return None, []
+		return entries[0], entries[1:]
+
+	def open(self, header: Dict[str, Any]) -> None:
+		"""
+		Open the log for appending, writing the header if the log is new.
+
+		Args:
+			header (Dict[str, Any]): The description of the tournament.
+		"""
+		new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+		self._file = open(self.path, "a")
+		if new:
+			self._write(header)
+
+	def append(self, record: Dict[str, Any]) -> None:
+		"""
+		Append the record of a completed match.
+
+		Args:
+			record (Dict[str, Any]): The match record.
+		"""
+		self._write(record)
+
+	def close(self) -> None:
+		"""
+		Close the log.
+		"""
+		if self._file is not None:
+			self._file.close()
+			self._file = None
+
+	def _write(self, entry: Dict[str, Any]) -> None:
+		self._file.write(json.dumps(entry, default=set_default) + "\n")
+		self._file.flush()
+		if self.fsync:
+			os.fsync(self._file.fileno())
@@ -1,10 +1,24 @@
+import asyncio
+import bisect
 import json
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from magif.agent.agent import Agent
+from magif.agent.seat import Seat
+from magif.environment.checkpoint import TournamentCheckpoint
+from magif.environment.match_maker import match_cost, partition, schedule_rounds
+from magif.environment.events import (AgentStatusChanged, EventBus, MatchEnded, MatchReplayed, MatchStarted,
+									 RoundPlayed, RoundsRepeated, TournamentEnded)
+from magif.environment.match_cache import MatchCache, fingerprint
+from magif.environment.match_result import MatchResult, MatchSummary
+from magif.environment.replication import ReplicationResult, replicate_seed, replicate_totals, summarize_replicates
+from magif.environment.scoreboard import Scoreboard
 from magif.utils.setup_logger import logger
-from magif.utils.utils import set_default
+from magif.utils.utils import AgentStatus, set_default
 
 
 class Environment:
@@ -14,11 +28,25 @@ class Environment:
 	Attributes:
 		agent_pool (AgentPool): The pool of agents participating in the tournament.
 		num_rounds (int): The number of rounds in the tournament.
-		match_maker (Callable[[list], list[tuple]]): A function that
-                generates match pairings based on valid and invalid agents.
+		match_maker (Callable[[list], Iterable[tuple]]): A function that
+                generates matches based on valid and invalid agents, e.g. a `MatchMaker`. A match is a tuple of two
+                agents, or of k agents for n-player games.
 		target_payoffs (list[float]): Optional target payoffs for specific tournament outcomes.
+		max_concurrency (int): The maximum number of matches played at the same time.
+		num_workers (int): The number of processes the matches are sharded across.
+		match_local_state (bool): Whether each match is played in match-local seats, starting from a fresh state.
+		reset_state (bool): Whether the agents' solver states are restored at the end of each match.
+		detect_cycles (bool): Whether matches of deterministic strategies are fast-forwarded once they cycle.
+		match_summaries (List[MatchSummary]): The totals of each match played, in match order.
+		events (EventBus): The bus publishing typed events of the tournament to subscribed streams.
+		checkpoint_path (Optional[str]): The path of the tournament's checkpoint log, if checkpointing is on.
+		scoreboard (Scoreboard): The running payoff totals and ranking of the agents.
+		match_cache (Optional[MatchCache]): The recorded matches of deterministic strategies, if caching is on.
 	"""
-	def __init__(self, agent_pool, num_rounds, match_maker, target_payoffs=None):
+	STATE_SNAPSHOT = "match_start"
+
+	def __init__(self, agent_pool, num_rounds, match_maker, target_payoffs=None, max_concurrency=1, num_workers=1,
+				 match_local_state=True, reset_state=True, detect_cycles=True, checkpoint_path=None, match_cache=None):
 		"""
 		Initializes the Tournament with a pool of agents, a specified number of rounds,
 		and optional target payoffs.
@@ -30,73 +58,639 @@ class Environment:
                 generates match pairings based on valid and invalid agents.
 			target_payoffs (list[float], optional): A list of target payoffs to guide
 				tournament objectives. Defaults to an empty list if not provided.
+			max_concurrency (int, optional): The maximum number of matches played at the same time. Matches
+				are played one after another by default.
+			num_workers (int, optional): The number of worker processes the matches are sharded across. Matches
+				are played in the current process by default. Legacy seats can only be sharded with `reset_state`,
+				since the round facts they carry would not cross from one shard to the next.
+			match_local_state (bool, optional): Whether agents play each match in a match-local seat, so that no
+				state leaks between matches and an agent can play several matches at once. If False, agents play in
+				their default seats and carry their last moves from one match into the next. Defaults to True.
+			reset_state (bool, optional): Whether the dynamic state of each agent's solver is snapshotted before
+				its first match and restored at the end of each match, so that every match starts from the same
+				state without restarting the engine. Defaults to True.
+			detect_cycles (bool, optional): Whether a match between deterministic strategies in match-local seats
+				is fast-forwarded once its joint state repeats. Defaults to True.
+			checkpoint_path (str, optional): The path of an append-only log of completed matches. If the log
+				exists, the tournament resumes from it, skipping the matches it records. Defaults to None, no
+				checkpointing.
+			match_cache (MatchCache, optional): A cache of match histories. Matches between deterministic
+				strategies in match-local seats that are already in the cache are replayed from it instead of
+				being played. Defaults to None, no caching.
 		"""
 		self.agent_pool = agent_pool
 		self.num_rounds = num_rounds
 		self.match_maker = match_maker
 		self.target_payoffs = target_payoffs if target_payoffs else []
+		self.max_concurrency = max_concurrency
+		self.num_workers = num_workers
+		self.match_local_state = match_local_state
+		self.reset_state = reset_state
+		self.detect_cycles = detect_cycles
+		self.match_summaries: List[MatchSummary] = []
+		self.events = EventBus()
+		self.checkpoint_path = checkpoint_path
+		self.scoreboard = Scoreboard()
+		self.match_cache: Optional[MatchCache] = match_cache
+		self._checkpoint: Optional[TournamentCheckpoint] = None
+		self._agent_index: Dict[int, int] = {}
+		self._snapshots = set()
+		# The match index of each summary of the current tournament, which starts at `_summary_start`, keeping the
+		# summaries in match order when matches finish out of order.
+		self._summary_indices: List[int] = []
+		self._summary_start = 0
 
 	async def play_tournament(self) -> None:
 		"""
 		Run the tournament where agents play against each other.
-		Raises a ValueError if agents have not been created.
+		Raises a ValueError if agents have not been created, if agents sharing a solver engine, or keeping a memory
+		window shorter than a match, would play in legacy seats, or if legacy seats carrying their state from one
+		match into the next would be sharded across processes.
+
+		Streams subscribed to `events` before the tournament receive its events and end with it, e.g.:
+
+			writer = asyncio.create_task(write_jsonl(environment.events.subscribe(), path))
+			await environment.play_tournament()
+			await writer
 		"""
 		# Step 1: Validate that agents have been created
 		if not self.agent_pool:
 			raise ValueError("Agents must be created before playing the tournament.")
 
-		# Step 2: Generate agent pairs for the tournament
-		agent_pairs = self.match_maker(self.agent_pool.valid_agents)
+		# Step 2: Generate agent pairs (or k-agent groups) for the tournament
+		agents = list(self.agent_pool.valid_agents)
+		# Legacy seats keep the round facts in the engine, where clones sharing it would overwrite each other's.
+		if not self.match_local_state and any(agent.solver.shares_engine for agent in agents):
+			raise ValueError("Agents sharing a solver engine must play in match-local seats.")
+		self._agent_index = {id(agent): i for i, agent in enumerate(agents)}
+		agent_pairs = list(self.match_maker(agents))
+		# A legacy seat plays in the agent's memory, which must hold a whole match for it to be totalled and logged.
+		if not self.match_local_state and any(agent.memory.window is not None and
+											  agent.memory.window < self.num_rounds * len(group)
+											  for group in agent_pairs for agent in group):
+			raise ValueError("Agents playing in legacy seats need a memory window of at least a whole match.")
+		# Workers rebuild the agents from their rules, without the round facts carried over from earlier matches.
+		if self.num_workers > 1 and not self.match_local_state and not self.reset_state:
+			raise ValueError("Sharded tournaments in legacy seats must reset the agents' state after each match.")
+
+		# Step 3: Resume from the checkpoint, if any, skipping the matches already played
+		self._summary_indices, self._summary_start = [], len(self.match_summaries)
+		completed = await self._resume(agents) if self.checkpoint_path else set()
+		for agent in agents:
+			self.scoreboard.track(agent)
+		matches = ((i, group) for i, group in enumerate(agent_pairs) if i not in completed)
+
+		# Step 4: Conduct matches between agent pairs
+		try:
+			if self.num_workers > 1:
+				await self._play_matches_in_processes(list(matches))
+			elif self.max_concurrency > 1:
+				await self._play_matches_concurrently(list(matches))
+			else:
+				await self._play_matches(matches)
+			if self.events.active:
+				await self.events.publish(TournamentEnded(len(self.match_summaries)))
+		finally:
+			if self._checkpoint is not None:
+				self._checkpoint.close()
+				self._checkpoint = None
+			await self.events.close()
+
+	async def _resume(self, agents: List[Agent]) -> set:
+		"""
+		Replay the checkpoint log into the agents and open it for appending.
+
+		Every recorded match is merged into the agents' memories and statuses, and its payoffs added to the
+		scoreboard, in match order. Agents that carry their solver state between matches get it back from the last
+		two rounds of their memory.
+
+		Args:
+			agents (List[Agent]): The tournament agents, in the order used by the match maker.
+
+		Returns:
+			set: The indices of the matches recorded in the log.
+
+		Raises:
+			ValueError: If the log was written for a different tournament: another number of rounds, or other agents,
+				by name, strategy or rules fingerprint, in the match maker's order.
+		"""
+		self._checkpoint = TournamentCheckpoint(self.checkpoint_path)
+		header, records = self._checkpoint.load()
+		expected = {
+			"num_rounds": self.num_rounds,
+			"agents": [agent.name for agent in agents],
+			"strategies": [agent.strategy_name for agent in agents],
+			"rules": [[fingerprint(agent.game.game_rules), fingerprint(agent.game.strategy_rules)] for agent in agents],
+		}
+		if header is not None and any(header.get(key) != value for key, value in expected.items()):
+			raise ValueError(f"Checkpoint {self.checkpoint_path} was written for a different tournament.")
+
+		# The agents are tracked from their memories before the replay, and the payoffs of the recorded matches
+		# added as they are replayed, since a memory keeping a window of recent rounds may not hold them all.
+		for agent in agents:
+			self.scoreboard.track(agent)
+		completed = set()
+		for record in sorted(records, key=lambda r: r["match_index"]):
+			group = tuple(agents[i] for i in record["agents"])
+			for key, history in record["histories"].items():
+				memory = agents[int(key)].memory
+				memory.moves.extend(history["moves"])
+				memory.opponent_moves.extend(tuple(move) if isinstance(move, list) else move
+											 for move in history["opponent_moves"])
+				memory.payoffs.extend(history["payoffs"])
+				self.scoreboard.add(agents[int(key)], sum(history["payoffs"]), len(history["payoffs"]))
+				agents[int(key)].status = AgentStatus(history["status"])
+				if not history["native"]:
+					agents[int(key)].native_strategy = None
+			self._add_summary(record["match_index"], MatchSummary(**{
+				key: tuple(value) if isinstance(value, list) else value for key, value in record["summary"].items()}))
+			if not record["summary"]["valid"]:
+				await self._exclude_match(group)
+			completed.add(record["match_index"])
+
+		if completed and not self.match_local_state and not self.reset_state:
+			for agent in agents:
+				self._restore_carried_state(agent)
+		if completed:
+			logger.info(f"Resuming the tournament from {self.checkpoint_path}, skipping {len(completed)} matches.")
+
+		self._checkpoint.open(expected)
+		return completed
+
+	@staticmethod
+	def _restore_carried_state(agent: Agent) -> None:
+		"""
+		Rebuild the round facts an agent carries between matches from the last two rounds of its memory. Native
+		strategies select their moves from memory and need no solver state.
+
+		Args:
+			agent (Agent): The agent.
+		"""
+		if agent.native_strategy is not None:
+			return
+		players = agent.game.game_players
+		memory = agent.memory
+		for own_move, observed in zip(memory.moves[-2:], memory.opponent_moves[-2:]):
+			opponent_moves = list(observed) if isinstance(observed, (list, tuple)) else [observed]
+			agent.solver.record_round(players[0], own_move, list(zip(players[1:], opponent_moves)))
+
+	async def replicate(self, num_replicates: int, base_seed: int = 0, confidence: float = 0.95,
+						replicates: Optional[Sequence[int]] = None) -> ReplicationResult:
+		"""
+		Play independent, seeded replicates of the tournament and estimate the agents' and strategies' payoffs.
+
+		Every replicate rebuilds the valid agents from their rules, as the shards of a tournament do, and seeds each
+		agent's solver and native strategy with a seed derived from the base seed, the replicate number and the
+		agent's index. A replicate is therefore re-run exactly by passing its number in `replicates` with the same
+		base seed. Replicates run in up to `num_workers` processes; the agents of the pool are not changed.
+
+		Args:
+			num_replicates (int): The number of replicates, numbered from 0.
+			base_seed (int, optional): The seed of the replication. Defaults to 0.
+			confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+			replicates (Sequence[int], optional): The replicate numbers to play instead of 0 to
+				num_replicates - 1.
+
+		Returns:
+			ReplicationResult: The per-agent and per-strategy payoff estimates and the payoffs of every replicate.
+		"""
+		agents = list(self.agent_pool.valid_agents)
+		index = {id(agent): i for i, agent in enumerate(agents)}
+		matches = [(m, tuple(index[id(agent)] for agent in group)) for m, group in enumerate(self.match_maker(agents))]
+		specs = {i: _agent_spec(agent) for i, agent in enumerate(agents)}
+		replicates = list(range(num_replicates)) if replicates is None else list(replicates)
+
+		def seeded_specs(replicate):
+			return {i: {**spec, "seed": replicate_seed(base_seed, replicate, i)} for i, spec in specs.items()}
+
+		flags = (self.match_local_state, self.reset_state, self.detect_cycles, self.match_cache)
+		if self.num_workers > 1:
+			loop = asyncio.get_running_loop()
+			with ProcessPoolExecutor(max_workers=min(self.num_workers, len(replicates)) or 1) as executor:
+				runs = await asyncio.gather(*(
+					loop.run_in_executor(executor, play_shard, seeded_specs(r), matches, self.num_rounds, *flags)
+					for r in replicates))
+		else:
+			runs = [await _play_shard(seeded_specs(r), matches, self.num_rounds, *flags) for r in replicates]
+
+		totals = [replicate_totals(results, len(agents)) for results in runs]
+		return summarize_replicates([agent.name for agent in agents], [agent.strategy_name for agent in agents],
+									totals, base_seed, replicates, confidence)
+
+	async def _play_matches(self, matches: Iterable[Tuple[int, Tuple[Agent, ...]]]) -> None:
+		"""
+		Play the specified number of rounds between the agents of each match.
+
+		Args:
+			matches (Iterable[Tuple[int, Tuple[Agent, ...]]]): The matches as pairs of the match index and a tuple
+				of the match's agents, two for a pairwise match or k for an n-player game.
+		"""
+		for match_index, agents in matches:
+			valid_match = await self._play_match(*agents, match_index=match_index)
+			if not valid_match:
+				await self._exclude_match(agents)
+
+	async def _play_matches_concurrently(self, matches: List[Tuple[int, Tuple[Agent, ...]]]) -> None:
+		"""
+		Play the matches concurrently, at most `max_concurrency` at a time.
+
+		With match-local seats, matches are independent and all of them are started at once; their histories are
+		merged into the agents in tournament order. Otherwise the matches are split into rounds in which no agent
+		plays twice, and each agent plays its matches in tournament order, so that the state carried between
+		matches, and with it the final payoffs, are the same as when the matches are played one after another.
+		Solver queries run in worker threads, letting the agents' engines work in parallel.
+
+		Args:
+			matches (List[Tuple[int, Tuple[Agent, ...]]]): The matches as pairs of the match index and the agents.
+		"""
+		semaphore = asyncio.Semaphore(self.max_concurrency)
+
+		async def play(agents, match_index):
+			async with semaphore:
+				return await self._play_match(*agents, match_index=match_index)
+
+		async def play_seats(seats, match_index):
+			async with semaphore:
+				return await self._play_seats(*seats, match_index=match_index)
+
+		agent_groups = [group for _, group in matches]
+		agents = list({id(agent): agent for group in agent_groups for agent in group}.values())
+		for agent in agents:
+			agent.mind.offload_queries = True
+		try:
+			if self.match_local_state:
+				for group in agent_groups:
+					self._begin_match(group)
+				match_seats = [[agent.take_seat(i, position) for position, agent in enumerate(group)]
+							   for i, group in matches]
+				results = await asyncio.gather(*(play_seats(seats, i) for (i, _), seats in zip(matches, match_seats)))
+				for (match_index, group), seats, valid_match in zip(matches, match_seats, results):
+					summary = self._summarize(seats, [0] * len(seats), valid_match)
+					histories = self._match_histories(seats, [(0, 0, 0)] * len(seats))
+					self._leave_seats(seats)
+					self._end_match(group)
+					await self._finish_match(match_index, group, histories, summary)
+					if not valid_match:
+						await self._exclude_match(group)
+				return
+			match_indices = {id(group): i for i, group in matches}
+			for round_groups in schedule_rounds(agent_groups):
+				results = await asyncio.gather(*(play(group, match_indices[id(group)]) for group in round_groups))
+				for group, valid_match in zip(round_groups, results):
+					if not valid_match:
+						await self._exclude_match(group)
+		finally:
+			for agent in agents:
+				agent.mind.offload_queries = False
+
+	async def _play_matches_in_processes(self, matches: List[Tuple[int, Tuple[Agent, ...]]]) -> None:
+		"""
+		Shard the matches across `num_workers` processes and merge the results into the agent pool.
+
+		Each worker rebuilds the agents of its shard from their rules in its own engines and plays its matches one
+		after another. The move and payoff histories are then appended to the agents' memories in tournament
+		order, so that `get_winners` and `log_tournament` work as if the matches were played here.
 
-		# Step 3: Conduct matches between agent pairs
-		await self._play_matches(agent_pairs)
+		Args:
+			matches (List[Tuple[int, Tuple[Agent, ...]]]): The matches as pairs of the match index and the agents.
+		"""
+		agents = list({id(agent): agent for _, group in matches for agent in group}.values())
+		index = {id(agent): i for i, agent in enumerate(agents)}
+
+		# Contiguous shards of about equal estimated cost keep the relative order of each agent's matches within a
+		# shard. Match makers may estimate the cost of their matches; other functions get the default estimate.
+		cost = getattr(self.match_maker, "cost", match_cost)
+		shards = [[(m, tuple(index[id(agent)] for agent in group)) for m, group in shard]
+				  for shard in partition(matches, self.num_workers, cost=lambda match: cost(match[1]))]
+		num_shards = len(shards)
+
+		loop = asyncio.get_running_loop()
+		with ProcessPoolExecutor(max_workers=num_shards or 1) as executor:
+			futures = []
+			for shard in shards:
+				specs = {i: _agent_spec(agents[i]) for _, group in shard for i in group}
+				futures.append(loop.run_in_executor(executor, play_shard, specs, shard, self.num_rounds,
+											   self.match_local_state, self.reset_state, self.detect_cycles,
+											   self.match_cache))
+			shard_results = await asyncio.gather(*futures)
+
+		for result in sorted((result for results in shard_results for result in results), key=lambda r: r.index):
+			group = tuple(agents[i] for i in result.agents)
+			histories = {id(agents[i]): (result.moves.get(i, []), result.opponent_moves.get(i, []),
+										 result.payoffs.get(i, [])) for i in dict.fromkeys(result.agents)}
+			result.merge_into(agents)
+			if not result.valid:
+				for i in result.agents:
+					agents[i].status = AgentStatus(result.statuses[i])
+			if result.summary is not None:
+				if self.events.active:
+					await self.events.publish(
+						MatchStarted(result.index, result.summary.agents, result.summary.strategies))
+				await self._finish_match(result.index, group, histories, result.summary)
+			if not result.valid:
+				await self._exclude_match(group)
 
-	async def _play_matches(self, agent_pairs: List[Tuple[Agent, Agent]]) -> None:
+	async def _exclude_match(self, agents: Tuple[Agent, ...]) -> None:
 		"""
-		Play the specified number of rounds between each pair of agents.
+		Move the agents of an invalid match to the pool matching their status.
 
 		Args:
-			agent_pairs (List[Tuple[Agent, Agent]]): List of tuples representing pairs of agents.
+			agents (Tuple[Agent, ...]): The agents of the match.
 		"""
-		for agent1, agent2 in agent_pairs:
-			valid_pair = await self._play_match(agent1, agent2)
-			if not valid_pair:
-				logger.debug(
-					f"Agent {agent1.name} or {agent2.name} not valid. Excluding the pair from the tournament.")
-				self.agent_pool.move_agent(agent1)
-				self.agent_pool.move_agent(agent2)
+		names = ", ".join(agent.name for agent in agents)
+		logger.debug(
+			f"One of agents {names} not valid. Excluding the match from the tournament.")
+		for agent in agents:
+			self.agent_pool.move_agent(agent)
+			if self.events.active and agent.status != AgentStatus.CORRECT:
+				await self.events.publish(AgentStatusChanged(agent.name, agent.status.value))
 
-	async def _play_match(self, agent1: Agent, agent2: Agent) -> bool:
+	@staticmethod
+	def _seat_marks(seats: List[Seat]) -> List[Tuple[int, int, int]]:
 		"""
-		Play a match between two agents for multiple rounds.
+		Get the lengths of the seats' histories before a match.
 
 		Args:
-			agent1 (Agent): The first agent.
-			agent2 (Agent): The second agent.
+			seats (List[Seat]): The seats of a match.
 
 		Returns:
-			bool: True if both agents are valid throughout the match, False otherwise.
+			List[Tuple[int, int, int]]: The lengths of the moves, observed moves and payoffs of each seat.
+		"""
+		return [(len(seat.memory.moves), len(seat.memory.opponent_moves), len(seat.memory.payoffs)) for seat in seats]
+
+	@staticmethod
+	def _match_histories(seats: List[Seat], marks: List[Tuple[int, int, int]]) -> Dict[int, Tuple[list, list, list]]:
 		"""
+		Collect the histories each agent added in a match from its seats, in seat order, as `leave_seat` merges
+		them. Match-local seats hold their whole match even when the agent's memory keeps only a window of it.
+
+		Args:
+			seats (List[Seat]): The seats of the match.
+			marks (List[Tuple[int, int, int]]): The lengths of the seats' histories before the match.
+
+		Returns:
+			Dict[int, Tuple[list, list, list]]: The moves, observed moves and payoffs of each agent in the match,
+			keyed by the agent's id.
+		"""
+		histories = {}
+		for seat, (moves_start, observed_start, payoffs_start) in zip(seats, marks):
+			# The default seats of an agent playing itself share the agent's memory.
+			if seat.legacy and id(seat.agent) in histories:
+				continue
+			moves, opponent_moves, payoffs = histories.setdefault(id(seat.agent), ([], [], []))
+			moves.extend(seat.memory.moves[moves_start:])
+			opponent_moves.extend(seat.memory.opponent_moves[observed_start:])
+			payoffs.extend(seat.memory.payoffs[payoffs_start:])
+		return histories
+
+	def _add_summary(self, match_index: int, summary: MatchSummary) -> None:
+		"""
+		Insert the totals of a match among the match summaries, in match order.
+
+		Args:
+			match_index (int): Position of the match in the tournament's match order.
+			summary (MatchSummary): The totals of the match.
+		"""
+		position = bisect.bisect(self._summary_indices, match_index)
+		self._summary_indices.insert(position, match_index)
+		self.match_summaries.insert(self._summary_start + position, summary)
+
+	async def _finish_match(self, match_index: int, agents: Tuple[Agent, ...],
+							histories: Dict[int, Tuple[list, list, list]], summary: MatchSummary) -> None:
+		"""
+		Store the totals of a finished match, add the agents' payoffs to the scoreboard, publish the match's end and
+		append it to the checkpoint.
+
+		Args:
+			match_index (int): Position of the match in the tournament's match order.
+			agents (Tuple[Agent, ...]): The agents of the match, whose memories already include the match.
+			histories (Dict[int, Tuple[list, list, list]]): The moves, observed moves and payoffs of each agent in
+				the match, keyed by the agent's id.
+			summary (MatchSummary): The totals of the match.
+		"""
+		self._add_summary(match_index, summary)
+		for agent, payoff in zip(agents, summary.payoffs):
+			self.scoreboard.add(agent, payoff, summary.rounds)
+		if self.events.active:
+			await self.events.publish(
+				MatchEnded(match_index, summary.agents, summary.payoffs, summary.rounds, summary.valid))
+		if self._checkpoint is None:
+			return
+
+		records = {}
+		for agent in dict.fromkeys(agents):
+			moves, opponent_moves, payoffs = histories[id(agent)]
+			records[self._agent_index[id(agent)]] = {
+				"moves": moves,
+				"opponent_moves": opponent_moves,
+				"payoffs": payoffs,
+				"status": agent.status.value,
+				"native": agent.native_strategy is not None,
+			}
+		self._checkpoint.append({
+			"match_index": match_index,
+			"agents": [self._agent_index[id(agent)] for agent in agents],
+			"histories": records,
+			"summary": asdict(summary),
+		})
+
+	async def _play_match(self, *agents: Agent, match_index: int = 0) -> bool:
+		"""
+		Play a match between two or more agents for multiple rounds.
+
+		Each agent plays as the first player of its own game and observes the moves of the other agents, in match
+		order, as the moves of its remaining players.
+
+		Args:
+			*agents (Agent): The agents of the match.
+			match_index (int): Position of the match in the tournament's match order.
+
+		Returns:
+			bool: True if all agents are valid throughout the match, False otherwise.
+		"""
+		self._begin_match(agents)
+		if not self.match_local_state:
+			seats = [agent.default_seat for agent in agents]
+		else:
+			seats = [agent.take_seat(match_index, position) for position, agent in enumerate(agents)]
+		marks = self._seat_marks(seats)
+		valid_match = await self._play_seats(*seats, match_index=match_index)
+		summary = self._summarize(seats, [mark[2] for mark in marks], valid_match)
+		histories = self._match_histories(seats, marks)
+		self._leave_seats(seats)
+		self._end_match(agents)
+		await self._finish_match(match_index, agents, histories, summary)
+		return valid_match
+
+	@staticmethod
+	def _summarize(seats: List[Seat], starts: List[int], valid_match: bool) -> MatchSummary:
+		"""
+		Total the payoffs of a finished match.
+
+		Args:
+			seats (List[Seat]): The seats of the match.
+			starts (List[int]): Length of each seat's payoff history when the match started.
+			valid_match (bool): Whether the match was valid.
+
+		Returns:
+			MatchSummary: The totals of the match.
+		"""
+		payoffs = [seat.memory.payoffs[start:] for seat, start in zip(seats, starts)]
+		return MatchSummary(
+			agents=tuple(seat.agent.name for seat in seats),
+			strategies=tuple(seat.agent.strategy_name for seat in seats),
+			payoffs=tuple(sum(history) for history in payoffs),
+			rounds=min(len(history) for history in payoffs),
+			valid=valid_match,
+		)
+
+	def _begin_match(self, agents: Tuple[Agent, ...]) -> None:
+		"""
+		Snapshot the solver state of agents playing their first match, and start the match history of agents
+		playing in their default seats.
+
+		Args:
+			agents (Tuple[Agent, ...]): The agents of the match.
+		"""
+		if not self.reset_state:
+			return
+		for agent in dict.fromkeys(agents):
+			if id(agent.solver) not in self._snapshots:
+				success, _ = agent.solver.snapshot_state(self.STATE_SNAPSHOT)
+				if success:
+					self._snapshots.add(id(agent.solver))
+			if not self.match_local_state:
+				agent.default_seat.history_start = len(agent.memory.moves)
+
+	def _end_match(self, agents: Tuple[Agent, ...]) -> None:
+		"""
+		Restore the solver state of the agents to the snapshot taken before their first match.
+
+		Args:
+			agents (Tuple[Agent, ...]): The agents of the match.
+		"""
+		if not self.reset_state:
+			return
+		for agent in dict.fromkeys(agents):
+			agent.default_seat.history_start = 0
+			if id(agent.solver) in self._snapshots:
+				success, _ = agent.solver.restore_state(self.STATE_SNAPSHOT)
+				if not success:
+					logger.debug(f"Solver state of agent {agent.name} not restored.")
+
+	async def _play_seats(self, *seats: Seat, match_index: int = 0) -> bool:
+		"""
+		Play the rounds of a match between the agents in the given seats, or replay them from the match cache.
+
+		Args:
+			*seats (Seat): The seats of the match's agents, in match order.
+			match_index (int): Position of the match in the tournament's match order.
+
+		Returns:
+			bool: True if all agents are valid throughout the match, False otherwise.
+		"""
+		if self.events.active:
+			await self.events.publish(MatchStarted(
+				match_index, tuple(seat.agent.name for seat in seats), tuple(seat.agent.strategy_name for seat in seats)))
+
+		cache_key = self.match_cache.key(seats, self.num_rounds) if self.match_cache is not None else None
+		if cache_key is not None and self.match_cache.replay(cache_key, seats):
+			if self.events.active:
+				await self.events.publish(MatchReplayed(match_index, self.num_rounds))
+			return True
+
+		valid_match = await self._play_rounds(seats, match_index)
+		if cache_key is not None and valid_match and all(seat.status == AgentStatus.CORRECT for seat in seats):
+			self.match_cache.record(cache_key, seats)
+		return valid_match
+
+	async def _play_rounds(self, seats: Tuple[Seat, ...], match_index: int) -> bool:
+		"""
+		Play the rounds of a match round by round, fast-forwarding them once the match cycles.
+
+		Args:
+			seats (Tuple[Seat, ...]): The seats of the match's agents, in match order.
+			match_index (int): Position of the match in the tournament's match order.
+
+		Returns:
+			bool: True if all agents are valid throughout the match, False otherwise.
+		"""
+		log_rounds = logger.isEnabledFor(logging.INFO)
+
+		# The moves of deterministic strategies depend only on the round facts, so once the joint facts of all
+		# seats repeat, the rounds in between repeat until the end of the match.
+		detect_cycles = self.detect_cycles and all(not seat.legacy and seat.deterministic for seat in seats)
+		seen_states = {}
+		states = []
 		for round_num in range(self.num_rounds):
-			logger.info(
-				f"\nAgent {agent1.name} with {agent1.strategy_name} vs {agent2.name} with {agent2.strategy_name}, Round {round_num}.")
+			if detect_cycles:
+				state = tuple(seat.round_state() for seat in seats)
+				if state in seen_states:
+					self._fast_forward(seats, states, seen_states[state], round_num)
+					if self.events.active:
+						await self.events.publish(RoundsRepeated(
+							match_index, seen_states[state], round_num - seen_states[state], self.num_rounds - round_num))
+					return True
+				seen_states[state] = round_num
+				states.append(state)
 
-			# Get moves from both agents
-			move_agent_1, move_agent_2 = await agent1.mind.act(), await agent2.mind.act()
-			if not (move_agent_1 and move_agent_2):
+			if log_rounds:
+				description = " vs ".join(f"{seat.agent.name} with {seat.agent.strategy_name}" for seat in seats)
+				logger.info(f"\nAgent {description}, Round {round_num}.")
+
+			# Get moves from all agents
+			moves = [await seat.agent.mind.act(seat) for seat in seats]
+			if any(move is None for move in moves):
 				return False
 
-			await agent1.mind.observe(move_agent_2)
-			await agent2.mind.observe(move_agent_1)
+			for i, seat in enumerate(seats):
+				opponent_moves = moves[:i] + moves[i + 1:]
+				await seat.agent.mind.observe(opponent_moves[0] if len(opponent_moves) == 1 else opponent_moves, seat)
 
 			# Update payoffs based on the opponents' moves
-			updated_1 = await agent1.mind.think()
-			updated_2 = await agent2.mind.think()
-			if not (updated_1 and updated_2):
+			updated = [await seat.agent.mind.think(seat) for seat in seats]
+			if not all(updated):
 				return False
 
+			if self.events.active:
+				await self.events.publish(RoundPlayed(
+					match_index, round_num, tuple(moves), tuple(seat.memory.payoffs[-1] for seat in seats)))
+
 		return True
 
+	def _fast_forward(self, seats: Tuple[Seat, ...], states: list, cycle_start: int, round_num: int) -> None:
+		"""
+		Append the remaining rounds of a cycling match to the seats' histories in bulk.
+
+		Args:
+			seats (Tuple[Seat, ...]): The seats of the match.
+			states (list): The joint round facts of the seats before each round played so far.
+			cycle_start (int): The round whose state is repeated before round `round_num`.
+			round_num (int): The next round to play.
+		"""
+		period = round_num - cycle_start
+		remaining = self.num_rounds - round_num
+		repeats, rest = divmod(remaining, period)
+		logger.debug(f"Match cycles with period {period} from round {cycle_start}, "
+					 f"fast-forwarding {remaining} rounds.")
+		for i, seat in enumerate(seats):
+			memory = seat.memory
+			for history in (memory.moves, memory.opponent_moves, memory.payoffs):
+				cycle = history[cycle_start:round_num]
+				history.extend(cycle * repeats + cycle[:rest])
+			seat.facts = dict(states[cycle_start + rest][i])
+
+	@staticmethod
+	def _leave_seats(seats: List[Seat]) -> None:
+		"""
+		Merge the match-local seats of a finished match into their agents, in match order.
+
+		Args:
+			seats (List[Seat]): The seats of the match.
+		"""
+		for seat in seats:
+			seat.agent.leave_seat(seat)
+
 	def get_winners(self) -> List[Agent]:
 		"""
 		Determine the winners of the tournament.
@@ -121,7 +715,7 @@ class Environment:
 		"""
 		return [
 			agent for i, agent in enumerate(self.agent_pool.valid_agents)
-			if agent.mind.get_total_payoff() == self.target_payoffs[i]
+			if self.scoreboard.total(agent) == self.target_payoffs[i]
 		]
 
 	def _get_winners_by_highest_payoff(self) -> List[Agent]:
@@ -131,13 +725,13 @@ class Environment:
 		Returns:
 			List[Agent]: A list of agents with the highest payoff.
 		"""
-		max_payoff = max(agent.mind.get_total_payoff() for agent in self.agent_pool.valid_agents)
-		return [agent for agent in self.agent_pool.valid_agents if agent.mind.get_total_payoff(log=False) == max_payoff]
+		return self.scoreboard.winners(self.agent_pool.valid_agents)
 
 	def log_tournament(
 			self,
 			experiment_dir: str,
-			tournament_name: str = "tournament"
+			tournament_name: str = "tournament",
+			snapshots: bool = False
 	) -> bool:
 		"""
 		Logs the details of a tournament, including its configuration and agents' information.
@@ -145,6 +739,8 @@ class Environment:
 		Args:
 			experiment_dir (str): The directory where the tournament logs will be saved.
 			tournament_name (str): The name of the tournament (default is "tournament").
+			snapshots (bool): Whether each agent is also saved as a binary snapshot, for a fast `Agent.restore`,
+				with the rules of all agents in one rule store (default: False).
 		"""
 		timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 		tournament_dir = os.path.join(experiment_dir, f"{tournament_name}_{timestamp}")
@@ -155,7 +751,7 @@ class Environment:
 			"num_agents": len(self.agent_pool.valid_agents)+len(self.agent_pool.invalid_agents),
 			"num_rounds": self.num_rounds,
 			"target_payoffs": self.target_payoffs,
-			"winners_payoffs": [(winner.name, winner.strategy_name, winner.mind.get_total_payoff()) for winner in
+			"winners_payoffs": [(winner.name, winner.strategy_name, self.scoreboard.total(winner)) for winner in
 								self.get_winners()]
 		}
 		with open(os.path.join(tournament_dir, "tournament_info.json"), "w") as f:
@@ -165,5 +761,101 @@ class Environment:
 		agents = self.agent_pool.valid_agents + self.agent_pool.invalid_agents
 		for agent in agents:
 			agent.save(tournament_dir)
+			if snapshots:
+				agent.save_snapshot(tournament_dir)
+
+		return True, tournament_dir
+
+
+def _agent_spec(agent: Agent) -> dict:
+	"""
+	Serialize what a worker process needs to rebuild an agent.
+
+	Args:
+		agent (Agent): The agent.
+
+	Returns:
+		dict: The agent's rules and settings, in the format of a saved agent.
+	"""
+	game = agent.game
+	return {
+		"log": {
+			"name": agent.name,
+			"strategy_name": agent.strategy_name,
+			"strategy_rules": game.strategy_rules,
+			"status": agent.status.value,
+			"game_rules": game.game_rules,
+			"game_moves": game.game_moves,
+			"game_players": game.game_players,
+			"default_move": game.default_move,
+		},
+		"seed": agent.seed,
+		"use_native_strategy": agent.use_native_strategy,
+		"native_check_interval": agent.native_check_interval,
+	}
+
+
+def play_shard(specs: Dict[int, dict], matches: List[Tuple[int, Tuple[int, ...]]], num_rounds: int,
+			   match_local_state: bool = True, reset_state: bool = True, detect_cycles: bool = True,
+			   match_cache: Optional[MatchCache] = None) -> List[MatchResult]:
+	"""
+	Play a shard of a tournament in a worker process.
+
+	Args:
+		specs (Dict[int, dict]): Serialized agents of the shard, keyed by agent index.
+		matches (List[Tuple[int, Tuple[int, ...]]]): The shard's matches, as pairs of the match index and the
+			indices of its agents.
+		num_rounds (int): The number of rounds per match.
+		match_local_state (bool): Whether matches are played in match-local seats.
+		reset_state (bool): Whether the agents' solver states are restored at the end of each match.
+		detect_cycles (bool): Whether matches of deterministic strategies are fast-forwarded once they cycle.
+		match_cache (Optional[MatchCache]): The match cache; a worker shares its database, if any, and a copy of
+			its entries in memory.
+
+	Returns:
+		List[MatchResult]: The results of the shard's matches, in shard order.
+	"""
+	return asyncio.run(_play_shard(specs, matches, num_rounds, match_local_state, reset_state, detect_cycles,
+								   match_cache))
+
+
+async def _play_shard(specs, matches, num_rounds, match_local_state, reset_state, detect_cycles,
+					  match_cache=None) -> List[MatchResult]:
+	agents = {}
+	for i, spec in specs.items():
+		agent = Agent(autoformalization_on=False)
+		agent.use_native_strategy = spec["use_native_strategy"]
+		agent.native_check_interval = spec["native_check_interval"]
+		await agent.initialize(agent_json=spec["log"])
+		# The rules carry the original default move; replay an update made since.
+		if spec["log"]["default_move"] != agent.game.default_move:
+			agent.update_default_move(spec["log"]["default_move"])
+		if spec["seed"] is not None:
+			agent.set_seed(spec["seed"])
+		agents[i] = agent
 
-		return True, tournament_dir
\ No newline at end of file
+	environment = Environment(None, num_rounds, None, match_local_state=match_local_state, reset_state=reset_state,
+							  detect_cycles=detect_cycles, match_cache=match_cache)
+	results = []
+	try:
+		for match_index, group in matches:
+			unique = list(dict.fromkeys(group))
+			start = {i: (len(agents[i].memory.moves), len(agents[i].memory.opponent_moves),
+						 len(agents[i].memory.payoffs)) for i in unique}
+			valid = await environment._play_match(*(agents[i] for i in group), match_index=match_index)
+			results.append(MatchResult(
+				index=match_index,
+				agents=group,
+				valid=valid,
+				moves={i: agents[i].memory.moves[start[i][0]:] for i in unique},
+				opponent_moves={i: agents[i].memory.opponent_moves[start[i][1]:] for i in unique},
+				payoffs={i: agents[i].memory.payoffs[start[i][2]:] for i in unique},
+				statuses={i: agents[i].status.value for i in unique},
+				summary=environment.match_summaries[-1],
+			))
+	finally:
+		for agent in agents.values():
+			agent.release_solver()
+		if match_cache is not None:
+			match_cache.close()
+	return results
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+from magif.utils.setup_logger import logger
+from magif.utils.utils import set_default
+
+
+@dataclass
+class TournamentEvent:
+	"""
+	Base class of the typed events published by a tournament.
+
+	Attributes:
+		event (str): The event type, as written in serialized events.
+	"""
+	event: ClassVar[str] = "event"
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Serialize the event to a dictionary with its type under "event".
+
+		Returns:
+			Dict[str, Any]: The event's fields.
+		"""
+		return {"event": self.event, **asdict(self)}
+
+
+@dataclass
+class MatchStarted(TournamentEvent):
+	event: ClassVar[str] = "match_start"
+	match_index: int
+	agents: Tuple[str, ...]
+	strategies: Tuple[str, ...]
+
+
+@dataclass
+class RoundPlayed(TournamentEvent):
+	event: ClassVar[str] = "round"
+	match_index: int
+	round_num: int
+	moves: Tuple[Any, ...]
+	payoffs: Tuple[Any, ...]
+
+
+@dataclass
+class RoundsRepeated(TournamentEvent):
+	"""
+	The remaining rounds of a match repeat the rounds `start_round` to `start_round + period - 1` and were
+	fast-forwarded instead of being published one by one.
+	"""
+	event: ClassVar[str] = "rounds_repeated"
+	match_index: int
+	start_round: int
+	period: int
+	num_rounds: int
+
+
+@dataclass
+class MatchReplayed(TournamentEvent):
+	"""
+	The rounds of a match were replayed from the match cache instead of being played and published one by one.
+	"""
+	event: ClassVar[str] = "match_replayed"
+	match_index: int
+	num_rounds: int
+
+
+@dataclass
+class MatchEnded(TournamentEvent):
+	event: ClassVar[str] = "match_end"
+	match_index: int
+	agents: Tuple[str, ...]
+	payoffs: Tuple[Any, ...]
+	rounds: int
+	valid: bool
+
+
+@dataclass
+class AgentStatusChanged(TournamentEvent):
+	event: ClassVar[str] = "agent_status"
+	agent: str
+	status: str
+
+
+@dataclass
+class TournamentEnded(TournamentEvent):
+	event: ClassVar[str] = "tournament_end"
+	num_matches: int
+
+
+class EventStream:
+	"""
+	An asynchronous iterator over the events of a bus, buffered in a bounded queue.
+
+	When the queue is full, the publisher waits for the subscriber to catch up, so that a slow consumer slows the
+	tournament down instead of letting events pile up in memory.
+	"""
+	_END = object()
+
+	def __init__(self, maxsize: int):
+		self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+	def __aiter__(self) -> "EventStream":
+		return self
+
+	async def __anext__(self) -> TournamentEvent:
+		event = await self.queue.get()
+		if event is self._END:
+			raise StopAsyncIteration
+		return event
+
+
+class EventBus:
+	"""
+	Publishes tournament events to subscribed streams.
+
+	Attributes:
+		streams (List[EventStream]): The subscribed streams.
+	"""
+
+	def __init__(self):
+		self.streams: List[EventStream] = []
+
+	@property
+	def active(self) -> bool:
+		"""
+		Whether any stream is subscribed; publishers skip building events otherwise.
+		"""
+		return bool(self.streams)
+
+	def subscribe(self, maxsize: int = 1024) -> EventStream:
+		"""
+		Subscribe a new stream to the events published from now on.
+
+		Args:
+			maxsize (int): The number of events buffered before the publisher waits (default: 1024).
+
+		Returns:
+			EventStream: The stream, ending when the bus is closed.
+		"""
+		stream = EventStream(maxsize)
+		self.streams.append(stream)
+		return stream
+
+	def unsubscribe(self, stream: EventStream) -> None:
+		"""
+		Stop publishing to a stream.
+
+		Args:
+			stream (EventStream): A subscribed stream.
+		"""
+		if stream in self.streams:
+			self.streams.remove(stream)
+
+	async def publish(self, event: TournamentEvent) -> None:
+		"""
+		Publish an event to all streams, waiting for room in full ones.
+
+		Args:
+			event (TournamentEvent): The event.
+		"""
+		for stream in self.streams:
+			await stream.queue.put(event)
+
+	async def close(self) -> None:
+		"""
+		End all streams and unsubscribe them.
+		"""
+		streams, self.streams = self.streams, []
+		for stream in streams:
+			await stream.queue.put(EventStream._END)
+
+
+async def write_jsonl(stream: EventStream, path: str) -> int:
+	"""
+	Write the events of a stream to a JSON Lines file until the stream ends.
+
+	Args:
+		stream (EventStream): The stream.
+		path (str): The path of the file.
+
+	Returns:
+		int: The number of events written.
+	"""
+	count = 0
+	with open(path, "w") as f:
+		async for event in stream:
+			f.write(json.dumps(event.to_dict(), default=set_default) + "\n")
+			count += 1
+	return count
+
+
+async def log_events(stream: EventStream, level: int = logging.INFO) -> None:
+	"""
+	Log the events of a stream until the stream ends.
+
+	Args:
+		stream (EventStream): The stream.
+		level (int): The logging level (default: INFO).
+	"""
+	async for event in stream:
+		if logger.isEnabledFor(level):
+			logger.log(level, "%s", event)
+
+
+async def send_events(stream: EventStream, websocket: Optional["WebSocket"]) -> None:
+	"""
+	Send the events of a stream to a UI websocket until the stream ends.
+
+	A tournament started from a websocket handler streams to its client by subscribing before playing, e.g.:
+
+		sender = asyncio.create_task(send_events(environment.events.subscribe(), websocket))
+		await environment.play_tournament()
+		await sender
+
+	Args:
+		stream (EventStream): The stream.
+		websocket (WebSocket): A websocket instance to send messages to UI.
+	"""
+	async for event in stream:
+		await websocket.send_text(json.dumps({
+			"type": "event",
+			"data": json.dumps(event.to_dict(), default=set_default)
+		}))
@@ -0,0 +1,183 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from magif.environment.match_result import MatchSummary
+
+
+def payoff_matrix(match_summaries: Sequence[MatchSummary],
+				  strategies: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+	"""
+	Build the strategy x strategy matrix of average payoffs per round from the matches of a tournament.
+
+	Entry (i, j) is the average payoff per round of strategy i against strategy j, over all valid pairwise matches
+	between agents with these strategies, including self-play. Pairs of strategies that never met are NaN.
+
+	Args:
+		match_summaries (Sequence[MatchSummary]): The matches of a tournament, e.g. `Environment.match_summaries`.
+		strategies (Optional[Sequence[str]]): The strategies indexing the matrix (default: all strategies that
+			played, in order of first appearance).
+
+	Returns:
+		Tuple[List[str], numpy.ndarray]: The strategy names and the (n, n) matrix.
+	"""
+	pairwise = [summary for summary in match_summaries
+				if summary.valid and summary.rounds > 0 and len(summary.strategies) == 2]
+	if strategies is None:
+		strategies = list(dict.fromkeys(strategy for summary in pairwise for strategy in summary.strategies))
+	index = {strategy: i for i, strategy in enumerate(strategies)}
+
+	totals = np.zeros((len(strategies), len(strategies)))
+	rounds = np.zeros((len(strategies), len(strategies)))
+	for summary in pairwise:
+		if not all(strategy in index for strategy in summary.strategies):
+			continue
+		first, second = (index[strategy] for strategy in summary.strategies)
+		totals[first, second] += summary.payoffs[0]
+		rounds[first, second] += summary.rounds
+		totals[second, first] += summary.payoffs[1]
+		rounds[second, first] += summary.rounds
+
+	with np.errstate(invalid="ignore", divide="ignore"):
+		return list(strategies), np.where(rounds > 0, totals / rounds, np.nan)
+
+
+def _initial_shares(num_strategies: int, num_seeds: int, rng: np.random.Generator,
+					initial_shares: Optional[Sequence[float]]) -> np.ndarray:
+	"""
+	Get a batch of initial strategy shares: the given shares for every seed, or shares drawn uniformly from the
+	simplex.
+	"""
+	if initial_shares is not None:
+		shares = np.asarray(initial_shares, dtype=float)
+		return np.broadcast_to(shares / shares.sum(), (num_seeds, num_strategies)).copy()
+	return rng.dirichlet(np.ones(num_strategies), size=num_seeds)
+
+
+def replicator_dynamics(matrix: np.ndarray,
+						generations: int = 1000,
+						num_seeds: int = 1,
+						initial_shares: Optional[Sequence[float]] = None,
+						step: float = 0.01,
+						seed: Optional[int] = None) -> np.ndarray:
+	"""
+	Simulate the replicator dynamics of an infinite population for a batch of initial conditions.
+
+	Each generation applies an Euler step of x_i' = x_i (f_i - f), where f_i = (A x)_i is the fitness of strategy
+	i and f = x . A x the average fitness. Missing payoffs (NaN) count as zero.
+
+	Args:
+		matrix (numpy.ndarray): The (n, n) payoff matrix, e.g. from `payoff_matrix`.
+		generations (int): The number of generations.
+		num_seeds (int): The number of populations simulated as a batch.
+		initial_shares (Optional[Sequence[float]]): The initial shares of every population (default: random
+			shares per population).
+		step (float): The step size of a generation.
+		seed (Optional[int]): Seed of the random initial shares.
+
+	Returns:
+		numpy.ndarray: Strategy shares of shape (generations + 1, num_seeds, n).
+	"""
+	matrix = np.nan_to_num(np.asarray(matrix, dtype=float))
+	rng = np.random.default_rng(seed)
+	shares = _initial_shares(matrix.shape[0], num_seeds, rng, initial_shares)
+
+	history = np.empty((generations + 1,) + shares.shape)
+	history[0] = shares
+	for generation in range(1, generations + 1):
+		fitness = shares @ matrix.T
+		average = np.einsum("bi,bi->b", shares, fitness)[:, None]
+		shares = np.clip(shares + step * shares * (fitness - average), 0.0, None)
+		shares /= shares.sum(axis=1, keepdims=True)
+		history[generation] = shares
+	return history
+
+
+def moran_process(matrix: np.ndarray,
+				  population_size: int = 100,
+				  steps: int = 10000,
+				  num_seeds: int = 1,
+				  initial_shares: Optional[Sequence[float]] = None,
+				  selection_intensity: float = 1.0,
+				  mutation_rate: float = 0.0,
+				  record_every: int = 1,
+				  seed: Optional[int] = None) -> np.ndarray:
+	"""
+	Simulate a Moran process in a finite, well-mixed population for a batch of populations.
+
+	At each step one individual is chosen to reproduce with probability proportional to its fitness
+	exp(w * f_i), where f_i is its average payoff against the rest of the population, and its offspring
+	replaces an individual chosen uniformly at random. With a mutation rate, the offspring takes a uniformly
+	random strategy instead. Missing payoffs (NaN) count as zero.
+
+	Args:
+		matrix (numpy.ndarray): The (n, n) payoff matrix, e.g. from `payoff_matrix`.
+		population_size (int): The number of individuals in each population.
+		steps (int): The number of birth-death steps.
+		num_seeds (int): The number of populations simulated as a batch.
+		initial_shares (Optional[Sequence[float]]): The initial shares of every population (default: random
+			shares per population).
+		selection_intensity (float): The selection intensity w; 0 is neutral drift.
+		mutation_rate (float): The probability that an offspring takes a random strategy.
+		record_every (int): Every how many steps the shares are recorded.
+		seed (Optional[int]): Seed of the simulation.
+
+	Returns:
+		numpy.ndarray: Strategy shares of shape (steps // record_every + 1, num_seeds, n).
+
+	Raises:
+		ValueError: If the population has fewer than two individuals.
+	"""
+	if population_size < 2:
+		raise ValueError("A Moran process needs at least two individuals.")
+
+	matrix = np.nan_to_num(np.asarray(matrix, dtype=float))
+	num_strategies = matrix.shape[0]
+	rng = np.random.default_rng(seed)
+
+	# Round the initial shares to counts that sum to the population size.
+	shares = _initial_shares(num_strategies, num_seeds, rng, initial_shares)
+	counts = np.floor(shares * population_size).astype(np.int64)
+	shortfall = population_size - counts.sum(axis=1)
+	for b in np.nonzero(shortfall)[0]:
+		counts[b] += rng.multinomial(shortfall[b], shares[b])
+
+	batch = np.arange(num_seeds)
+	self_payoff = np.diag(matrix)
+	history = [counts / population_size]
+	for step_num in range(1, steps + 1):
+		# Average payoff of an individual of each strategy against the other individuals.
+		payoffs = (counts @ matrix.T - self_payoff) / (population_size - 1)
+		weights = counts * np.exp(selection_intensity * (payoffs - payoffs.max(axis=1, keepdims=True)))
+		parents = _sample(weights, rng)
+		if mutation_rate > 0:
+			mutants = rng.random(num_seeds) < mutation_rate
+			parents = np.where(mutants, rng.integers(num_strategies, size=num_seeds), parents)
+		deaths = _sample(counts.astype(float), rng)
+		# Each population appears once per index array, so the fancy-indexed updates do not collide.
+		counts[batch, parents] += 1
+		counts[batch, deaths] -= 1
+		if step_num % record_every == 0:
+			history.append(counts / population_size)
+	return np.stack(history)
+
+
+def _sample(weights: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+	"""
+	Draw one index per row with probability proportional to the row's weights.
+	"""
+	cumulative = np.cumsum(weights, axis=1)
+	draws = rng.random(weights.shape[0]) * cumulative[:, -1]
+	return (cumulative <= draws[:, None]).sum(axis=1)
+
+
+def summarize_shares(history: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	Get the mean and standard deviation of the strategy shares over the batch of populations.
+
+	Args:
+		history (numpy.ndarray): Shares of shape (time, num_seeds, n), from `replicator_dynamics` or
+			`moran_process`.
+
+	Returns:
+		Tuple[numpy.ndarray, numpy.ndarray]: The mean and the standard deviation, each of shape (time, n).
+	"""
+	return history.mean(axis=1), history.std(axis=1)
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+from magif.agent.seat import Seat
+from magif.utils.utils import fingerprint, set_default
+
+# The histories of a match: the moves, observed moves and payoffs of each seat, in seat order.
+Histories = List[Tuple[list, list, list]]
+
+
+class MatchCache:
+	"""
+	Recorded histories of matches between deterministic strategies, reused instead of replaying the matches.
+
+	A match between deterministic strategies in match-local seats is fully determined by each agent's game rules,
+	strategy rules, default move and initial round facts, and by the number of rounds. The cache keys a match by these, so
+	that repeated pairings, such as the same strategies loaded for several agents of one game, are played once.
+	Every agent sees a two-player match from its own side, so the two orders of a pairwise match share one entry.
+
+	Entries are kept in memory and, with a path, in a SQLite database shared by all processes using the path.
+
+	Attributes:
+		path (Optional[str]): The path of the database, if any.
+		entries (Dict[str, Histories]): The entries in memory, keyed by match key.
+		hits (int): The number of matches replayed from the cache.
+		misses (int): The number of cacheable matches that had to be played.
+	"""
+
+	def __init__(self, path: Optional[str] = None):
+		"""
+		Initializes the cache.
+
+		Args:
+			path (Optional[str]): The path of the database; None keeps the cache in memory only.
+		"""
+		self.path = path
+		self.entries: Dict[str, Histories] = {}
+		self.hits = 0
+		self.misses = 0
+		self._db: Optional[sqlite3.Connection] = None
+
+	def __getstate__(self) -> dict:
+		# Worker processes open their own connection to the database.
+		return {**self.__dict__, "_db": None}
+
+	def key(self, seats: Sequence[Seat], num_rounds: int) -> Optional[Tuple[str, bool]]:
+		"""
+		Get the key of a match, if its outcome can be cached.
+
+		Args:
+			seats (Sequence[Seat]): The seats of the match, in match order.
+			num_rounds (int): The number of rounds.
+
+		Returns:
+			Optional[Tuple[str, bool]]: The key and whether the seats are in the reverse order of the entry, or None
+			if a seat is a legacy seat or its strategy is not deterministic.
+		"""
+		if not all(not seat.legacy and seat.deterministic for seat in seats):
+			return None
+		# The default move can be overridden in the engine without changing the game rules.
+		sides = [(fingerprint(seat.agent.game.game_rules), fingerprint(seat.agent.game.strategy_rules),
+				  seat.agent.game.default_move or "", seat.round_state()) for seat in seats]
+		swapped = len(sides) == 2 and sides[1] < sides[0]
+		if swapped:
+			sides.reverse()
+		description = json.dumps([num_rounds, sides], default=set_default)
+		return hashlib.sha256(description.encode()).hexdigest(), swapped
+
+	def replay(self, key: Tuple[str, bool], seats: Sequence[Seat]) -> bool:
+		"""
+		Append the recorded histories of a match to the memories of its seats.
+
+		Args:
+			key (Tuple[str, bool]): The match key, from `key`.
+			seats (Sequence[Seat]): The seats of the match.
+
+		Returns:
+			bool: True if the match was in the cache and was replayed, False otherwise.
+		"""
+		digest, swapped = key
+		histories = self.entries.get(digest)
+		if histories is None:
+			histories = self._load(digest)
+		if histories is None:
+			self.misses += 1
+			return False
+
+		self.hits += 1
+		for seat, (moves, opponent_moves, payoffs) in zip(seats, reversed(histories) if swapped else histories):
+			memory = seat.memory
+			memory.moves.extend(moves)
+			memory.opponent_moves.extend(opponent_moves)
+			memory.payoffs.extend(payoffs)
+		return True
+
+	def record(self, key: Tuple[str, bool], seats: Sequence[Seat]) -> None:
+		"""
+		Record the histories of a finished match, played from fresh seats.
+
+		Args:
+			key (Tuple[str, bool]): The match key, from `key`, computed before the match.
+			seats (Sequence[Seat]): The seats of the match.
+		"""
+		digest, swapped = key
+		histories = [(list(seat.memory.moves), list(seat.memory.opponent_moves), list(seat.memory.payoffs))
+					 for seat in seats]
+		if swapped:
+			histories.reverse()
+		self.entries[digest] = histories
+		if self.path is not None:
+			self._connect().execute("INSERT OR IGNORE INTO matches VALUES (?, ?)",
+									(digest, json.dumps(histories, default=set_default)))
+			self._db.commit()
+
+	def _load(self, digest: str) -> Optional[Histories]:
+		"""
+		Load an entry from the database into memory.
+		"""
+		if self.path is None:
+			return None
+		row = self._connect().execute("SELECT histories FROM matches WHERE key = ?", (digest,)).fetchone()
+		if row is None:
+			return None
+		# JSON turns the observed moves of n-player matches into lists; memories hold them as tuples.
+		histories = [(moves, [tuple(move) if isinstance(move, list) else move for move in opponent_moves], payoffs)
+					 for moves, opponent_moves, payoffs in json.loads(row[0])]
+		self.entries[digest] = histories
+		return histories
+
+	def _connect(self) -> sqlite3.Connection:
+		if self._db is None:
+			self._db = sqlite3.connect(self.path, timeout=30)
+			self._db.execute("CREATE TABLE IF NOT EXISTS matches (key TEXT PRIMARY KEY, histories TEXT NOT NULL)")
+		return self._db
+
+	def close(self) -> None:
+		"""
+		Close the connection to the database, if open.
+		"""
+		if self._db is not None:
+			self._db.close()
+			self._db = None
@@ -0,0 +1,279 @@
+import itertools
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+Match = TypeVar("Match", bound=Tuple)
+
+# Relative cost of a round for an agent whose moves are selected by its solver rather than a native strategy.
+SOLVER_ROUND_COST = 10.0
+NATIVE_ROUND_COST = 1.0
+
+
+def schedule_rounds(matches: Sequence[Match]) -> List[List[Match]]:
+	"""
+	Split matches into rounds in which no agent plays twice, so that the matches of a round can run concurrently.
+
+	This is a greedy edge colouring of the pairing graph (a hypergraph colouring for k-agent matches) that also
+	preserves each agent's match order: a match is placed in the round after the latest round of any of its agents.
+	Every agent therefore plays its matches in the same order as in the sequential tournament, which keeps any state
+	carried between matches, and with it the final payoffs, identical.
+
+	Args:
+		matches (Sequence[Tuple[Agent, ...]]): Matches in tournament order.
+
+	Returns:
+		List[List[Tuple[Agent, ...]]]: Rounds of matches, each round in tournament order.
+	"""
+	rounds: List[List[Match]] = []
+	next_round: Dict[int, int] = {}
+	for match in matches:
+		round_index = max(next_round.get(id(agent), 0) for agent in match)
+		if round_index == len(rounds):
+			rounds.append([])
+		rounds[round_index].append(match)
+		for agent in match:
+			next_round[id(agent)] = round_index + 1
+	return rounds
+
+
+def match_cost(match: Tuple) -> float:
+	"""
+	Estimate the relative cost of playing a match, as the sum of its agents' per-round costs. An agent with a
+	native strategy selects its moves in Python, while any other agent queries its solver every round.
+
+	Args:
+		match (Tuple[Agent, ...]): The agents of the match.
+
+	Returns:
+		float: The estimated cost.
+	"""
+	return sum(NATIVE_ROUND_COST if getattr(agent, "native_strategy", None) is not None else SOLVER_ROUND_COST
+			   for agent in match)
+
+
+def partition(matches: Sequence[Match], num_parts: int,
+			  cost: Callable[[Match], float] = match_cost) -> List[List[Match]]:
+	"""
+	Split matches into at most `num_parts` contiguous parts of about equal estimated cost.
+
+	Parts are contiguous so that each agent's matches keep their relative order within a part. A part ends once
+	the cumulative cost reaches its share of the total, leaving at least one match for each remaining part.
+
+	Args:
+		matches (Sequence[Tuple[Agent, ...]]): Matches in tournament order.
+		num_parts (int): The number of parts, e.g. of worker processes.
+		cost (Callable[[Tuple[Agent, ...]], float]): The estimated cost of a match (default: `match_cost`).
+
+	Returns:
+		List[List[Tuple[Agent, ...]]]: The non-empty parts, in tournament order.
+	"""
+	num_parts = min(num_parts, len(matches))
+	if num_parts <= 1:
+		return [list(matches)] if matches else []
+
+	cumulative = list(itertools.accumulate(cost(match) for match in matches))
+	total = cumulative[-1]
+	parts = []
+	start = 0
+	for part in range(1, num_parts):
+		# The last match of this part is the first one reaching the part's share of the total cost.
+		target = total * part / num_parts
+		end = start + 1
+		while end < len(matches) - (num_parts - part) and cumulative[end - 1] < target:
+			end += 1
+		parts.append(list(matches[start:end]))
+		start = end
+	parts.append(list(matches[start:]))
+	return parts
+
+
+class MatchMaker:
+	"""
+	Base class of the match makers, which generate the matches of a tournament lazily from its agents.
+
+	A match maker is called with the list of valid agents, like the `match_maker` functions taken by
+	`Environment`, and returns an iterator over the matches, so that a tournament never holds all of its pairings
+	at once when it plays the matches one after another.
+	"""
+
+	def __call__(self, agents: Sequence) -> Iterator[Tuple]:
+		return self.matches(agents)
+
+	def matches(self, agents: Sequence) -> Iterator[Tuple]:
+		"""
+		Generate the matches between the agents.
+
+		Args:
+			agents (Sequence[Agent]): The tournament agents.
+
+		Returns:
+			Iterator[Tuple[Agent, ...]]: The matches, in tournament order.
+		"""
+		raise NotImplementedError
+
+	def cost(self, match: Tuple) -> float:
+		"""
+		Estimate the relative cost of playing a match (default: `match_cost`).
+		"""
+		return match_cost(match)
+
+	def partition(self, matches: Sequence[Tuple], num_parts: int) -> List[List[Tuple]]:
+		"""
+		Split matches into contiguous parts of about equal estimated cost, e.g. for worker processes.
+
+		Args:
+			matches (Sequence[Tuple[Agent, ...]]): Matches in tournament order.
+			num_parts (int): The number of parts.
+
+		Returns:
+			List[List[Tuple[Agent, ...]]]: The non-empty parts, in tournament order.
+		"""
+		return partition(matches, num_parts, self.cost)
+
+
+class RoundRobin(MatchMaker):
+	"""
+	Every group of `group_size` agents plays one match, optionally including matches of an agent against itself.
+	"""
+
+	def __init__(self, self_play: bool = False, group_size: int = 2):
+		"""
+		Initializes the round-robin.
+
+		Args:
+			self_play (bool): Whether agents also play against themselves (default: False).
+			group_size (int): The number of agents per match (default: 2).
+		"""
+		self.self_play = self_play
+		self.group_size = group_size
+
+	def matches(self, agents: Sequence) -> Iterator[Tuple]:
+		if self.self_play:
+			return itertools.combinations_with_replacement(agents, self.group_size)
+		return itertools.combinations(agents, self.group_size)
+
+
+class ClonePairing(MatchMaker):
+	"""
+	Each original agent plays its clone, where the clones follow the originals in the list of agents in the same
+	order: agent i plays agent i + `num_originals`.
+	"""
+
+	def __init__(self, num_originals: Optional[int] = None):
+		"""
+		Initializes the pairing.
+
+		Args:
+			num_originals (Optional[int]): The number of original agents (default: half of the agents).
+		"""
+		self.num_originals = num_originals
+
+	def matches(self, agents: Sequence) -> Iterator[Tuple]:
+		num_originals = len(agents) // 2 if self.num_originals is None else self.num_originals
+		return ((agents[i], agents[i + num_originals]) for i in range(num_originals))
+
+
+class RandomOpponents(MatchMaker):
+	"""
+	Each agent plays `k` opponents sampled uniformly without replacement from the other agents.
+	"""
+
+	def __init__(self, k: int, seed: Optional[int] = None):
+		"""
+		Initializes the sampler.
+
+		Args:
+			k (int): The number of opponents per agent; all other agents if there are fewer.
+			seed (Optional[int]): Seed of the sampling.
+		"""
+		self.k = k
+		self.seed = seed
+
+	def matches(self, agents: Sequence) -> Iterator[Tuple]:
+		rng = random.Random(self.seed)
+		k = min(self.k, len(agents) - 1)
+		for i, agent in enumerate(agents):
+			# Sample from the indices of the other agents without building their list.
+			for j in rng.sample(range(len(agents) - 1), k):
+				yield agent, agents[j + (j >= i)]
+
+
+class SwissPairing(MatchMaker):
+	"""
+	A Swiss-system tournament: in each of `num_rounds` rounds, agents are ranked by score and paired with the next
+	ranked agent they have not played yet, as long as the rest of the round can still be paired without rematches.
+	With an odd number of agents, the lowest ranked agent without a bye sits the round out.
+
+	The pairings of a round are generated when the round is reached, so the scores include the earlier rounds
+	when the matches are played one after another. A tournament that collects all matches before playing them,
+	e.g. concurrently or in worker processes, pairs every round by the scores at the start of the tournament.
+	"""
+	MAX_BACKTRACKS = 10000
+
+	def __init__(self, num_rounds: int, score: Optional[Callable] = None, seed: Optional[int] = None):
+		"""
+		Initializes the pairing.
+
+		Args:
+			num_rounds (int): The number of rounds.
+			score (Optional[Callable[[Agent], float]]): The score ranking an agent (default: its total payoff).
+			seed (Optional[int]): Seed of the random order among agents of equal score.
+		"""
+		self.num_rounds = num_rounds
+		self.score = score if score is not None else (lambda agent: sum(agent.memory.payoffs))
+		self.seed = seed
+
+	def matches(self, agents: Sequence) -> Iterator[Tuple]:
+		rng = random.Random(self.seed)
+		played = set()
+		byes = set()
+		for _ in range(self.num_rounds):
+			yield from self._pair_round(agents, rng, played, byes)
+
+	def _pair_round(self, agents: Sequence, rng: random.Random, played: set, byes: set) -> List[Tuple]:
+		tiebreak = {id(agent): rng.random() for agent in agents}
+		ranked = sorted(agents, key=lambda agent: (-self.score(agent), tiebreak[id(agent)]))
+		if len(ranked) % 2:
+			bye = next((agent for agent in reversed(ranked) if id(agent) not in byes), ranked[-1])
+			byes.add(id(bye))
+			ranked.remove(bye)
+
+		pairs = self._pair_without_rematches(ranked, played)
+		if pairs is None:
+			# Rematches are unavoidable: pair each agent with the best ranked agent not played yet, or the next one.
+			pairs = []
+			while ranked:
+				agent = ranked.pop(0)
+				opponent = next((other for other in ranked if frozenset((id(agent), id(other))) not in played),
+								ranked[0])
+				ranked.remove(opponent)
+				pairs.append((agent, opponent))
+		played.update(frozenset((id(agent), id(opponent))) for agent, opponent in pairs)
+		return pairs
+
+	def _pair_without_rematches(self, ranked: List, played: set) -> Optional[List[Tuple]]:
+		"""
+		Pair the best ranked agent with the best ranked opponent not played yet such that the remaining agents can
+		be paired too, backtracking at most `MAX_BACKTRACKS` times.
+		"""
+		budget = self.MAX_BACKTRACKS
+		pairs = []
+		# A frame holds the agents left to pair and the position of the last opponent tried for the first of them.
+		frames = [(ranked, 0)]
+		while frames:
+			remaining, last = frames.pop()
+			if not remaining:
+				return pairs
+			agent = remaining[0]
+			for i in range(last + 1, len(remaining)):
+				if frozenset((id(agent), id(remaining[i]))) not in played:
+					pairs.append((agent, remaining[i]))
+					frames.append((remaining, i))
+					frames.append((remaining[1:i] + remaining[i + 1:], 0))
+					break
+			else:
+				budget -= 1
+				if budget <= 0 or not pairs:
+					return None
+				pairs.pop()
+		return None
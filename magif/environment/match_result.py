@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class MatchSummary:
+	"""
+	Represents the totals of a finished match, in match order.
+
+	Attributes:
+		agents (Tuple[str, ...]): Names of the match's agents.
+		strategies (Tuple[str, ...]): Strategy names of the match's agents.
+		payoffs (Tuple[float, ...]): Total payoff of each agent in the match.
+		rounds (int): The number of rounds played.
+		valid (bool): Whether all agents were valid throughout the match.
+	"""
+	agents: Tuple[str, ...]
+	strategies: Tuple[str, ...]
+	payoffs: Tuple[float, ...]
+	rounds: int
+	valid: bool = True
+
+
+@dataclass
+class MatchResult:
+	"""
+	Represents the outcome of a match played away from the parent process, e.g. in a tournament shard.
+
+	Attributes:
+		index (int): Position of the match in the tournament's match order.
+		agents (Tuple[int, ...]): Indices of the match's agents in the list of tournament agents.
+		valid (bool): Whether all agents were valid throughout the match.
+		moves (Dict[int, list]): Moves made by each agent during the match, keyed by agent index.
+		opponent_moves (Dict[int, list]): Moves observed by each agent during the match.
+		payoffs (Dict[int, list]): Payoffs received by each agent during the match.
+		statuses (Dict[int, str]): Status value of each agent at the end of the match.
+		summary (Optional[MatchSummary]): The totals of the match.
+	"""
+	index: int
+	agents: Tuple[int, ...]
+	valid: bool = True
+	moves: Dict[int, list] = field(default_factory=dict)
+	opponent_moves: Dict[int, list] = field(default_factory=dict)
+	payoffs: Dict[int, list] = field(default_factory=dict)
+	statuses: Dict[int, str] = field(default_factory=dict)
+	summary: Optional[MatchSummary] = None
+
+	def merge_into(self, agents: List["Agent"]) -> None:
+		"""
+		Append the match histories to the memories of the tournament agents.
+
+		Args:
+			agents (List[Agent]): The tournament agents, indexed as in `agents`.
+		"""
+		for i in dict.fromkeys(self.agents):
+			memory = agents[i].memory
+			memory.moves.extend(self.moves.get(i, []))
+			memory.opponent_moves.extend(self.opponent_moves.get(i, []))
+			memory.payoffs.extend(self.payoffs.get(i, []))
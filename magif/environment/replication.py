@@ -0,0 +1,124 @@
+import math
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+import numpy as np
+from magif.environment.match_result import MatchResult
+
+
+@dataclass
+class Estimate:
+	"""
+	Represents the mean of a payoff over the replicates of a tournament, with a normal confidence interval.
+
+	Attributes:
+		mean (float): The sample mean.
+		variance (float): The sample variance (0 for a single replicate).
+		low (float): The lower bound of the confidence interval.
+		high (float): The upper bound of the confidence interval.
+		n (int): The number of replicates.
+	"""
+	mean: float
+	variance: float
+	low: float
+	high: float
+	n: int
+
+
+@dataclass
+class ReplicationResult:
+	"""
+	Represents the payoffs of the seeded replicates of a tournament.
+
+	Attributes:
+		base_seed (int): The seed from which the seeds of the replicates' agents are derived.
+		replicates (List[int]): The replicate numbers, each of which can be re-run alone with the same base seed.
+		confidence (float): The confidence level of the intervals.
+		agent_payoffs (Dict[str, Estimate]): The total payoff of each agent, keyed by agent name.
+		strategy_payoffs (Dict[str, Estimate]): The total payoff of an agent with each strategy, averaged over the
+			agents with the strategy in a replicate, keyed by strategy name.
+		samples (Dict[str, List[float]]): The total payoff of each agent in each replicate, keyed by agent name.
+	"""
+	base_seed: int
+	replicates: List[int]
+	confidence: float
+	agent_payoffs: Dict[str, Estimate] = field(default_factory=dict)
+	strategy_payoffs: Dict[str, Estimate] = field(default_factory=dict)
+	samples: Dict[str, List[float]] = field(default_factory=dict)
+
+
+def replicate_seed(base_seed: int, replicate: int, agent_index: int) -> int:
+	"""
+	Derive the seed of an agent in a replicate, independent of the number of replicates and agents.
+
+	Args:
+		base_seed (int): The seed of the replication.
+		replicate (int): The replicate number.
+		agent_index (int): The index of the agent among the tournament agents.
+
+	Returns:
+		int: A 32-bit seed.
+	"""
+	return int(np.random.SeedSequence([base_seed, replicate, agent_index]).generate_state(1)[0])
+
+
+def estimate(values: Sequence[float], confidence: float = 0.95) -> Estimate:
+	"""
+	Estimate the mean of a sample with a normal-approximation confidence interval.
+
+	Args:
+		values (Sequence[float]): The sample, one value per replicate.
+		confidence (float): The confidence level (default: 0.95).
+
+	Returns:
+		Estimate: The mean, variance and confidence interval.
+	"""
+	mean = statistics.fmean(values)
+	variance = statistics.variance(values) if len(values) > 1 else 0.0
+	half_width = statistics.NormalDist().inv_cdf((1 + confidence) / 2) * math.sqrt(variance / len(values))
+	return Estimate(mean, variance, mean - half_width, mean + half_width, len(values))
+
+
+def replicate_totals(results: Sequence[MatchResult], num_agents: int) -> List[float]:
+	"""
+	Total the payoffs of each agent over the matches of a replicate.
+
+	Args:
+		results (Sequence[MatchResult]): The results of the replicate's matches.
+		num_agents (int): The number of tournament agents.
+
+	Returns:
+		List[float]: The total payoff of each agent, by agent index.
+	"""
+	totals = [0.0] * num_agents
+	for result in results:
+		for i, payoffs in result.payoffs.items():
+			totals[i] += sum(payoffs)
+	return totals
+
+
+def summarize_replicates(names: Sequence[str], strategies: Sequence[str], totals: Sequence[Sequence[float]],
+						 base_seed: int, replicates: Sequence[int], confidence: float = 0.95) -> ReplicationResult:
+	"""
+	Estimate the payoffs of the agents and strategies from the totals of each replicate.
+
+	Args:
+		names (Sequence[str]): The agent names, by agent index.
+		strategies (Sequence[str]): The agents' strategy names, by agent index.
+		totals (Sequence[Sequence[float]]): The total payoff of each agent in each replicate.
+		base_seed (int): The seed of the replication.
+		replicates (Sequence[int]): The replicate numbers, in the order of `totals`.
+		confidence (float): The confidence level (default: 0.95).
+
+	Returns:
+		ReplicationResult: The estimates.
+	"""
+	result = ReplicationResult(base_seed, list(replicates), confidence)
+	for i, name in enumerate(names):
+		result.samples[name] = [replicate[i] for replicate in totals]
+		result.agent_payoffs[name] = estimate(result.samples[name], confidence)
+	for strategy in dict.fromkeys(strategies):
+		members = [i for i, agent_strategy in enumerate(strategies) if agent_strategy == strategy]
+		means = [statistics.fmean(replicate[i] for i in members) for replicate in totals]
+		result.strategy_payoffs[strategy] = estimate(means, confidence)
+	return result
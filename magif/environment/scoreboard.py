@@ -0,0 +1,123 @@
+import bisect
+import itertools
+from typing import Dict, Iterable, List, Tuple
+
+
+class Scoreboard:
+	"""
+	Running payoff totals of the agents of a tournament, ranked as the payoffs arrive.
+
+	An agent's total, number of rounds and average payoff are updated once per match from the totals of the match's
+	seats, so they are answered without summing the memory again, and stay exact when the memory only keeps a
+	window of recent rounds. The agents are also kept in a
+	sorted index by total payoff, so the winners and the top k agents are read off its front.
+
+	An agent that was never recorded is tracked from its memory on first use.
+
+	Attributes:
+		totals (Dict[int, float]): The total payoff of each agent, keyed by the agent's id.
+		rounds (Dict[int, int]): The number of payoffs received by each agent, keyed by the agent's id.
+	"""
+
+	def __init__(self):
+		self.totals: Dict[int, float] = {}
+		self.rounds: Dict[int, int] = {}
+		self._agents: Dict[int, "Agent"] = {}
+		self._order: Dict[int, int] = {}
+		# Sorted (-total, order, id) keys, the order of first appearance breaking ties as agent lists do.
+		self._index: List[Tuple[float, int, int]] = []
+
+	def track(self, agent: "Agent") -> None:
+		"""
+		Start tracking an agent from the payoffs already in its memory, if it is not tracked yet.
+
+		Args:
+			agent (Agent): The agent.
+		"""
+		if id(agent) in self._agents:
+			return
+		self._agents[id(agent)] = agent
+		self._order[id(agent)] = len(self._order)
+		self.totals[id(agent)] = sum(agent.memory.payoffs)
+		self.rounds[id(agent)] = len(agent.memory.payoffs)
+		bisect.insort(self._index, self._key(agent))
+
+	def add(self, agent: "Agent", payoff: float, rounds: int) -> None:
+		"""
+		Add the total payoff an agent received in a seat of a match, once it is in its memory.
+
+		Args:
+			agent (Agent): The agent; an untracked agent is tracked from its memory, which already includes the
+				payoffs.
+			payoff (float): The total payoff of the seat.
+			rounds (int): The number of rounds the payoff was received in.
+		"""
+		if id(agent) not in self._agents:
+			self.track(agent)
+			return
+		if not rounds:
+			return
+		del self._index[bisect.bisect_left(self._index, self._key(agent))]
+		self.totals[id(agent)] += payoff
+		self.rounds[id(agent)] += rounds
+		bisect.insort(self._index, self._key(agent))
+
+	def total(self, agent: "Agent") -> float:
+		"""
+		Get the total payoff of an agent.
+		"""
+		self.track(agent)
+		return self.totals[id(agent)]
+
+	def average(self, agent: "Agent") -> float:
+		"""
+		Get the average payoff per round of an agent, 0 if it has not played yet.
+		"""
+		self.track(agent)
+		return self.totals[id(agent)] / self.rounds[id(agent)] if self.rounds[id(agent)] else 0.0
+
+	def top(self, k: int, agents: Iterable["Agent"] = None) -> List[Tuple["Agent", float]]:
+		"""
+		Get the k agents with the highest total payoff.
+
+		Args:
+			k (int): The number of agents.
+			agents (Iterable[Agent], optional): The agents ranked, e.g. the valid agents of the pool (default: all
+				tracked agents).
+
+		Returns:
+			List[Tuple[Agent, float]]: The agents and their totals, highest first.
+		"""
+		return [(self._agents[agent_id], -total) for total, _, agent_id in itertools.islice(self._ranked(agents), k)]
+
+	def winners(self, agents: Iterable["Agent"] = None) -> List["Agent"]:
+		"""
+		Get the agents with the highest total payoff.
+
+		Args:
+			agents (Iterable[Agent], optional): The agents ranked (default: all tracked agents).
+
+		Returns:
+			List[Agent]: The agents sharing the highest total, in order of first appearance.
+		"""
+		ranked = self._ranked(agents)
+		first = next(ranked, None)
+		if first is None:
+			return []
+		return [self._agents[agent_id] for _, _, agent_id in
+				itertools.chain([first], itertools.takewhile(lambda key: key[0] == first[0], ranked))]
+
+	def _ranked(self, agents: Iterable["Agent"] = None) -> Iterable[Tuple[float, int, int]]:
+		"""
+		Iterate over the index in ranking order, restricted to the given agents.
+		"""
+		if agents is None:
+			return iter(self._index)
+		allowed = set()
+		for agent in agents:
+			self.track(agent)
+			allowed.add(id(agent))
+		return (key for key in self._index if key[2] in allowed)
+
+	def _key(self, agent: "Agent") -> Tuple[float, int, int]:
+		return -self.totals[id(agent)], self._order[id(agent)], id(agent)
@@ -0,0 +1,235 @@
+from typing import Iterator, Optional, Sequence, Tuple
+import numpy as np
+from magif.environment.match_maker import MatchMaker
+
+
+class Graph:
+	"""
+	An undirected graph of a structured population in compressed sparse row (CSR) form.
+
+	The neighbors of node i are `indices[indptr[i]:indptr[i + 1]]`, sorted. Every edge is stored in both
+	directions, so memory and all operations on the graph scale with the number of edges.
+
+	Attributes:
+		indptr (numpy.ndarray): Offsets of each node's neighbors in `indices`, of length num_nodes + 1.
+		indices (numpy.ndarray): The neighbors of all nodes, node by node.
+	"""
+
+	def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+		self.indptr = np.asarray(indptr, dtype=np.int64)
+		self.indices = np.asarray(indices, dtype=np.int64)
+
+	@classmethod
+	def from_edges(cls, num_nodes: int, sources: Sequence[int], targets: Sequence[int]) -> "Graph":
+		"""
+		Build a graph from a list of undirected edges; duplicate edges and self-loops are dropped.
+
+		Args:
+			num_nodes (int): The number of nodes.
+			sources (Sequence[int]): The first node of each edge.
+			targets (Sequence[int]): The second node of each edge.
+
+		Returns:
+			Graph: The graph.
+		"""
+		sources = np.asarray(sources, dtype=np.int64)
+		targets = np.asarray(targets, dtype=np.int64)
+		keep = sources != targets
+		# Both directions of every edge, deduplicated and sorted by source, then by target.
+		keys = np.unique(np.concatenate([sources[keep] * num_nodes + targets[keep],
+										 targets[keep] * num_nodes + sources[keep]]))
+		rows, indices = np.divmod(keys, num_nodes)
+		indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=num_nodes))])
+		return cls(indptr, indices)
+
+	@classmethod
+	def lattice(cls, rows: int, cols: int, neighborhood: str = "von_neumann", periodic: bool = True) -> "Graph":
+		"""
+		Build a two-dimensional lattice whose node r * cols + c sits at row r and column c.
+
+		Args:
+			rows (int): The number of rows.
+			cols (int): The number of columns.
+			neighborhood (str): "von_neumann" for the 4 orthogonal neighbors, or "moore" to add the 4 diagonal
+				ones (default: "von_neumann").
+			periodic (bool): Whether the lattice wraps around its edges, forming a torus (default: True).
+
+		Returns:
+			Graph: The lattice.
+
+		Raises:
+			ValueError: If the neighborhood is unknown.
+		"""
+		offsets = {"von_neumann": [(0, 1), (1, 0)], "moore": [(0, 1), (1, 0), (1, 1), (1, -1)]}
+		if neighborhood not in offsets:
+			raise ValueError(f"Unknown neighborhood {neighborhood}.")
+
+		row, col = np.divmod(np.arange(rows * cols), cols)
+		sources, targets = [], []
+		# Each undirected edge is generated once, from one of its two directions.
+		for d_row, d_col in offsets[neighborhood]:
+			other_row, other_col = row + d_row, col + d_col
+			if periodic:
+				other_row, other_col = other_row % rows, other_col % cols
+				inside = np.ones(rows * cols, dtype=bool)
+			else:
+				inside = (other_row < rows) & (other_col >= 0) & (other_col < cols)
+			sources.append(np.flatnonzero(inside))
+			targets.append(other_row[inside] * cols + other_col[inside])
+		return cls.from_edges(rows * cols, np.concatenate(sources), np.concatenate(targets))
+
+	@property
+	def num_nodes(self) -> int:
+		return len(self.indptr) - 1
+
+	@property
+	def num_edges(self) -> int:
+		"""
+		The number of undirected edges.
+		"""
+		return len(self.indices) // 2
+
+	def degrees(self) -> np.ndarray:
+		return np.diff(self.indptr)
+
+	def neighbors(self, node: int) -> np.ndarray:
+		return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+	def edge_rows(self) -> np.ndarray:
+		"""
+		Get the source node of every entry of `indices`.
+		"""
+		return np.repeat(np.arange(self.num_nodes), self.degrees())
+
+	def edges(self) -> Iterator[Tuple[int, int]]:
+		"""
+		Iterate over the undirected edges (i, j), i < j, in node order.
+		"""
+		for i in range(self.num_nodes):
+			for j in self.neighbors(i):
+				if j > i:
+					yield i, int(j)
+
+
+class NeighborMatchMaker(MatchMaker):
+	"""
+	Every agent plays each of its neighbors in a graph once, agent i sitting at node i.
+	"""
+
+	def __init__(self, graph: Graph):
+		"""
+		Initializes the match maker.
+
+		Args:
+			graph (Graph): The population structure, with one node per agent.
+		"""
+		self.graph = graph
+
+	def matches(self, agents: Sequence) -> Iterator[Tuple]:
+		if len(agents) != self.graph.num_nodes:
+			raise ValueError(f"The graph has {self.graph.num_nodes} nodes for {len(agents)} agents.")
+		return ((agents[i], agents[j]) for i, j in self.graph.edges())
+
+
+def neighborhood_payoffs(graph: Graph, matrix: np.ndarray, strategies: np.ndarray) -> np.ndarray:
+	"""
+	Get the payoff of every node from playing each of its neighbors once.
+
+	Args:
+		graph (Graph): The population structure.
+		matrix (numpy.ndarray): The (n, n) payoff matrix, e.g. from `payoff_matrix`; missing payoffs (NaN) count
+			as zero.
+		strategies (numpy.ndarray): The strategy index of every node.
+
+	Returns:
+		numpy.ndarray: The total payoff of every node.
+	"""
+	matrix = np.nan_to_num(np.asarray(matrix, dtype=float))
+	rows = graph.edge_rows()
+	return np.bincount(rows, weights=matrix[strategies[rows], strategies[graph.indices]], minlength=graph.num_nodes)
+
+
+def imitation_step(graph: Graph, strategies: np.ndarray, payoffs: np.ndarray, rule: str = "best",
+				   noise: float = 0.1, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+	"""
+	Update the strategies of all nodes at once by imitating their neighbors.
+
+	With the "best" rule, every node adopts the strategy of its best-paid neighbor if that neighbor was paid more
+	than the node itself; ties go to the neighbor with the lowest index. With the "fermi" rule, every node
+	compares itself with one random neighbor and adopts its strategy with probability
+	1 / (1 + exp((p_node - p_neighbor) / noise)).
+
+	Args:
+		graph (Graph): The population structure.
+		strategies (numpy.ndarray): The strategy index of every node.
+		payoffs (numpy.ndarray): The payoff of every node, e.g. from `neighborhood_payoffs`.
+		rule (str): "best" or "fermi" (default: "best").
+		noise (float): The noise of the "fermi" rule.
+		rng (Optional[numpy.random.Generator]): The random generator of the "fermi" rule.
+
+	Returns:
+		numpy.ndarray: The new strategy index of every node.
+
+	Raises:
+		ValueError: If the rule is unknown.
+	"""
+	degrees = graph.degrees()
+	has_neighbors = degrees > 0
+	if rule not in ("best", "fermi"):
+		raise ValueError(f"Unknown imitation rule {rule}.")
+	if not has_neighbors.any():
+		return strategies.copy()
+
+	if rule == "best":
+		# Segment reductions over the rows of the CSR arrays: the highest neighbor payoff of every node, then the
+		# first position in its row reaching it.
+		starts = graph.indptr[:-1][has_neighbors]
+		neighbor_payoffs = payoffs[graph.indices]
+		highest = np.maximum.reduceat(neighbor_payoffs, starts)
+		positions = np.where(neighbor_payoffs == np.repeat(highest, degrees[has_neighbors]),
+							 np.arange(len(graph.indices)), len(graph.indices))
+		best = graph.indices[np.minimum.reduceat(positions, starts)]
+	else:
+		rng = rng if rng is not None else np.random.default_rng()
+		offsets = (rng.random(int(has_neighbors.sum())) * degrees[has_neighbors]).astype(np.int64)
+		best = graph.indices[graph.indptr[:-1][has_neighbors] + offsets]
+
+	nodes = np.flatnonzero(has_neighbors)
+	if rule == "best":
+		adopt = payoffs[best] > payoffs[nodes]
+	else:
+		with np.errstate(over="ignore"):
+			adopt = rng.random(len(nodes)) < 1.0 / (1.0 + np.exp((payoffs[nodes] - payoffs[best]) / noise))
+	updated = strategies.copy()
+	updated[nodes[adopt]] = strategies[best[adopt]]
+	return updated
+
+
+def spatial_dynamics(graph: Graph, matrix: np.ndarray, strategies: Sequence[int], generations: int = 100,
+					 rule: str = "best", noise: float = 0.1, seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	Simulate the imitation dynamics of a structured population, all nodes updating synchronously.
+
+	Args:
+		graph (Graph): The population structure.
+		matrix (numpy.ndarray): The (n, n) payoff matrix, e.g. from `payoff_matrix`.
+		strategies (Sequence[int]): The initial strategy index of every node.
+		generations (int): The number of generations.
+		rule (str): The imitation rule, "best" or "fermi" (see `imitation_step`).
+		noise (float): The noise of the "fermi" rule.
+		seed (Optional[int]): Seed of the "fermi" rule.
+
+	Returns:
+		Tuple[numpy.ndarray, numpy.ndarray]: The strategy shares of shape (generations + 1, n) and the final
+		strategy index of every node.
+	"""
+	num_strategies = np.asarray(matrix).shape[0]
+	strategies = np.asarray(strategies, dtype=np.int64)
+	rng = np.random.default_rng(seed)
+	history = np.empty((generations + 1, num_strategies))
+	history[0] = np.bincount(strategies, minlength=num_strategies) / len(strategies)
+	for generation in range(1, generations + 1):
+		payoffs = neighborhood_payoffs(graph, matrix, strategies)
+		strategies = imitation_step(graph, strategies, payoffs, rule, noise, rng)
+		history[generation] = np.bincount(strategies, minlength=num_strategies) / len(strategies)
+	return history, strategies
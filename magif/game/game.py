@@ -1,4 +1,6 @@
 from typing import List, Optional
+from magif.agent.memory import MoveTable
+from magif.game.payoff_tensor import PayoffTensor
 
 
 class Game:
@@ -14,6 +16,8 @@ class Game:
 	    game_moves (List[str]): A list of possible moves in the game.
 	    game_players (List[str]): A list of players participating in the game.
 	    default_move (Optional[str]): The default move for the game (if applicable).
+	    payoff_tensor (Optional[PayoffTensor]): Payoffs of all players for every move profile (if extracted).
+	    move_table (MoveTable): The codes of the moves in the memories of the agents playing the game.
 	"""
 
 	def __init__(self, game_string: Optional[str] = None, strategy_string: Optional[str] = None, game_rules: Optional[str] = None, strategy_rules: Optional[str] = None, game_moves: Optional[List[str]] = None, game_players: Optional[List[str]] = None):
@@ -43,6 +47,8 @@ class Game:
 		self.game_moves: List[str] = game_moves if game_moves else []
 		self.game_players: List[str] = []
 		self.default_move = None
+		self.payoff_tensor: Optional[PayoffTensor] = None
+		self.move_table = MoveTable()
 
 	def set_possible_moves(self, moves: List[str]) -> None:
 		"""
@@ -109,6 +115,26 @@ class Game:
 		if player not in self.game_players:
 			self.game_players.append(player)
 
+	def set_payoff_tensor(self, payoff_tensor: PayoffTensor) -> None:
+		"""
+		Set the payoffs of all players for every move profile of the game.
+
+		Args:
+			payoff_tensor (PayoffTensor): The payoff tensor extracted from the game rules.
+		"""
+		if not isinstance(payoff_tensor, PayoffTensor):
+			raise ValueError("Payoffs should be a PayoffTensor.")
+		self.payoff_tensor = payoff_tensor
+
+	def get_payoff_tensor(self) -> Optional[PayoffTensor]:
+		"""
+		Get the payoffs of all players for every move profile of the game.
+
+		Returns:
+			Optional[PayoffTensor]: The payoff tensor, or None if it was not extracted.
+		"""
+		return self.payoff_tensor
+
 	def set_game_rules(self, rules: str) -> None:
 		"""
 		Set the rules for the game.
@@ -0,0 +1,153 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class PayoffTensor:
+	"""
+	Payoffs of all players for the move profiles of an n-player simultaneous-move game.
+
+	The tensor is stored sparsely: only the profiles reached by the game rules are kept, in a dictionary
+	keyed by the tuple of moves ordered as the players. Unreachable combinations cost nothing, which matters
+	for games with many players or moves where most combinations are irrelevant.
+
+	Attributes:
+	    players (List[str]): Player names, defining the order of moves in a profile and of payoffs in an entry.
+	    entries (Dict[Tuple[str, ...], Tuple[Any, ...]]): Payoff vectors keyed by move profiles.
+	"""
+
+	def __init__(self, players: List[str], entries: Optional[Dict[Tuple[str, ...], Tuple[Any, ...]]] = None):
+		"""
+		Initializes the tensor for the given players.
+
+		Args:
+		    players (List[str]): Player names in profile order.
+		    entries (Optional[Dict[Tuple[str, ...], Tuple[Any, ...]]]): Initial payoff vectors keyed by profiles.
+		"""
+		self.players: List[str] = list(players)
+		self.entries: Dict[Tuple[str, ...], Tuple[Any, ...]] = {}
+		for profile, payoffs in (entries or {}).items():
+			self.set(profile, payoffs)
+
+	@classmethod
+	def from_profiles(cls, players: List[str], profiles: List[list]) -> "PayoffTensor":
+		"""
+		Builds a tensor from the output of the `payoff_profiles/1` solver predicate.
+
+		Each profile is a pair [Moves, Utilities] of [Player, Value] lists. Profiles that do not assign a move
+		and a utility to every player are skipped, and repeated profiles (the same moves played in a different
+		order) are stored once.
+
+		Args:
+		    players (List[str]): Player names in profile order.
+		    profiles (List[list]): Profiles as returned by the solver.
+
+		Returns:
+		    PayoffTensor: The tensor of all complete profiles.
+		"""
+		tensor = cls(players)
+		for moves, utilities in profiles:
+			moves_by_player = {player: move for player, move in moves}
+			utilities_by_player = {player: utility for player, utility in utilities}
+			if not all(player in moves_by_player and player in utilities_by_player for player in tensor.players):
+				continue
+			tensor.set([moves_by_player[player] for player in tensor.players],
+					   [utilities_by_player[player] for player in tensor.players])
+		return tensor
+
+	@staticmethod
+	def _key(profile: Sequence[Any]) -> Tuple[str, ...]:
+		"""
+		Normalizes a profile to the dictionary key, so that numeric and string moves match.
+		"""
+		return tuple(str(move) for move in profile)
+
+	def set(self, profile: Sequence[Any], payoffs: Sequence[Any]) -> None:
+		"""
+		Stores the payoff vector of a profile.
+
+		Args:
+		    profile (Sequence[Any]): One move per player, in player order.
+		    payoffs (Sequence[Any]): One payoff per player, in player order.
+
+		Raises:
+		    ValueError: If the profile or payoff vector does not have one entry per player.
+		"""
+		if len(profile) != len(self.players) or len(payoffs) != len(self.players):
+			raise ValueError(f"Profiles and payoffs should have {len(self.players)} entries.")
+		self.entries[self._key(profile)] = tuple(payoffs)
+
+	def get(self, profile: Sequence[Any]) -> Optional[Tuple[Any, ...]]:
+		"""
+		Get the payoff vector of a profile.
+
+		Args:
+		    profile (Sequence[Any]): One move per player, in player order.
+
+		Returns:
+		    Optional[Tuple[Any, ...]]: The payoffs of all players, or None if the profile is not in the tensor.
+		"""
+		return self.entries.get(self._key(profile))
+
+	def payoff(self, profile: Sequence[Any], player_index: int = 0) -> Optional[Any]:
+		"""
+		Get the payoff of a single player for a profile.
+
+		Args:
+		    profile (Sequence[Any]): One move per player, in player order.
+		    player_index (int): Index of the player in `players` (default: the first player).
+
+		Returns:
+		    Optional[Any]: The payoff, or None if the profile is not in the tensor.
+		"""
+		payoffs = self.get(profile)
+		return payoffs[player_index] if payoffs is not None else None
+
+	def get_moves(self) -> List[List[str]]:
+		"""
+		Get the moves of each player that appear in the stored profiles.
+
+		Returns:
+			List[List[str]]: A list of moves per player, in order of first appearance.
+		"""
+		moves = [dict() for _ in self.players]
+		for profile in self.entries:
+			for i, move in enumerate(profile):
+				moves[i].setdefault(move, None)
+		return [list(player_moves) for player_moves in moves]
+
+	def density(self) -> float:
+		"""
+		Get the share of all move combinations that are stored.
+
+		Returns:
+			float: The number of stored profiles divided by the number of combinations of the players' moves.
+		"""
+		combinations = 1
+		for player_moves in self.get_moves():
+			combinations *= len(player_moves)
+		return len(self.entries) / combinations if self.entries else 0.0
+
+	def to_dense(self):
+		"""
+		Expand the tensor into a dense NumPy array for analysis.
+
+		Returns:
+			Tuple[List[List[str]], numpy.ndarray]: The moves of each player, indexing the first n axes, and an
+			array of shape (m_1, ..., m_n, n) with the payoff vectors; missing profiles are NaN.
+		"""
+		import numpy as np
+
+		axes = self.get_moves()
+		index = [{move: i for i, move in enumerate(player_moves)} for player_moves in axes]
+		dense = np.full([len(player_moves) for player_moves in axes] + [len(self.players)], np.nan)
+		for profile, payoffs in self.entries.items():
+			dense[tuple(index[i][move] for i, move in enumerate(profile))] = payoffs
+		return axes, dense
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+	def __contains__(self, profile) -> bool:
+		return self._key(profile) in self.entries
+
+	def __repr__(self) -> str:
+		return f"PayoffTensor(players={self.players}, profiles={len(self.entries)})"
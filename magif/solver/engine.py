@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import threading
 from magif.utils.setup_logger import logger
 from typing import Any, Optional
 
@@ -31,20 +32,25 @@ class PrologEngine:
         """
 		self.thread = thread_creator()
 		self._var_counter = 0
+		# Queries of one engine may come from several worker threads, e.g. two matches of the same agent.
+		self.lock = threading.Lock()
 
-	def consult(self, file_path: str) -> QueryResult:
+	def consult(self, file_path: str, module: Optional[str] = None) -> QueryResult:
 		"""
         Load a Prolog source file into the engine.
 
         Args:
             file_path (str): The path to the Prolog source file.
+            module (Optional[str]): The module the clauses are loaded into (default: the user module).
 
         Returns:
             QueryResult: Contains success status and optional error message.
         """
 		try:
 			prologized_path = file_path.replace("\\", "/")
-			result = self.thread.query(f'consult("{prologized_path}")')
+			with self.lock:
+				goal = f'consult("{prologized_path}")'
+				result = self.thread.query(goal if module is None else f"{module}:{goal}")
 			return QueryResult(bool(result), None)
 		except Exception as e:
 			logger.error(f"Error consulting file {file_path}: {e}")
@@ -62,7 +68,8 @@ class PrologEngine:
 			QueryResult: Contains success status, data, and optional error message.
 		"""
 		try:
-			raw_result = self.thread.query(predicate)
+			with self.lock:
+				raw_result = self.thread.query(predicate)
 			result_status = bool(raw_result)
 
 			if result_status:
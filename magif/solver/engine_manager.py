@@ -0,0 +1,182 @@
+import collections
+import gc
+import os
+import threading
+import weakref
+from typing import Callable, Deque, Dict, Optional
+from swiplserver import PrologMQI
+from magif.solver.engine import PrologEngine
+from magif.utils.setup_logger import logger
+
+
+class EngineLimitError(RuntimeError):
+	"""
+	Raised when starting a Prolog engine would exceed the cap on live engines.
+	"""
+
+
+class EngineManager:
+	"""
+	Tracks the live Prolog engines of the process and the references held to each.
+
+	An engine starts with one reference, held by the solver that started it, and every solver sharing the engine
+	holds one more. The engine is stopped when its last reference is released. An optional cap bounds the number
+	of live engines, so that long experiment loops run with a bounded number of Prolog processes.
+
+	A solver that is garbage collected without being released leaks its reference; the manager logs a warning and
+	releases the reference on its behalf. The garbage collector can run the release while the manager's lock is
+	held, so leaked references are queued and released once the lock is free.
+
+	Attributes:
+		max_engines (Optional[int]): The maximum number of live engines, or None for no limit.
+		leaks (int): The number of references released because their solvers were never released.
+	"""
+
+	def __init__(self, max_engines: Optional[int] = None, thread_creator: Optional[Callable[[], Callable]] = None):
+		"""
+		Initializes the manager.
+
+		Args:
+			max_engines (Optional[int]): The maximum number of live engines (default: no limit).
+			thread_creator (Optional[Callable[[], Callable]]): Returns the thread creator of a new engine (default:
+				one SWI-Prolog MQI process per engine).
+		"""
+		self.max_engines = max_engines
+		self.leaks = 0
+		self._thread_creator = thread_creator if thread_creator is not None else lambda: PrologMQI().create_thread
+		self._refcounts: Dict[int, int] = {}
+		self._lock = threading.Lock()
+		self._leaked: Deque[PrologEngine] = collections.deque()
+
+	@property
+	def live(self) -> int:
+		"""
+		The number of live engines, including the ones being started.
+		"""
+		return len(self._refcounts)
+
+	def start(self) -> PrologEngine:
+		"""
+		Start an engine, with one reference held by the caller.
+
+		Returns:
+			PrologEngine: The engine.
+
+		Raises:
+			EngineLimitError: If the cap on live engines is reached, even after collecting leaked solvers.
+		"""
+		self._release_queued()
+		slot = object()
+		if not self._reserve(slot):
+			# Solvers dropped without being released may still hold engines until they are collected.
+			gc.collect()
+			self._release_queued()
+			if not self._reserve(slot):
+				raise EngineLimitError(f"Cannot start more than {self.max_engines} Prolog engines; release the "
+									   f"solvers of agents that are no longer used.")
+		try:
+			engine = PrologEngine(thread_creator=self._thread_creator())
+		finally:
+			with self._lock:
+				count = self._refcounts.pop(id(slot))
+		with self._lock:
+			self._refcounts[id(engine)] = count
+		return engine
+
+	def references(self, engine: PrologEngine) -> int:
+		"""
+		The number of references to an engine, 0 once it is stopped.
+		"""
+		with self._lock:
+			return self._refcounts.get(id(engine), 0)
+
+	def retain(self, engine: PrologEngine) -> None:
+		"""
+		Take one more reference to a live engine.
+		"""
+		self._release_queued()
+		with self._lock:
+			self._refcounts[id(engine)] += 1
+
+	def release(self, engine: PrologEngine) -> bool:
+		"""
+		Release one reference to an engine, stopping the engine with its last reference.
+
+		Args:
+			engine (PrologEngine): The engine.
+
+		Returns:
+			bool: True if the engine was stopped, False otherwise.
+		"""
+		self._release_queued()
+		return self._release(engine)
+
+	def _release(self, engine: PrologEngine) -> bool:
+		with self._lock:
+			count = self._refcounts.get(id(engine))
+			if count is None:
+				return False
+			if count > 1:
+				self._refcounts[id(engine)] = count - 1
+				return False
+			del self._refcounts[id(engine)]
+		engine.stop()
+		return True
+
+	def watch(self, owner: object, engine: PrologEngine) -> weakref.finalize:
+		"""
+		Release the owner's reference to an engine if the owner is garbage collected without releasing it.
+
+		Args:
+			owner (object): The holder of the reference, e.g. a solver.
+			engine (PrologEngine): The engine.
+
+		Returns:
+			weakref.finalize: The finalizer, to be detached when the owner releases the reference.
+		"""
+		return weakref.finalize(owner, self._release_leaked, engine)
+
+	def _release_leaked(self, engine: PrologEngine) -> None:
+		self._leaked.append(engine)
+		# A collection triggered while this thread holds the lock leaves the release queued for the next call.
+		if self._lock.acquire(blocking=False):
+			self._lock.release()
+			self._release_queued()
+
+	def _release_queued(self) -> None:
+		"""
+		Release the references of the leaked solvers queued by their finalizers.
+		"""
+		while self._leaked:
+			try:
+				engine = self._leaked.popleft()
+			except IndexError:
+				return
+			with self._lock:
+				if id(engine) not in self._refcounts:
+					continue
+			self.leaks += 1
+			logger.warning("A solver was garbage collected without being released; releasing its Prolog engine.")
+			self._release(engine)
+
+	def _reserve(self, slot: object) -> bool:
+		with self._lock:
+			if self.max_engines is not None and len(self._refcounts) >= self.max_engines:
+				return False
+			self._refcounts[id(slot)] = 1
+			return True
+
+	def _forget(self) -> None:
+		"""
+		Forget the engines of the parent process in a forked child, which must not stop or count them.
+		"""
+		self._lock = threading.Lock()
+		self._refcounts = {}
+		self._leaked = collections.deque()
+
+
+# Manager of the engines of all solvers of the process.
+engine_manager = EngineManager()
+
+if hasattr(os, "register_at_fork"):
+	os.register_at_fork(after_in_child=engine_manager._forget)
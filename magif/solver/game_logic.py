@@ -1,20 +1,25 @@
 from magif.solver.engine import PrologEngine
-from typing import Any, Tuple
+from typing import Any, Optional, Sequence, Tuple
 
 
 class GameSolver:
     """
     Contains domain-specific Prolog logic for game operations such as moves, player names, and payoffs.
+
+    With a strategy module, moves are selected by the strategy loaded into that Prolog module, while the game is
+    queried in the user module shared by all the strategies of the engine.
     """
 
-    def __init__(self, engine: PrologEngine):
+    def __init__(self, engine: PrologEngine, strategy_module: Optional[str] = None):
         """
         Initialize the GameSolver with a given Prolog engine.
 
         Args:
             engine (PrologEngine): The engine used to query the Prolog environment.
+            strategy_module (Optional[str]): The module holding the strategy (default: the user module).
         """
         self.engine = engine
+        self.strategy_module = strategy_module
 
     def get_possible_moves(self) -> Tuple[bool, Any]:
         """
@@ -62,6 +67,32 @@ class GameSolver:
         result = self.engine.query(f"initialise(default_move(_, '{move}'), s0).")
         return result.success, result.data if result.success else result.error
 
+    def get_opposite_move(self, move: str) -> Tuple[bool, Any]:
+        """
+        Retrieve the move opposite to the given one.
+
+        Args:
+            move (str): The move.
+
+        Returns:
+            Tuple[bool, Any]: (True, list with one opposite move) or (False, error message).
+        """
+        result = self.engine.query(f"opposite_move('{move}', X).", 1)
+        return result.success, result.data if result.success else result.error
+
+    def set_seed(self, seed: int) -> Tuple[bool, Any]:
+        """
+        Seed the random generator of the engine, used by stochastic strategies.
+
+        Args:
+            seed (int): The seed.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        result = self.engine.query(f"set_random(seed({int(seed)})).")
+        return result.success, result.data if result.success else result.error
+
     def select_move(self, agent_name: str) -> Tuple[bool, Any]:
         """
         Use the solver's logic to select a move for the specified agent.
@@ -72,32 +103,83 @@ class GameSolver:
         Returns:
             Tuple[bool, Any]: (True, selected move) or (False, error message).
         """
-        result = self.engine.query(f"select({agent_name}, _, s0, M).",1)
+        goal = f"select({agent_name}, _, s0, M)"
+        if self.strategy_module is not None:
+            goal = f"{self.strategy_module}:{goal}"
+        result = self.engine.query(f"{goal}.",1)
         return result.success, result.data[0] if result.success else result.error
 
-    def calculate_payoff(
-        self, player: str, opponent: str, move_p: str, move_o: str
-    ) -> Tuple[bool, Any]:
+    def select_move_in_state(self, agent_name: str, facts: Sequence[str]) -> Tuple[bool, Any]:
         """
-        Calculate the payoff for a player given both players' moves.
+        Select a move for the specified agent with the round facts of the game state set to the given ones.
+
+        Args:
+            agent_name (str): The name of the agent.
+            facts (Sequence[str]): The round facts as Prolog terms, e.g. `last_move(player2, 'D')`.
+
+        Returns:
+            Tuple[bool, Any]: (True, selected move) or (False, error message).
+        """
+        module = "" if self.strategy_module is None else f"{self.strategy_module}, "
+        result = self.engine.query(f"select_in_state({module}{agent_name}, [{', '.join(facts)}], s0, M).", 1)
+        return result.success, result.data[0] if result.success else result.error
+
+    def calculate_payoff(self, player: str, players: Sequence[str], moves: Sequence[str]) -> Tuple[bool, Any]:
+        """
+        Calculate the payoff for a player given the moves of all players.
 
         Args:
             player (str): Name of the player.
-            opponent (str): Name of the opponent.
-            move_p (str): Move made by the player.
-            move_o (str): Move made by the opponent.
+            players (Sequence[str]): Names of all players, including the player.
+            moves (Sequence[str]): Moves made by the players, in the same order as `players`.
 
         Returns:
             Tuple[bool, Any]: (True, payoff as float) or (False, error message).
         """
-        query = (
-            f"finally(goal({player}, U), "
-            f"do(move({player}, '{move_p}'), "
-            f"do(move({opponent}, '{move_o}'), s0)))."
-        )
-        result = self.engine.query(query, 1)
+        # The first player's move is applied last, as in do(move(P1, M1), do(move(P2, M2), s0)).
+        situation = "s0"
+        for name, move in reversed(list(zip(players, moves))):
+            situation = f"do(move({name}, '{move}'), {situation})"
+        result = self.engine.query(f"finally(goal({player}, U), {situation}).", 1)
+        return result.success, result.data[0] if result.success else result.error
+
+    def get_payoff_profiles(self) -> Tuple[bool, Any]:
+        """
+        Retrieve every move profile of the game together with the utilities of all players, in a single
+        enumeration of the game's final states.
+
+        Returns:
+            Tuple[bool, Any]: (True, list of [Moves, Utilities] pairs) or (False, error message).
+        """
+        result = self.engine.query("payoff_profiles(X).", 1)
         return result.success, result.data[0] if result.success else result.error
 
+    def snapshot_state(self, key: str) -> Tuple[bool, Any]:
+        """
+        Save the state facts of the game (those set with `initialise/2`) under a key.
+
+        Args:
+            key (str): Name of the snapshot.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        result = self.engine.query(f"snapshot_state('{key}').")
+        return result.success, result.data if result.success else result.error
+
+    def restore_state(self, key: str) -> Tuple[bool, Any]:
+        """
+        Replace the state facts of the game with the ones saved under a key.
+
+        Args:
+            key (str): Name of the snapshot.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        result = self.engine.query(f"restore_state('{key}').")
+        return result.success, result.data if result.success else result.error
+
     def update_opponent_last_move(self, opponent_name: str, opponent_move: str) -> Tuple[bool, Any]:
         """
         Update the game state with the opponent's last move.
@@ -113,3 +195,30 @@ class GameSolver:
         result = self.engine.query(query)
         return result.success, result.data if result.success else result.error
 
+    def record_round(self, player: str, move: str, opponents: Sequence[Tuple[str, str]]) -> Tuple[bool, Any]:
+        """
+        Update the game state with the moves of a finished round: the player's own last move and the last and
+        previous moves of each opponent.
+
+        Args:
+            player (str): Name of the player.
+            move (str): Move made by the player.
+            opponents (Sequence[Tuple[str, str]]): Names and moves of the opponents.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        opponent_list = ", ".join(f"[{name}, '{opponent_move}']" for name, opponent_move in opponents)
+        query = f"record_round({player}, '{move}', [{opponent_list}], s0)."
+        result = self.engine.query(query)
+        return result.success, result.data if result.success else result.error
+
+    def unload_strategy(self) -> Tuple[bool, Any]:
+        """
+        Remove the strategy from its module, leaving the game and the other strategies of the engine loaded.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        result = self.engine.query(f"unload_strategy({self.strategy_module}).")
+        return result.success, result.data if result.success else result.error
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 import io
 import os
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 from magif.solver.engine import PrologEngine
 from magif.utils.setup_logger import logger
 
@@ -22,11 +22,14 @@ class ValidationResult:
 class PrologValidator:
 	"""
 	Handles validation of Prolog code and predicate presence in the environment.
+
+	With a module, the code is loaded into that Prolog module of the engine instead of the user module.
 	"""
 
-	def __init__(self, engine: PrologEngine, file_writer):
+	def __init__(self, engine: PrologEngine, file_writer, module: Optional[str] = None):
 		self.engine = engine
 		self.file_writer = file_writer
+		self.module = module
 
 	def validate(self, code: str, predicates: Tuple[str, ...] = ()) -> ValidationResult:
 		"""
@@ -49,14 +52,15 @@ class PrologValidator:
 
 		try:
 			# Consult Prolog file
-			if not self.engine.consult(temp_file):
+			if not self.engine.consult(temp_file, self.module):
 				logger.error(f"Failed to consult Prolog file: {temp_file}")
 				is_valid = False
 
 			# Check predicates if consulted successfully
 			if is_valid:
 				for predicate in predicates:
-					result = self.engine.query(f"current_predicate({predicate}).")
+					qualified = predicate if self.module is None else f"{self.module}:{predicate}"
+					result = self.engine.query(f"current_predicate({qualified}).")
 					if not result.success or not result.data:
 						logger.error(f"Missing predicate: {predicate}")
 						trace = f"Missing predicate: {predicate}"
@@ -1,4 +1,5 @@
 :- dynamic initially/2.
+:- dynamic saved_state/2.
 
 % All legal evolutions of a game: can be used both as a generator and test.
 game(F,F):- final(F).
@@ -17,4 +18,65 @@ initialise(Target, State):-
     Target =.. [Pred, Id, _],
     Current =.. [Pred, Id, _],
     (initially(Current, State) -> retract(initially(Current, State)); true),
-    assert(initially(Target, State)).
\ No newline at end of file
+    assert(initially(Target, State)).
+
+% Record a finished round: the player's own move, and the last and previous moves
+% of each opponent, given as a list of [Opponent, Move] pairs.
+record_round(P, Mp, Opponents, State):-
+    initialise(own_last_move(P, Mp), State),
+    forall(member([O, Mo], Opponents),
+        ((initially(last_move(O, Prev), State) -> initialise(previous_move(O, Prev), State) ; true),
+         initialise(last_move(O, Mo), State))).
+
+% All move profiles of a game with the utilities of every player, as a list of
+% [Moves, Utilities] pairs where Moves = [[Player, Move], ...] and Utilities = [[Player, Utility], ...].
+% The depth limit guards against games whose final state is never reached.
+payoff_profiles(Profiles):-
+    findall([Moves, Utilities],
+        (call_with_depth_limit(game(s0, F), 1000, Depth),
+         Depth \== depth_limit_exceeded,
+         findall([P, M], holds(did(P, M), F), Moves),
+         findall([P, U], finally(goal(P, U), F), Utilities)),
+        Profiles).
+
+% Select a move in the state of one match: the round facts of the engine are
+% replaced by Facts, a list of own_last_move/2, last_move/2 and previous_move/2 terms.
+select_in_state(P, Facts, State, M):-
+    set_round_facts(Facts, State),
+    select(P, _, State, M).
+
+% As select_in_state/4, with the strategy loaded into Module, so that the agents
+% of one game can share an engine, each with its own strategy module.
+select_in_state(Module, P, Facts, State, M):-
+    set_round_facts(Facts, State),
+    Module:select(P, _, State, M).
+
+set_round_facts(Facts, State):-
+    retractall(initially(own_last_move(_, _), State)),
+    retractall(initially(last_move(_, _), State)),
+    retractall(initially(previous_move(_, _), State)),
+    forall(member(F, Facts), assert(initially(F, State))).
+
+% Remove the predicates defined in a strategy module, leaving the shared game untouched.
+unload_strategy(Module):-
+    forall((current_predicate(Module:Name/Arity),
+            functor(Head, Name, Arity),
+            \+ predicate_property(Module:Head, imported_from(_))),
+        abolish(Module:Name/Arity)).
+
+% Save the state facts, the initially/2 facts of the form initially(Pred(Id, Value), S)
+% that initialise/2 (re)asserts, under Key. Clauses with a body are left untouched.
+snapshot_state(Key):-
+    findall(initially(F, S), (clause(initially(F, S), true), state_fact(F)), Facts),
+    retractall(saved_state(Key, _)),
+    assert(saved_state(Key, Facts)).
+
+% Replace the current state facts with the ones saved under Key.
+restore_state(Key):-
+    saved_state(Key, Facts),
+    forall((clause(initially(F, _), true, Ref), state_fact(F)), erase(Ref)),
+    forall(member(Fact, Facts), assertz(Fact)).
+
+state_fact(F):-
+    compound(F),
+    functor(F, _, 2).
@@ -1,13 +1,23 @@
 from magif.solver.engine import PrologEngine
+from magif.solver.engine_manager import engine_manager
 from magif.solver.prolog_validator import PrologValidator
 from magif.solver.game_logic import GameSolver
 from magif.solver.solver_utils import file_writer
-from swiplserver import PrologMQI
+from magif.game.payoff_tensor import PayoffTensor
 from typing import Any, Optional, Tuple
 
 class Solver:
     """
     Coordinates Prolog engine interaction, code validation, and game logic operations.
+
+    The Prolog engine is started, and the code given at construction validated, on the first operation that needs
+    it, so that solvers which are replaced or discarded before being used never spawn an engine.
+
+    A solver can also be a view of another solver's engine (see `with_strategy_module`), sharing its compiled game
+    and loading only a strategy, into a Prolog module of its own.
+
+    Every started solver holds a reference to its engine, counted by the engine manager, which stops the engine when the
+    last solver using it is released.
     """
 
     def __init__(self, solver_string: str, game_string: str = None, strategy_string: str = None, logger=None):
@@ -19,34 +29,112 @@ class Solver:
             game_string (str): Prolog rules for the game logic.
             strategy_string (str): Prolog strategy logic.
         """
-        # Initialize validity and trace attributes.
-        self.valid: bool = False
-        self.trace: Optional[str] = None
-
         self.solver_string = solver_string
         self.game_string = game_string
         self.strategy_string = strategy_string
 
-        self.engine = PrologEngine(thread_creator=PrologMQI().create_thread)
-        self.validator = PrologValidator(self.engine, file_writer)
-        self.game_solver = GameSolver(self.engine)
+        # The code validated when the engine starts, as given now.
+        self._initial_code = [("solver", solver_string), ("game", game_string), ("strategy", strategy_string)]
+        self._engine: Optional[PrologEngine] = None
+        self._validator: Optional[PrologValidator] = None
+        self._game_solver: Optional[GameSolver] = None
+        self._valid: bool = False
+        self._trace: Optional[str] = None
+        # The module of the strategy, for a solver sharing the engine of another one; None for an engine owner.
+        self.strategy_module: Optional[str] = None
+        self._finalizer = None
+        self._released = False
 
+    def _start(self):
+        """
+        Start the Prolog engine and validate the code given at construction, if not done yet.
+        """
+        if self._engine is not None:
+            return
+        self._engine = engine_manager.start()
+        self._finalizer = engine_manager.watch(self, self._engine)
+        self._validator = PrologValidator(self._engine, file_writer)
+        self._game_solver = GameSolver(self._engine)
         self._validate_all()
 
+    @property
+    def started(self) -> bool:
+        """
+        Whether the Prolog engine was started.
+        """
+        return self._engine is not None
+
+    @property
+    def shares_engine(self) -> bool:
+        """
+        Whether other solvers use this solver's engine, as the clones of an agent do, so that the state facts of
+        the game, such as the default move, are shared with them.
+        """
+        return self._engine is not None and engine_manager.references(self._engine) > 1
+
+    @property
+    def engine(self) -> PrologEngine:
+        self._start()
+        return self._engine
+
+    @property
+    def validator(self) -> PrologValidator:
+        self._start()
+        return self._validator
+
+    @property
+    def game_solver(self) -> GameSolver:
+        self._start()
+        return self._game_solver
+
+    @property
+    def valid(self) -> bool:
+        self._start()
+        return self._valid
+
+    @property
+    def trace(self) -> Optional[str]:
+        self._start()
+        return self._trace
+
     def _validate_all(self):
         """
         Validate the solver, game, and strategy Prolog code (if provided).
         Sets self.valid and self.trace accordingly.
         """
-        components = [("solver", self.solver_string), ("game", self.game_string), ("strategy", self.strategy_string)]
         all_valid = True
-        for label, code in components:
+        for label, code in self._initial_code:
             if code:
-                result = self.validator.validate(code)
+                result = self._validator.validate(code)
                 if not result.is_valid:
                     all_valid = False
-                    self.trace = result.trace
-        self.valid = all_valid
+                    self._trace = result.trace
+        self._valid = all_valid
+
+    def with_strategy_module(self, module: str) -> "Solver":
+        """
+        Create a solver sharing this solver's engine and the game loaded into it, whose strategy is loaded into
+        its own Prolog module.
+
+        The state facts of the game are shared by all the solvers of the engine, so the solvers should select
+        moves in the state of a match (`select_move_in_state`), as match-local seats do.
+
+        Args:
+            module (str): The name of the strategy module, unique in the engine.
+
+        Returns:
+            Solver: The new solver, without a strategy; releasing it unloads its strategy only.
+        """
+        self._start()
+        solver = Solver(self.solver_string, self.game_string)
+        engine_manager.retain(self._engine)
+        solver._engine = self._engine
+        solver._finalizer = engine_manager.watch(solver, self._engine)
+        solver._validator = PrologValidator(self._engine, file_writer, module=module)
+        solver._game_solver = GameSolver(self._engine, strategy_module=module)
+        solver._valid, solver._trace = self._valid, self._trace
+        solver.strategy_module = module
+        return solver
 
     def validate(self, rules):
         result = self.validator.validate(rules)
@@ -54,9 +142,16 @@ class Solver:
 
     def release(self):
         """
-        Release resources by stopping the Prolog engine.
+        Release the solver's reference to its Prolog engine, if it was started, unloading the strategy of a solver
+        sharing the engine of another one. The engine stops when its last reference is released.
         """
-        self.engine.stop()
+        if self._engine is None or self._released:
+            return
+        self._released = True
+        self._finalizer.detach()
+        if self.strategy_module is not None and self._engine.thread is not None:
+            self._game_solver.unload_strategy()
+        engine_manager.release(self._engine)
 
     def get_params(self):
         """
@@ -113,20 +208,58 @@ class Solver:
         """
         return self.game_solver.update_default_move(move)
 
-    def calculate_payoff(self, player, opponent, move_p, move_o):
+    def calculate_payoff(self, player, players, moves):
         """
-        Calculate payoff based on two players' moves.
+        Calculate payoff based on the moves of all players.
 
         Args:
             player (str): Player's name.
-            opponent (str): Opponent's name.
-            move_p (str): Player's move.
-            move_o (str): Opponent's move.
+            players (Sequence[str]): Names of all players, including the player.
+            moves (Sequence[str]): Moves made by the players, in the same order as `players`.
 
         Returns:
             QueryResult: Payoff result or error.
         """
-        return self.game_solver.calculate_payoff(player, opponent, move_p, move_o)
+        return self.game_solver.calculate_payoff(player, players, moves)
+
+    def get_payoff_tensor(self, players) -> Tuple[bool, Any]:
+        """
+        Extract the payoffs of all players for every move profile in one enumeration of the game.
+
+        Args:
+            players (List[str]): Player names, defining the order of moves and payoffs in the tensor.
+
+        Returns:
+            Tuple[bool, Any]: (True, PayoffTensor) or (False, error message).
+        """
+        success, profiles = self.game_solver.get_payoff_profiles()
+        if not success:
+            return False, profiles
+        return True, PayoffTensor.from_profiles(players, profiles)
+
+    def get_opposite_move(self, move):
+        """
+        Retrieve the move opposite to the given one.
+
+        Args:
+            move (str): The move.
+
+        Returns:
+            QueryResult: Result with the opposite move or error.
+        """
+        return self.game_solver.get_opposite_move(move)
+
+    def set_seed(self, seed: int) -> Tuple[bool, Any]:
+        """
+        Seed the random generator of the engine, so that stochastic strategies can be replayed.
+
+        Args:
+            seed (int): The seed.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        return self.game_solver.set_seed(seed)
 
     def select_move(self, agent_name: str) -> Tuple[bool, Any]:
         """
@@ -140,6 +273,43 @@ class Solver:
         """
         return self.game_solver.select_move(agent_name)
 
+    def select_move_in_state(self, agent_name: str, facts) -> Tuple[bool, Any]:
+        """
+        Select a move for the given agent in the state of one match.
+
+        Args:
+            agent_name (str): Name of the agent.
+            facts (Sequence[str]): The match's round facts as Prolog terms.
+
+        Returns:
+            Tuple[bool, Any]: (True, selected move) or (False, error message).
+        """
+        return self.game_solver.select_move_in_state(agent_name, facts)
+
+    def snapshot_state(self, key: str = "default") -> Tuple[bool, Any]:
+        """
+        Save the dynamic game state (the facts set with `initialise/2`, such as the last moves) in the engine.
+
+        Args:
+            key (str): Name of the snapshot.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        return self.game_solver.snapshot_state(key)
+
+    def restore_state(self, key: str = "default") -> Tuple[bool, Any]:
+        """
+        Restore the dynamic game state saved with `snapshot_state`, without restarting the engine.
+
+        Args:
+            key (str): Name of the snapshot.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        return self.game_solver.restore_state(key)
+
     def update_opponent_last_move(self, opponent_name: str, opponent_move: str) -> Tuple[bool, Any]:
         """
         Update the internal game state with the opponent's most recent move.
@@ -151,4 +321,18 @@ class Solver:
         Returns:
             Tuple[bool, Any]: (True, confirmation) or (False, error message).
         """
-        return self.game_solver.update_opponent_last_move(opponent_name, opponent_move)
\ No newline at end of file
+        return self.game_solver.update_opponent_last_move(opponent_name, opponent_move)
+
+    def record_round(self, player: str, move: str, opponents) -> Tuple[bool, Any]:
+        """
+        Update the internal game state with the moves of a finished round.
+
+        Args:
+            player (str): Name of the player.
+            move (str): The player's move.
+            opponents (Sequence[Tuple[str, str]]): Names and moves of the opponents.
+
+        Returns:
+            Tuple[bool, Any]: (True, confirmation) or (False, error message).
+        """
+        return self.game_solver.record_round(player, move, opponents)
@@ -1,5 +1,7 @@
+import functools
 import os
 import tempfile
+from magif.utils.utils import normalize_path, read_file
 
 def file_writer(code: str) -> str:
     """
@@ -16,3 +18,14 @@ def file_writer(code: str) -> str:
     with tempfile.NamedTemporaryFile(delete=False, dir=temp_dir, suffix=".pl") as temp_file:
         temp_file.write(code.encode())
         return temp_file.name
+
+
+@functools.lru_cache(maxsize=None)
+def solver_source() -> str:
+    """
+    Read the game-independent solver logic, once per process.
+
+    Returns:
+        str: The Prolog code of `magif/solver/solver.pl`.
+    """
+    return read_file(normalize_path("magif/solver/solver.pl"))
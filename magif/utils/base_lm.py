@@ -1,5 +1,36 @@
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
+
+# The response of a language model whose request failed.
+ERROR_RESPONSE = "An error occurred while generating the response."
+
+# The maximum number of requests in flight to each provider; providers not listed get the default.
+MAX_CONCURRENT_REQUESTS: Dict[str, int] = {}
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+# The semaphores of the providers, per event loop, since a semaphore can only be used in one loop.
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+	weakref.WeakKeyDictionary()
+
+
+def provider_semaphore(provider: str) -> asyncio.Semaphore:
+	"""
+	Get the semaphore capping the requests in flight to a provider, shared by all its language models running in
+	the current event loop.
+
+	Args:
+		provider (str): The name of the provider.
+
+	Returns:
+		asyncio.Semaphore: The semaphore of the provider.
+	"""
+	semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+	if provider not in semaphores:
+		limit = MAX_CONCURRENT_REQUESTS.get(provider, DEFAULT_MAX_CONCURRENT_REQUESTS)
+		semaphores[provider] = asyncio.Semaphore(limit)
+	return semaphores[provider]
 
 
 class BaseLM(ABC):
@@ -8,7 +39,12 @@ class BaseLM(ABC):
 
 	This class provides an interface for language models with methods to prompt,
 	manage context, and handle conversation history.
+
+	Attributes:
+		provider (str): The provider of the model, whose concurrent requests share a limit (see
+			`provider_semaphore`).
 	"""
+	provider = "default"
 
 	def __init__(self) -> None:
 		"""
@@ -52,6 +88,27 @@ class BaseLM(ABC):
 		"""
 		pass
 
+	async def aprompt(self, instruction: str, max_tokens: int = 2048) -> str:
+		"""
+		Prompt the language model without blocking the event loop, waiting for a slot of the provider's limit on
+		requests in flight.
+
+		By default, `prompt` runs in a worker thread; models with an async client override `_aprompt`. Prompts of
+		one model saving its history should not run concurrently, as they would interleave their messages.
+
+		Args:
+			instruction (str): The instruction to prompt the language model with.
+			max_tokens (int): Maximum number of tokens to generate in the response.
+
+		Returns:
+			str: The response generated by the language model.
+		"""
+		async with provider_semaphore(self.provider):
+			return await self._aprompt(instruction, max_tokens)
+
+	async def _aprompt(self, instruction: str, max_tokens: int) -> str:
+		return await asyncio.to_thread(self.prompt, instruction, max_tokens)
+
 	@abstractmethod
 	def clear_context(self) -> None:
 		"""
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+from magif.utils.base_lm import BaseLM, ERROR_RESPONSE
+from magif.utils.setup_logger import logger
+from magif.utils.utils import CacheMode
+
+
+class CacheMissError(LookupError):
+	"""
+	Raised when a language model replaying its cache is prompted with a request that was not recorded.
+	"""
+
+
+class ResponseCache:
+	"""
+	Recorded responses of language models, stored in a SQLite database shared by all processes using its path.
+
+	A request is keyed by the model, the temperature, the full list of messages sent and the maximum number of
+	tokens. Repeating a request, e.g. autoformalizing one game for several agents, samples the model again, so
+	the cache also counts the occurrences of each request answered or recorded since it was opened: the n-th
+	occurrence of a request is answered with the n-th response recorded for it. A rerun thus gets the responses of
+	the recorded run.
+
+	Attributes:
+		path (str): The path of the database.
+		hits (int): The number of requests answered from the cache.
+		misses (int): The number of requests not in the cache.
+	"""
+
+	def __init__(self, path: str):
+		"""
+		Initializes the cache.
+
+		Args:
+			path (str): The path of the database, created if it does not exist.
+		"""
+		self.path = path
+		self.hits = 0
+		self.misses = 0
+		self._occurrences: Dict[str, int] = {}
+		self._db: Optional[sqlite3.Connection] = None
+		# Requests may come from worker threads (see `BaseLM.aprompt`).
+		self._lock = threading.Lock()
+
+	def __getstate__(self) -> dict:
+		# Worker processes open their own connection to the database.
+		return {**self.__dict__, "_db": None, "_lock": None}
+
+	def __setstate__(self, state: dict) -> None:
+		self.__dict__.update(state, _lock=threading.Lock())
+
+	@staticmethod
+	def key(model: str, temperature: float, messages: List[Dict[str, Any]], max_tokens: int) -> str:
+		"""
+		Get the key of a request.
+
+		Returns:
+			str: The SHA-256 digest of the request.
+		"""
+		description = json.dumps([model, temperature, messages, max_tokens], sort_keys=True)
+		return hashlib.sha256(description.encode()).hexdigest()
+
+	def get(self, key: str) -> Optional[str]:
+		"""
+		Get the recorded response to the next occurrence of a request, counting the occurrence if it was recorded.
+
+		Returns:
+			Optional[str]: The response, or None if it was not recorded.
+		"""
+		with self._lock:
+			occurrence = self._occurrences.get(key, 0)
+			row = self._connect().execute("SELECT response FROM responses WHERE key = ? AND occurrence = ?",
+										  (key, occurrence)).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			self._occurrences[key] = occurrence + 1
+			self.hits += 1
+			return row[0]
+
+	def put(self, key: str, model: str, response: str) -> None:
+		"""
+		Record the response to the next occurrence of a request, counting the occurrence.
+		"""
+		with self._lock:
+			occurrence = self._occurrences.get(key, 0)
+			self._connect().execute("INSERT OR IGNORE INTO responses VALUES (?, ?, ?, ?)",
+									(key, occurrence, model, response))
+			self._db.commit()
+			self._occurrences[key] = occurrence + 1
+
+	def _connect(self) -> sqlite3.Connection:
+		if self._db is None:
+			directory = os.path.dirname(self.path)
+			if directory:
+				os.makedirs(directory, exist_ok=True)
+			self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+			self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT NOT NULL, occurrence INTEGER NOT NULL, "
+							 "model TEXT NOT NULL, response TEXT NOT NULL, PRIMARY KEY (key, occurrence))")
+		return self._db
+
+	def close(self) -> None:
+		"""
+		Close the connection to the database, if open.
+		"""
+		with self._lock:
+			if self._db is not None:
+				self._db.close()
+				self._db = None
+
+
+class CachedLM(BaseLM):
+	"""
+	A language model answering from a response cache, wrapping another language model.
+
+	In RECORD mode, recorded responses are replayed and the others are requested from the wrapped model and
+	recorded; failed requests are not, and do not count as occurrences. In REPLAY mode, the wrapped model is never
+	prompted: a request that was not recorded raises a CacheMissError, so a pipeline can rerun offline. In
+	PASSTHROUGH mode, the cache is neither read nor written.
+
+	The conversation is kept by the wrapped model. Its name (see `get_name`) and its `temperature` attribute, if
+	any, are part of the keys of its requests.
+
+	Attributes:
+		llm (BaseLM): The wrapped language model.
+		cache (ResponseCache): The response cache.
+		mode (CacheMode): The cache mode.
+	"""
+
+	def __init__(self, llm: BaseLM, cache: ResponseCache, mode: CacheMode = CacheMode.RECORD) -> None:
+		"""
+		Initialize the cached language model.
+
+		Args:
+			llm (BaseLM): The language model to wrap.
+			cache (ResponseCache): The response cache.
+			mode (CacheMode): The cache mode (default: RECORD).
+		"""
+		# The messages are the wrapped model's, so the base initializer is not called.
+		self.llm = llm
+		self.cache = cache
+		self.mode = mode
+
+	@classmethod
+	def wrap(cls, llm: Type[BaseLM], cache: Union[ResponseCache, str], mode: CacheMode = CacheMode.RECORD,
+			 **llm_kwargs) -> Callable[..., "CachedLM"]:
+		"""
+		Wrap a language model class, for use wherever a class is expected, e.g. `Agent(llm=...)`.
+
+		Args:
+			llm (Type[BaseLM]): The language model class.
+			cache (Union[ResponseCache, str]): The response cache, or the path of its database.
+			mode (CacheMode): The cache mode (default: RECORD).
+			**llm_kwargs: Further arguments of the language model class, e.g. its temperature.
+
+		Returns:
+			Callable[..., CachedLM]: A factory taking the arguments of the class, such as `save_history`.
+		"""
+		if isinstance(cache, str):
+			cache = ResponseCache(cache)
+
+		def create(**kwargs) -> "CachedLM":
+			return cls(llm(**{**llm_kwargs, **kwargs}), cache, mode)
+		return create
+
+	@property
+	def save_history(self) -> bool:
+		return self.llm.save_history
+
+	@property
+	def context(self) -> Optional[str]:
+		return self.llm.context
+
+	@property
+	def messages(self) -> List[Dict[str, Any]]:
+		return self.llm.messages
+
+	@property
+	def provider(self) -> str:
+		return self.llm.provider
+
+	def _lookup(self, instruction: str, max_tokens: int):
+		"""
+		Look up the response to an instruction, preparing the wrapped model's messages as it would.
+
+		Returns:
+			tuple: The key and the recorded response, which is None if it was not recorded.
+
+		Raises:
+			CacheMissError: In REPLAY mode, if the response was not recorded.
+		"""
+		if not self.llm.save_history:
+			self.llm.clear_context()
+		messages = self.llm.messages + [{"role": "user", "content": instruction}]
+		key = self.cache.key(self.llm.get_name(), getattr(self.llm, "temperature", None), messages, max_tokens)
+		response = self.cache.get(key)
+		if response is None and self.mode == CacheMode.REPLAY:
+			raise CacheMissError(f"No recorded response of {self.llm.get_name()} to request {key}.")
+		return key, response
+
+	def _replay(self, instruction: str, response: str) -> str:
+		logger.debug(f"Replaying recorded response: {response}")
+		self.llm.messages.append({"role": "user", "content": instruction})
+		if self.llm.save_history:
+			self.llm.add_response(response)
+		return response
+
+	def _record(self, key: str, response: str) -> str:
+		if response != ERROR_RESPONSE:
+			self.cache.put(key, self.llm.get_name(), response)
+		return response
+
+	def prompt(self, instruction: str, max_tokens: int = 2048) -> str:
+		"""
+		Prompt the language model, answering from the cache if the response was recorded.
+
+		Args:
+			instruction (str): The instruction to prompt the language model with.
+			max_tokens (int): Maximum number of tokens to generate in the response.
+
+		Returns:
+			str: The recorded or generated response.
+
+		Raises:
+			CacheMissError: In REPLAY mode, if the response was not recorded.
+		"""
+		if self.mode == CacheMode.PASSTHROUGH:
+			return self.llm.prompt(instruction, max_tokens)
+		key, response = self._lookup(instruction, max_tokens)
+		if response is not None:
+			return self._replay(instruction, response)
+		return self._record(key, self.llm.prompt(instruction, max_tokens))
+
+	async def aprompt(self, instruction: str, max_tokens: int = 2048) -> str:
+		"""
+		Prompt the language model without blocking the event loop. Recorded responses are returned at once,
+		without waiting for the provider's limit on requests in flight.
+		"""
+		if self.mode == CacheMode.PASSTHROUGH:
+			return await self.llm.aprompt(instruction, max_tokens)
+		key, response = self._lookup(instruction, max_tokens)
+		if response is not None:
+			return self._replay(instruction, response)
+		return self._record(key, await self.llm.aprompt(instruction, max_tokens))
+
+	def clear_context(self) -> None:
+		self.llm.clear_context()
+
+	def add_response(self, response: str) -> None:
+		self.llm.add_response(response)
+
+	def get_name(self) -> str:
+		return self.llm.get_name()
@@ -1,3 +1,5 @@
+import functools
+import hashlib
 import os
 from pathlib import Path
 import random
@@ -14,6 +16,7 @@ class AgentStatus(Enum):
 	MISSING_PREDICATES = "missing_predicates"
 	INSTRUCTION_ERROR = "instruction_following_error"
 	RUNTIME_ERROR = "runtime_error"
+	LOAD_ERROR = "load_error"
 
 
 class Mode(Enum):
@@ -22,6 +25,12 @@ class Mode(Enum):
     AUTOFORMALIZATION = "autoformalization"
 
 
+class CacheMode(Enum):
+    RECORD = "record"
+    REPLAY = "replay"
+    PASSTHROUGH = "passthrough"
+
+
 def normalize_path(path: str) -> str:
     """
     Converts a relative path to an absolute path using the project's root directory.
@@ -259,3 +268,17 @@ def set_default(obj: Any) -> Any:
 	if isinstance(obj, set):
 		return list(obj)
 	raise TypeError
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(text: Optional[str]) -> str:
+	"""
+	Get the SHA-256 fingerprint of a game's or a strategy's rules.
+
+	Args:
+		text (Optional[str]): The rules.
+
+	Returns:
+		str: The hexadecimal digest.
+	"""
+	return hashlib.sha256((text or "").encode()).hexdigest()
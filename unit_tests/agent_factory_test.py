@@ -0,0 +1,42 @@
+import json
+import unittest
+import logging
+from magif.agent.agent_factory import AgentFactory
+from magif.utils.data_object import DataObject
+from magif.utils.utils import AgentStatus, Mode, normalize_path
+
+
+class TestAgentFactory(unittest.IsolatedAsyncioTestCase):
+	async def asyncSetUp(self):
+		logging.debug('Setting up TestAgentFactory')
+		with open(normalize_path("unit_tests/LOGS/agent_Jekuti.json")) as f:
+			game_rules = json.load(f)["game_rules"]
+		self.factory = AgentFactory(DataObject(rules_string=game_rules, mode=Mode.RULES_STRING))
+
+	async def asyncTearDown(self):
+		self.factory.release()
+
+	def _strategy(self, name):
+		return DataObject(rules_path=normalize_path(f"DATA/STRATEGIES/{name}.pl"), mode=Mode.RULES_PATH)
+
+	async def test_agents_share_the_compiled_game(self):
+		"""Test that the agents of a factory share one engine and game, each with its own strategy."""
+		tft = await self.factory.create(self._strategy("tit-for-tat"))
+		anti_tft = await self.factory.create(self._strategy("anti-tit-for-tat"))
+		self.assertEqual(AgentStatus.CORRECT, tft.status)
+		self.assertEqual(AgentStatus.CORRECT, anti_tft.status)
+		self.assertIs(tft.solver.engine, anti_tft.solver.engine)
+		self.assertEqual(self.factory.template.game.game_moves, tft.game.game_moves)
+
+		player, opponent = tft.game.game_players
+		facts = [f"last_move({opponent}, 'Move2')"]
+		self.assertEqual((True, "Move2"), tft.solver.select_move_in_state(player, facts))
+		self.assertEqual((True, "Move1"), anti_tft.solver.select_move_in_state(player, facts))
+
+		# Releasing an agent unloads its strategy only.
+		anti_tft.release_solver()
+		self.assertEqual((True, "Move2"), tft.solver.select_move_in_state(player, facts))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import logging
+from magif.agent.agent import Agent
+from magif.agent.mind import Mind
+from magif.environment.agent_pool import AgentPool
+from magif.environment.match_cache import fingerprint
+from magif.utils.utils import AgentStatus
+
+
+class TestAgentPool(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestAgentPool')
+
+	async def test_bad_files_fail_only_their_agents(self):
+		"""Test that agents which cannot be loaded join the pool as invalid agents, with progress reported."""
+		with tempfile.TemporaryDirectory() as directory:
+			with open(os.path.join(directory, "agent_broken.json"), "w") as f:
+				f.write("{\"name\": ")
+			with open(os.path.join(directory, "agent_empty.json"), "w") as f:
+				f.write("{}")
+			with open(os.path.join(directory, "notes.txt"), "w") as f:
+				f.write("not an agent")
+
+			reports = []
+			pool = await AgentPool.from_directory(directory, max_concurrency=2,
+												  progress=lambda loaded, total, agent: reports.append((loaded, total)))
+
+		self.assertEqual([], pool.valid_agents)
+		self.assertEqual(["agent_broken", "agent_empty"], [agent.name for agent in pool.invalid_agents])
+		self.assertTrue(all(agent.status == AgentStatus.LOAD_ERROR for agent in pool.invalid_agents))
+		self.assertEqual([(1, 2), (2, 2)], reports)
+
+	def test_indexes_follow_status_changes(self):
+		"""Test that agents move between the valid and invalid agents and are looked up by their current keys."""
+		pool = AgentPool()
+		agents = []
+		for name, strategy, game in [("a", "tft", "g1"), ("b", "grim", "g1"), ("c", "tft", "g2")]:
+			agent = Agent(autoformalization_on=False)
+			agent.mind = Mind(agent)
+			agent.name, agent.strategy_name, agent.game.game_rules = name, strategy, game
+			agent.status = AgentStatus.CORRECT
+			pool.add_agent(agent)
+			agents.append(agent)
+		a, b, c = agents
+
+		self.assertEqual([a, b, c], pool.valid_agents)
+		self.assertEqual([a, c], pool.by_strategy("tft"))
+		self.assertEqual([a, b], pool.by_game(fingerprint("g1")))
+
+		a.status = AgentStatus.RUNTIME_ERROR
+		pool.move_agent(a)
+		a.status = AgentStatus.CORRECT
+		pool.move_agent(a)
+		self.assertEqual([b, c, a], pool.valid_agents)
+		self.assertEqual(b, pool.valid_agents[0])
+		self.assertEqual([b, c, a], pool.by_status(AgentStatus.CORRECT))
+
+		pool.truncate_pool(2)
+		self.assertEqual([b, c], pool.valid_agents)
+		self.assertEqual([], pool.by_name("a"))
+		self.assertNotIn(a, pool)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+import unittest
+import logging
+from types import SimpleNamespace
+from magif.autoformalizer.autoformalizer import Autoformalizer
+from magif.utils.base_lm import BaseLM
+from magif.utils.utils import AgentStatus
+
+
+class DraftingLM(BaseLM):
+	"""A language model answering each instance's prompt with the next scripted delay and response."""
+	script = iter(())
+
+	def __init__(self, save_history: bool = False):
+		super().__init__()
+		self.delay, self.response = next(DraftingLM.script, (0, None))
+
+	@property
+	def save_history(self) -> bool:
+		return True
+
+	@property
+	def context(self):
+		return self.messages
+
+	def prompt(self, instruction: str, max_tokens: int = 1024) -> str:
+		time.sleep(self.delay)
+		if isinstance(self.response, Exception):
+			raise self.response
+		self.messages.append({"role": "user", "content": instruction})
+		self.add_response(self.response)
+		return self.response
+
+	def clear_context(self) -> None:
+		self.messages = []
+
+	def add_response(self, response: str) -> None:
+		self.messages.append({"role": "assistant", "content": response})
+
+	def get_name(self) -> str:
+		return "drafting"
+
+
+class ScriptedSolver:
+	"""
+	A stand-in for a solver accepting the rules "valid", taking a while to validate the rules "slow" and reporting
+	one error per line of other rules.
+	"""
+	solvers = []
+
+	def __init__(self, *params):
+		self.params = params
+		self.released = False
+		self.thread = None
+		ScriptedSolver.solvers.append(self)
+
+	def get_params(self):
+		return list(self.params)
+
+	def validate(self, rules):
+		self.thread = threading.get_ident()
+		if rules == "slow":
+			time.sleep(0.2)
+		if rules == "valid":
+			return True, ""
+		return False, "\n".join(f"Prolog: ERROR: /tmp/rules.pl:{line}:1: Syntax error" for line, _ in
+								enumerate(rules.splitlines(), 1))
+
+	def release(self):
+		self.released = True
+
+
+def parse(response):
+	if response == "unparsed":
+		raise ValueError("No code block in the response.")
+	return response
+
+
+class TestDraftCandidates(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestDraftCandidates')
+		ScriptedSolver.solvers = []
+		self.agent = SimpleNamespace(solver=ScriptedSolver("solver", "game"))
+		self.agent.replace_solver = lambda solver: setattr(self.agent, "solver", solver)
+
+	def _autoformalizer(self, script):
+		autoformalizer = Autoformalizer(DraftingLM, num_candidates=len(script))
+		autoformalizer.solver_class = ScriptedSolver
+		autoformalizer.set_instruction_prompt("Formalize the game.")
+		DraftingLM.script = iter(script)
+		return autoformalizer
+
+	async def test_first_valid_draft_is_accepted(self):
+		"""Test that the first valid draft replaces the agent's solver and every other solver is released."""
+		autoformalizer = self._autoformalizer([(0.1, "valid"), (0, "invalid"), (0.5, "valid")])
+		rules, status = await autoformalizer.autoformalize(self.agent, parse, lambda trace, rules: trace)
+		self.assertEqual(("valid", AgentStatus.CORRECT), (rules, status))
+		self.assertFalse(self.agent.solver.released)
+		self.assertEqual("valid", autoformalizer.llm.context[-1]["content"])
+		self.assertTrue(all(solver.released for solver in ScriptedSolver.solvers[1:] if solver is not self.agent.solver))
+
+	async def test_best_failing_draft_has_fewest_errors(self):
+		"""Test that the failing draft kept has the fewest reported errors, whatever its processed trace looks like."""
+		autoformalizer = self._autoformalizer([(0, "a\nb\nc"), (0.05, "a"), (0.1, "unparsed")])
+		rules, status = await autoformalizer.autoformalize(self.agent, parse, lambda trace, rules: "See the trace.")
+		self.assertEqual(("a", AgentStatus.SYNTACTIC_ERROR), (rules, status))
+		self.assertTrue(all(solver.released for solver in ScriptedSolver.solvers[1:]))
+		# Drafts are validated off the event loop.
+		self.assertNotIn(threading.get_ident(), [solver.thread for solver in ScriptedSolver.solvers[1:]])
+
+	async def test_draft_cancelled_while_validating_releases_its_solver(self):
+		"""Test that a draft cancelled during validation releases its solver once the validation is done."""
+		autoformalizer = self._autoformalizer([(0, "slow"), (0.05, "valid")])
+		rules, status = await autoformalizer.autoformalize(self.agent, parse, lambda trace, rules: trace)
+		self.assertEqual(("valid", AgentStatus.CORRECT), (rules, status))
+		await asyncio.sleep(0.3)
+		slow = ScriptedSolver.solvers[1]
+		self.assertTrue(slow.released)
+		self.assertFalse(self.agent.solver.released)
+
+	async def test_single_draft_is_validated_off_the_event_loop(self):
+		"""Test that a single draft is validated in the agent's solver without blocking the event loop."""
+		DraftingLM.script = iter([(0, "valid")])
+		autoformalizer = Autoformalizer(DraftingLM)
+		autoformalizer.set_instruction_prompt("Formalize the game.")
+		rules, status = await autoformalizer.autoformalize(self.agent, parse, lambda trace, rules: trace)
+		self.assertEqual(("valid", AgentStatus.CORRECT), (rules, status))
+		self.assertEqual([self.agent.solver], ScriptedSolver.solvers)
+		self.assertNotIn(self.agent.solver.thread, (None, threading.get_ident()))
+
+	async def test_failed_draft_counts_as_failure(self):
+		"""Test that a draft raising an exception does not fail the round, unless every draft does."""
+		autoformalizer = self._autoformalizer([(0, RuntimeError("Connection reset.")), (0.05, "valid")])
+		rules, status = await autoformalizer.autoformalize(self.agent, parse, lambda trace, rules: trace)
+		self.assertEqual(("valid", AgentStatus.CORRECT), (rules, status))
+
+		autoformalizer = self._autoformalizer([(0, RuntimeError("Connection reset.")), (0, RuntimeError("Timeout."))])
+		with self.assertRaises(RuntimeError):
+			await autoformalizer.autoformalize(self.agent, parse, lambda trace, rules: trace)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+import unittest
+import logging
+from magif.utils import base_lm
+from magif.utils.base_lm import BaseLM
+
+
+class RecordingLM(BaseLM):
+	"""A language model recording the token limit of its prompts and the number of prompts running at once."""
+	provider = "recording"
+	running = 0
+	most_running = 0
+	lock = threading.Lock()
+
+	def __init__(self, save_history: bool = False):
+		super().__init__()
+		self.max_tokens = None
+
+	@property
+	def save_history(self) -> bool:
+		return False
+
+	@property
+	def context(self):
+		return None
+
+	def prompt(self, instruction: str, max_tokens: int = 1024) -> str:
+		self.max_tokens = max_tokens
+		with RecordingLM.lock:
+			RecordingLM.running += 1
+			RecordingLM.most_running = max(RecordingLM.most_running, RecordingLM.running)
+		time.sleep(0.05)
+		with RecordingLM.lock:
+			RecordingLM.running -= 1
+		return f"Answer to: {instruction}"
+
+	def clear_context(self) -> None:
+		self.messages = []
+
+	def add_response(self, response: str) -> None:
+		pass
+
+	def get_name(self) -> str:
+		return "recording"
+
+
+class TestAsyncPrompt(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestAsyncPrompt')
+		RecordingLM.running = RecordingLM.most_running = 0
+		base_lm.MAX_CONCURRENT_REQUESTS["recording"] = 2
+
+	def tearDown(self):
+		del base_lm.MAX_CONCURRENT_REQUESTS["recording"]
+
+	async def test_aprompt_runs_prompt(self):
+		"""Test that aprompt answers as prompt does, with the token limit of the language models by default."""
+		llm = RecordingLM()
+		self.assertEqual("Answer to: Hi", await llm.aprompt("Hi"))
+		self.assertEqual(2048, llm.max_tokens)
+		await llm.aprompt("Hi", max_tokens=100)
+		self.assertEqual(100, llm.max_tokens)
+
+	async def test_requests_in_flight_are_capped(self):
+		"""Test that the language models of a provider never have more requests in flight than its limit."""
+		responses = await asyncio.gather(*(RecordingLM().aprompt(f"Question {i}") for i in range(6)))
+		self.assertEqual([f"Answer to: Question {i}" for i in range(6)], responses)
+		self.assertEqual(2, RecordingLM.most_running)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import logging
+from magif.utils.base_lm import BaseLM, ERROR_RESPONSE
+from magif.utils.cached_lm import CachedLM, CacheMissError, ResponseCache
+from magif.utils.utils import CacheMode
+
+
+class ScriptedLM(BaseLM):
+	"""A language model answering with numbered responses, counting its prompts, after its scripted failures."""
+	prompts = 0
+	failures = 0
+
+	def __init__(self, save_history: bool = False, temperature: float = 1.0):
+		super().__init__()
+		self._save_history = save_history
+		self.temperature = temperature
+
+	@property
+	def save_history(self) -> bool:
+		return self._save_history
+
+	@property
+	def context(self):
+		return None
+
+	def prompt(self, instruction: str, max_tokens: int = 1024) -> str:
+		if ScriptedLM.failures:
+			ScriptedLM.failures -= 1
+			return ERROR_RESPONSE
+		ScriptedLM.prompts += 1
+		if not self.save_history:
+			self.messages = []
+		self.messages.append({"role": "user", "content": instruction})
+		response = f"response {ScriptedLM.prompts}"
+		if self.save_history:
+			self.add_response(response)
+		return response
+
+	def clear_context(self) -> None:
+		self.messages = []
+
+	def add_response(self, response: str) -> None:
+		self.messages.append({"role": "assistant", "content": response})
+
+	def get_name(self) -> str:
+		return "scripted"
+
+
+class TestCachedLM(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestCachedLM')
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, "responses.db")
+		ScriptedLM.prompts = ScriptedLM.failures = 0
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def _run(self, mode):
+		"""Prompt two agents' models with the same instruction, and one of them again."""
+		cache = ResponseCache(self.path)
+		factory = CachedLM.wrap(ScriptedLM, cache, mode)
+		first, second = factory(save_history=True), factory(save_history=True)
+		responses = [first.prompt("game"), second.prompt("game"), asyncio.run(first.aprompt("feedback"))]
+		cache.close()
+		return responses, first
+
+	def test_record_then_replay(self):
+		"""Test that a replayed run gets the recorded responses, including repeated requests, and history."""
+		recorded, _ = self._run(CacheMode.RECORD)
+		self.assertEqual(["response 1", "response 2", "response 3"], recorded)
+
+		replayed, lm = self._run(CacheMode.REPLAY)
+		self.assertEqual(recorded, replayed)
+		self.assertEqual(3, ScriptedLM.prompts)
+		self.assertEqual(["game", "response 1", "feedback", "response 3"],
+						 [message["content"] for message in lm.messages])
+
+	def test_failed_response_is_not_recorded(self):
+		"""Test that a failed response is neither recorded nor counted, so that a replayed run gets the retries."""
+		ScriptedLM.failures = 1
+		cache = ResponseCache(self.path)
+		lm = CachedLM.wrap(ScriptedLM, cache, CacheMode.RECORD)()
+		recorded = [lm.prompt("game"), lm.prompt("game"), lm.prompt("game")]
+		cache.close()
+		self.assertEqual([ERROR_RESPONSE, "response 1", "response 2"], recorded)
+
+		cache = ResponseCache(self.path)
+		lm = CachedLM.wrap(ScriptedLM, cache, CacheMode.REPLAY)()
+		self.assertEqual(["response 1", "response 2"], [lm.prompt("game"), lm.prompt("game")])
+		cache.close()
+
+	def test_replay_miss(self):
+		"""Test that a request that was not recorded fails in replay mode, and is not recorded in passthrough mode."""
+		self._run(CacheMode.PASSTHROUGH)
+		with self.assertRaises(CacheMissError):
+			self._run(CacheMode.REPLAY)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+import logging
+import os
+import tempfile
+from magif.agent.agent import Agent
+from magif.agent.memory import Memory
+from magif.agent.mind import Mind
+from magif.agent.strategy_library import create_native_strategy
+from magif.environment.agent_pool import AgentPool
+from magif.environment.checkpoint import TournamentCheckpoint
+from magif.environment.environment import Environment
+from magif.environment.match_maker import RoundRobin
+from magif.game.payoff_tensor import PayoffTensor
+from magif.utils.utils import AgentStatus
+
+
+class DefaultMoveSolver:
+	"""A stand-in for an agent's solver, agreeing with the native strategy on the first move of a match."""
+
+	def select_move_in_state(self, agent_name, facts):
+		return True, "C"
+
+
+class TestTournamentCheckpoint(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestTournamentCheckpoint')
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, "checkpoint.jsonl")
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def test_resume_drops_partial_record(self):
+		"""Test that a partial last record is dropped on load and that appending continues after the last complete one."""
+		checkpoint = TournamentCheckpoint(self.path, fsync=False)
+		self.assertEqual((None, []), checkpoint.load())
+		checkpoint.open({"num_rounds": 10})
+		checkpoint.append({"match_index": 0})
+		checkpoint.close()
+		with open(self.path, "a") as f:
+			f.write('{"match_index": 1, "hist')
+
+		checkpoint = TournamentCheckpoint(self.path, fsync=False)
+		self.assertEqual(({"num_rounds": 10}, [{"match_index": 0}]), checkpoint.load())
+		checkpoint.open({"num_rounds": 10})
+		checkpoint.append({"match_index": 1})
+		checkpoint.close()
+		self.assertEqual(({"num_rounds": 10}, [{"match_index": 0}, {"match_index": 1}]), checkpoint.load())
+
+	def test_resume_twice_after_cut_record(self):
+		"""Test that records appended after a record cut mid-line, or cut before its newline, survive two resumes."""
+		checkpoint = TournamentCheckpoint(self.path, fsync=False)
+		checkpoint.open({"num_rounds": 10})
+		checkpoint.append({"match_index": 0})
+		checkpoint.append({"match_index": 1})
+		checkpoint.close()
+		with open(self.path, "r+b") as f:
+			f.truncate(os.path.getsize(self.path) - 1)
+
+		for match_index in (2, 3):
+			checkpoint = TournamentCheckpoint(self.path, fsync=False)
+			checkpoint.load()
+			checkpoint.open({"num_rounds": 10})
+			checkpoint.append({"match_index": match_index})
+			checkpoint.close()
+			with open(self.path, "a") as f:
+				f.write('{"match_index": 9, "hist')
+		self.assertEqual([{"match_index": i} for i in range(4)], TournamentCheckpoint(self.path).load()[1])
+
+
+class TestResume(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestResume')
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, "checkpoint.jsonl")
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	@staticmethod
+	def _agents(names=("Ab", "Cd"), strategy_rules="select(_, _, _, c)."):
+		agents = []
+		for name in names:
+			agent = Agent(autoformalization_on=False)
+			agent.name = name
+			agent.strategy_name = "tit-for-tat"
+			agent.game.game_rules = "possible(move(_, c), s0)."
+			agent.game.strategy_rules = strategy_rules
+			agents.append(agent)
+		return agents
+
+	async def _resume(self, agents):
+		environment = Environment(None, 4, None, checkpoint_path=self.path)
+		try:
+			return await environment._resume(agents)
+		finally:
+			environment._checkpoint.close()
+
+	@staticmethod
+	def _windowed_agents(window):
+		agents = []
+		for name, strategy_name in (("Ab", "grim-trigger"), ("Bc", "pavlov"), ("Cd", "tit-for-two-tats")):
+			agent = Agent(autoformalization_on=False)
+			agent.mind = Mind(agent)
+			agent.name = name
+			agent.strategy_name = strategy_name
+			agent.status = AgentStatus.CORRECT
+			agent.memory = Memory(window=window, table=agent.game.move_table)
+			agent.game.game_players = ["player1", "player2"]
+			agent.game.game_moves = ["C", "D"]
+			agent.game.default_move = "C"
+			agent.game.set_payoff_tensor(PayoffTensor(["player1", "player2"], {
+				("C", "C"): (3, 3), ("C", "D"): (0, 5), ("D", "C"): (5, 0), ("D", "D"): (1, 1)}))
+			agent.native_strategy = create_native_strategy(strategy_name, "C", "D", ["C", "D"])
+			agent.native_check_interval = 1000
+			agent.solver = DefaultMoveSolver()
+			agents.append(agent)
+		return agents
+
+	async def _play(self, agents, match_maker, checkpoint_path=None):
+		agent_pool = AgentPool()
+		for agent in agents:
+			agent_pool.add_agent(agent)
+		environment = Environment(agent_pool, 6, match_maker, reset_state=False, checkpoint_path=checkpoint_path)
+		await environment.play_tournament()
+		return environment
+
+	async def test_resume_with_windowed_memory(self):
+		"""Test that a log records whole matches, and a resumed tournament whole totals, with windowed memories."""
+		expected = await self._play(self._windowed_agents(window=None), RoundRobin(self_play=True))
+
+		# The first two matches are played, then the tournament is resumed from their log.
+		agents = self._windowed_agents(window=4)
+		await self._play(agents, lambda agents: list(RoundRobin(self_play=True)(agents))[:2], self.path)
+		_, records = TournamentCheckpoint(self.path).load()
+		self.assertTrue(all(len(history["payoffs"]) == 6 * record["agents"].count(int(key))
+							for record in records for key, history in record["histories"].items()))
+		environment = await self._play(self._windowed_agents(window=4), RoundRobin(self_play=True), self.path)
+
+		agents = list(expected.agent_pool.valid_agents)
+		resumed = list(environment.agent_pool.valid_agents)
+		self.assertEqual(expected.match_summaries, environment.match_summaries)
+		self.assertEqual([expected.scoreboard.total(agent) for agent in agents],
+						 [environment.scoreboard.total(agent) for agent in resumed])
+		self.assertEqual([agent.name for agent in expected.get_winners()],
+						 [agent.name for agent in environment.get_winners()])
+
+	async def test_log_of_another_pool_is_rejected(self):
+		"""Test that a log is only resumed by agents with the same names and rules, in the same order."""
+		await self._resume(self._agents())
+		self.assertEqual(set(), await self._resume(self._agents()))
+		for agents in (self._agents(names=("Cd", "Ab")), self._agents(strategy_rules="select(_, _, _, d).")):
+			with self.assertRaises(ValueError):
+				await self._resume(agents)
+
+
+if __name__ == '__main__':
+	unittest.main()
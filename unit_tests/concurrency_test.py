@@ -0,0 +1,85 @@
+import unittest
+import logging
+from magif.agent.agent import Agent
+from magif.agent.mind import Mind
+from magif.agent.strategy_library import create_native_strategy
+from magif.environment.agent_pool import AgentPool
+from magif.environment.environment import Environment
+from magif.environment.match_maker import RoundRobin
+from magif.game.payoff_tensor import PayoffTensor
+from magif.utils.utils import AgentStatus
+
+
+class DefaultMoveSolver:
+	"""A stand-in for an agent's solver, agreeing with the native strategy on the first move of a match."""
+
+	def __init__(self, default_move):
+		self.default_move = default_move
+		self.shares_engine = False
+
+	def select_move(self, agent_name):
+		return True, self.default_move
+
+	def select_move_in_state(self, agent_name, facts):
+		return True, self.default_move
+
+
+class TestConcurrentMatches(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestConcurrentMatches')
+
+	@staticmethod
+	def _agent(name, strategy_name, default_move):
+		opposite_move = "D" if default_move == "C" else "C"
+		agent = Agent(autoformalization_on=False)
+		agent.mind = Mind(agent)
+		agent.name = name
+		agent.strategy_name = strategy_name
+		agent.status = AgentStatus.CORRECT
+		agent.game.game_players = ["player1", "player2"]
+		agent.game.game_moves = ["C", "D"]
+		agent.game.default_move = default_move
+		agent.game.set_payoff_tensor(PayoffTensor(["player1", "player2"], {
+			("C", "C"): (3, 3), ("C", "D"): (0, 5), ("D", "C"): (5, 0), ("D", "D"): (1, 1)}))
+		agent.native_strategy = create_native_strategy(strategy_name, default_move, opposite_move, ["C", "D"])
+		# Only the first move of the agent is cross-checked.
+		agent.native_check_interval = 1000
+		agent.solver = DefaultMoveSolver(default_move)
+		return agent
+
+	async def _play(self, max_concurrency, match_local_state):
+		agents = [self._agent("Ab", "grim-trigger", "C"), self._agent("Bc", "pavlov", "D"),
+				  self._agent("Cd", "tit-for-two-tats", "C"), self._agent("De", "pavlov", "C"),
+				  self._agent("Ef", "grim-trigger", "D")]
+		agent_pool = AgentPool()
+		for agent in agents:
+			agent_pool.add_agent(agent)
+		# The agents carry their strategies' state from one match to the next in legacy seats.
+		environment = Environment(agent_pool, 7, RoundRobin(self_play=True), max_concurrency=max_concurrency,
+								  match_local_state=match_local_state, reset_state=False)
+		await environment.play_tournament()
+		histories = [(list(agent.memory.moves), list(agent.memory.opponent_moves), list(agent.memory.payoffs))
+					 for agent in agents]
+		totals = [environment.scoreboard.total(agent) for agent in agents]
+		winners = [agent.name for agent in environment.get_winners()]
+		return histories, totals, winners, environment.match_summaries
+
+	async def test_concurrent_play_matches_sequential_play(self):
+		"""Test that concurrent matches give the histories, totals, winners and summaries of sequential play."""
+		for match_local_state in (True, False):
+			with self.subTest(match_local_state=match_local_state):
+				expected = await self._play(1, match_local_state)
+				self.assertEqual(expected, await self._play(4, match_local_state))
+
+	async def test_sharded_legacy_seats_must_reset_state(self):
+		"""Test that legacy seats carrying their state from one match into the next cannot be sharded."""
+		agent_pool = AgentPool()
+		agent_pool.add_agent(self._agent("Ab", "grim-trigger", "C"))
+		environment = Environment(agent_pool, 7, RoundRobin(self_play=True), num_workers=2, match_local_state=False,
+								  reset_state=False)
+		with self.assertRaises(ValueError):
+			await environment.play_tournament()
+
+
+if __name__ == '__main__':
+	unittest.main()
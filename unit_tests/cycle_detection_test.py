@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+import logging
+from magif.agent.agent import Agent
+from magif.agent.mind import Mind
+from magif.agent.strategy_library import create_native_strategy
+from magif.environment.agent_pool import AgentPool
+from magif.environment.environment import Environment
+from magif.environment.events import RoundsRepeated
+from magif.environment.match_maker import RoundRobin
+from magif.game.payoff_tensor import PayoffTensor
+from magif.utils.utils import AgentStatus, normalize_path, read_file
+
+
+class DefaultMoveSolver:
+	"""A stand-in for an agent's solver, agreeing with the native strategy on the first move of a match."""
+
+	def __init__(self, default_move):
+		self.default_move = default_move
+
+	def select_move_in_state(self, agent_name, facts):
+		return True, self.default_move
+
+
+class TestCycleDetection(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestCycleDetection')
+
+	@staticmethod
+	def _agent(name, strategy_name, default_move):
+		opposite_move = "D" if default_move == "C" else "C"
+		agent = Agent(autoformalization_on=False)
+		agent.mind = Mind(agent)
+		agent.name = name
+		agent.strategy_name = strategy_name
+		agent.status = AgentStatus.CORRECT
+		agent.game.game_players = ["player1", "player2"]
+		agent.game.game_moves = ["C", "D"]
+		agent.game.default_move = default_move
+		agent.game.strategy_rules = read_file(normalize_path(f"DATA/STRATEGIES/{strategy_name}.pl"))
+		agent.game.set_payoff_tensor(PayoffTensor(["player1", "player2"], {
+			("C", "C"): (3, 3), ("C", "D"): (0, 5), ("D", "C"): (5, 0), ("D", "D"): (1, 1)}))
+		agent.native_strategy = create_native_strategy(strategy_name, default_move, opposite_move, ["C", "D"])
+		# Only the first move of each match is cross-checked.
+		agent.native_check_interval = 1000
+		agent.solver = DefaultMoveSolver(default_move)
+		return agent
+
+	async def _play(self, detect_cycles):
+		agents = [self._agent("Ab", "grim-trigger", "C"), self._agent("Bc", "pavlov", "D"),
+				  self._agent("Cd", "tit-for-two-tats", "C"), self._agent("De", "pavlov", "C")]
+		agent_pool = AgentPool()
+		for agent in agents:
+			agent_pool.add_agent(agent)
+		environment = Environment(agent_pool, 13, RoundRobin(self_play=True), reset_state=False,
+								  detect_cycles=detect_cycles)
+		stream = environment.events.subscribe()
+		events = asyncio.create_task(self._collect(stream))
+		await environment.play_tournament()
+		repeated = [event for event in await events if isinstance(event, RoundsRepeated)]
+		histories = [(list(agent.memory.moves), list(agent.memory.opponent_moves), list(agent.memory.payoffs))
+					 for agent in agents]
+		return histories, environment.match_summaries, repeated
+
+	@staticmethod
+	async def _collect(stream):
+		return [event async for event in stream]
+
+	async def test_fast_forward_matches_round_by_round(self):
+		"""Test that fast-forwarded matches have the histories and totals of matches played round by round."""
+		histories, summaries, repeated = await self._play(detect_cycles=True)
+		expected_histories, expected_summaries, not_repeated = await self._play(detect_cycles=False)
+		self.assertEqual(expected_histories, histories)
+		self.assertEqual(expected_summaries, summaries)
+		self.assertEqual([], not_repeated)
+		self.assertEqual(10, len(repeated))
+		# At least one match cycles with a period longer than one round.
+		self.assertTrue(any(event.period > 1 for event in repeated))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,81 @@
+import gc
+import unittest
+import logging
+from magif.solver.engine_manager import EngineLimitError, EngineManager
+
+
+class RecordingThread:
+	"""A stand-in for a Prolog thread that records whether it was stopped."""
+
+	def __init__(self):
+		self.stopped = False
+
+	def stop(self):
+		self.stopped = True
+
+
+class Owner:
+	pass
+
+
+class TestEngineManager(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestEngineManager')
+		self.threads = []
+
+		def thread_creator():
+			thread = RecordingThread()
+			self.threads.append(thread)
+			return lambda: thread
+
+		self.manager = EngineManager(max_engines=2, thread_creator=thread_creator)
+
+	def test_engine_stops_with_last_reference(self):
+		"""Test that a shared engine keeps running until every reference is released."""
+		engine = self.manager.start()
+		self.manager.retain(engine)
+		self.assertEqual(2, self.manager.references(engine))
+		self.assertFalse(self.manager.release(engine))
+		self.assertFalse(self.threads[0].stopped)
+		self.assertTrue(self.manager.release(engine))
+		self.assertTrue(self.threads[0].stopped)
+		self.assertEqual(0, self.manager.references(engine))
+		self.assertEqual(0, self.manager.live)
+
+	def test_cap_on_live_engines(self):
+		"""Test that the cap is enforced and that releasing an engine frees its slot."""
+		first = self.manager.start()
+		self.manager.start()
+		with self.assertRaises(EngineLimitError):
+			self.manager.start()
+		self.manager.release(first)
+		self.manager.start()
+		self.assertEqual(2, self.manager.live)
+
+	def test_leaked_owner_releases_its_engine(self):
+		"""Test that an owner collected without releasing its engine is reported and its engine stopped."""
+		owner = Owner()
+		self.manager.watch(owner, self.manager.start())
+		del owner
+		gc.collect()
+		self.assertEqual(1, self.manager.leaks)
+		self.assertTrue(self.threads[0].stopped)
+		self.assertEqual(0, self.manager.live)
+
+	def test_leak_collected_under_the_lock_is_queued(self):
+		"""Test that a leaked owner collected while the lock is held is released once the lock is free."""
+		owner = Owner()
+		self.manager.watch(owner, self.manager.start())
+		other = self.manager.start()
+		with self.manager._lock:
+			del owner
+			gc.collect()
+		self.assertFalse(self.threads[0].stopped)
+		self.manager.release(other)
+		self.assertEqual(1, self.manager.leaks)
+		self.assertTrue(self.threads[0].stopped)
+		self.assertEqual(0, self.manager.live)
+
+
+if __name__ == '__main__':
+	unittest.main()
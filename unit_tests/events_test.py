@@ -0,0 +1,37 @@
+import unittest
+import asyncio
+import logging
+from magif.environment.events import EventBus, MatchStarted, RoundPlayed
+
+
+class TestEvents(unittest.IsolatedAsyncioTestCase):
+	async def asyncSetUp(self):
+		logging.debug('Setting up TestEvents')
+		self.bus = EventBus()
+
+	async def test_subscribers_receive_events_in_order(self):
+		"""Test that every stream receives all events published after it subscribed, and ends on close."""
+		streams = [self.bus.subscribe(), self.bus.subscribe()]
+		events = [MatchStarted(0, ("Ba", "Ce"), ("tit-for-tat", "pavlov")), RoundPlayed(0, 0, ("C", "D"), (0, 5))]
+		for event in events:
+			await self.bus.publish(event)
+		await self.bus.close()
+		for stream in streams:
+			self.assertEqual(events, [event async for event in stream])
+		self.assertFalse(self.bus.active)
+
+	async def test_backpressure(self):
+		"""Test that publishing waits while a stream's queue is full."""
+		stream = self.bus.subscribe(maxsize=1)
+		await self.bus.publish(RoundPlayed(0, 0, ("C", "C"), (3, 3)))
+		blocked = asyncio.create_task(self.bus.publish(RoundPlayed(0, 1, ("C", "C"), (3, 3))))
+		await asyncio.sleep(0)
+		self.assertFalse(blocked.done())
+		self.assertEqual(0, (await stream.__anext__()).round_num)
+		await blocked
+		self.assertEqual({"event": "round", "match_index": 0, "round_num": 1, "moves": ("C", "C"), "payoffs": (3, 3)},
+						 (await stream.__anext__()).to_dict())
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import logging
+import numpy as np
+from magif.environment.evolution import payoff_matrix, replicator_dynamics, moran_process
+from magif.environment.match_result import MatchSummary
+
+
+class TestEvolution(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestEvolution')
+		self.summaries = [
+			MatchSummary(("Ba", "Ce"), ("tit-for-tat", "anti-default-move"), (9, 14), 10),
+			MatchSummary(("Ba", "Ba"), ("tit-for-tat", "tit-for-tat"), (30, 30), 10),
+			MatchSummary(("Ce", "Ce"), ("anti-default-move", "anti-default-move"), (10, 10), 10),
+			MatchSummary(("Ba", "Ce"), ("tit-for-tat", "anti-default-move"), (0, 0), 2, valid=False),
+		]
+
+	def test_payoff_matrix(self):
+		"""Test that the matrix holds average payoffs per round and skips invalid matches."""
+		strategies, matrix = payoff_matrix(self.summaries)
+		self.assertEqual(["tit-for-tat", "anti-default-move"], strategies)
+		np.testing.assert_allclose([[3.0, 0.9], [1.4, 1.0]], matrix)
+
+	def test_replicator_dynamics(self):
+		"""Test that shares stay on the simplex and the dominant strategy takes over."""
+		_, matrix = payoff_matrix(self.summaries)
+		history = replicator_dynamics(matrix, generations=500, num_seeds=8, step=0.1, seed=0)
+		self.assertEqual((501, 8, 2), history.shape)
+		np.testing.assert_allclose(1.0, history.sum(axis=2))
+		self.assertTrue((history[-1, :, 0] > 0.99).all())
+
+	def test_moran_process(self):
+		"""Test that population sizes are preserved and neutral drift is reproducible."""
+		matrix = np.ones((3, 3))
+		history = moran_process(matrix, population_size=20, steps=200, num_seeds=16, selection_intensity=0,
+								record_every=10, seed=1)
+		self.assertEqual((21, 16, 3), history.shape)
+		np.testing.assert_allclose(1.0, history.sum(axis=2))
+		np.testing.assert_array_equal(history, moran_process(
+			matrix, population_size=20, steps=200, num_seeds=16, selection_intensity=0, record_every=10, seed=1))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import logging
+import os
+import tempfile
+from types import SimpleNamespace
+from magif.agent.memory import MoveTable
+from magif.agent.seat import Seat
+from magif.environment.match_cache import MatchCache
+from magif.utils.utils import normalize_path, read_file
+
+
+class TestMatchCache(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestMatchCache')
+		self.directory = tempfile.TemporaryDirectory()
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	@staticmethod
+	def _seat(strategy_name, default_move="C"):
+		strategy_rules = read_file(normalize_path(f"DATA/STRATEGIES/{strategy_name}.pl"))
+		game = SimpleNamespace(game_rules="pd", strategy_rules=strategy_rules, default_move=default_move,
+							   move_table=MoveTable())
+		return Seat(SimpleNamespace(game=game, strategy_name=strategy_name, native_strategy=None))
+
+	@staticmethod
+	def _play(seats, moves):
+		for seat, own, other, payoff in zip(seats, moves, reversed(moves), ([3, 0], [3, 5])):
+			seat.memory.moves.extend(own)
+			seat.memory.opponent_moves.extend(other)
+			seat.memory.payoffs.extend(payoff)
+
+	def test_mirror_pairing(self):
+		"""Test that a match is replayed for the same pairing and, seat by seat, for the mirrored pairing."""
+		cache = MatchCache()
+		seats = [self._seat("tit-for-tat"), self._seat("anti-tit-for-tat")]
+		key = cache.key(seats, 2)
+		self.assertFalse(cache.replay(key, seats))
+		self._play(seats, (["C", "C"], ["C", "D"]))
+		cache.record(key, seats)
+
+		mirrored = [self._seat("anti-tit-for-tat"), self._seat("tit-for-tat")]
+		self.assertTrue(cache.replay(cache.key(mirrored, 2), mirrored))
+		self.assertEqual(seats[1].memory.moves, mirrored[0].memory.moves)
+		self.assertEqual(seats[0].memory.payoffs, mirrored[1].memory.payoffs)
+		self.assertIsNone(cache.key([self._seat("random"), self._seat("tit-for-tat")], 2))
+		self.assertNotEqual(key, cache.key(seats, 3))
+
+	def test_key_follows_rules_and_default_move(self):
+		"""Test that determinism is read from the rules, not the name, and that the default move is in the key."""
+		cache = MatchCache()
+		seats = [self._seat("tit-for-tat"), self._seat("tit-for-tat")]
+		overridden = [self._seat("tit-for-tat", default_move="D"), self._seat("tit-for-tat")]
+		self.assertNotEqual(cache.key(seats, 2), cache.key(overridden, 2))
+
+		renamed = self._seat("tit-for-tat")
+		renamed.agent.game.strategy_rules = read_file(normalize_path("DATA/STRATEGIES/random.pl"))
+		self.assertIsNone(cache.key([renamed, self._seat("tit-for-tat")], 2))
+
+	def test_disk_store(self):
+		"""Test that entries recorded in the database are replayed by another cache using it."""
+		path = os.path.join(self.directory.name, "matches.db")
+		seats = [self._seat("tit-for-tat"), self._seat("tit-for-tat")]
+		cache = MatchCache(path)
+		self._play(seats, (["C", "C"], ["C", "C"]))
+		cache.record(cache.key(seats, 2), seats)
+		cache.close()
+
+		replayed = [self._seat("tit-for-tat"), self._seat("tit-for-tat")]
+		other = MatchCache(path)
+		self.assertTrue(other.replay(other.key(replayed, 2), replayed))
+		self.assertEqual(seats[0].memory.payoffs, replayed[0].memory.payoffs)
+		other.close()
+
+
+if __name__ == '__main__':
+	unittest.main()
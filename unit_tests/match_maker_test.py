@@ -0,0 +1,80 @@
+import unittest
+import itertools
+import logging
+from types import SimpleNamespace
+from magif.environment.match_maker import (ClonePairing, RandomOpponents, RoundRobin, SwissPairing, partition,
+										   schedule_rounds)
+
+
+class TestMatchMaker(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestMatchMaker')
+		self.agents = [object() for _ in range(5)]
+
+	def test_schedule_rounds_disjoint(self):
+		"""Test that no agent plays twice in a round and that every match is scheduled once."""
+		matches = list(itertools.combinations_with_replacement(self.agents, 2))
+		rounds = schedule_rounds(matches)
+		for round_matches in rounds:
+			agents = [id(agent) for match in round_matches for agent in set(match)]
+			self.assertEqual(len(agents), len(set(agents)))
+		self.assertEqual(sorted(map(id, matches)), sorted(id(match) for round_matches in rounds for match in round_matches))
+
+	def test_schedule_rounds_preserves_agent_order(self):
+		"""Test that each agent plays its matches in tournament order."""
+		matches = list(itertools.combinations(self.agents, 2))
+		rounds = schedule_rounds(matches)
+		round_of = {id(match): i for i, round_matches in enumerate(rounds) for match in round_matches}
+		for agent in self.agents:
+			agent_rounds = [round_of[id(match)] for match in matches if agent in match]
+			self.assertEqual(sorted(agent_rounds), agent_rounds)
+			self.assertEqual(len(set(agent_rounds)), len(agent_rounds))
+
+	def test_round_robin_is_lazy(self):
+		"""Test that round-robins generate their matches lazily, with and without self-play."""
+		matches = RoundRobin()(self.agents)
+		self.assertEqual((self.agents[0], self.agents[1]), next(matches))
+		self.assertEqual(10, 1 + len(list(matches)))
+		self.assertEqual(15, len(list(RoundRobin(self_play=True)(self.agents))))
+
+	def test_clone_pairing(self):
+		"""Test that each original agent plays the clone at the same position in the second half."""
+		agents = self.agents[:4]
+		self.assertEqual([(agents[0], agents[2]), (agents[1], agents[3])], list(ClonePairing()(agents)))
+
+	def test_classes_match_index_lambdas(self):
+		"""Test that the match maker classes give the matches of the index lambdas they replace."""
+		self.assertEqual(list(itertools.combinations_with_replacement(self.agents, 2)),
+						 list(RoundRobin(self_play=True)(self.agents)))
+		agents = self.agents[:4]
+		self.assertEqual([(agents[i], agents[i + 2]) for i in range(2)], list(ClonePairing(2)(agents)))
+		self.assertEqual(list(ClonePairing(2)(agents)), list(ClonePairing()(agents)))
+
+	def test_random_opponents(self):
+		"""Test that each agent plays k distinct opponents other than itself, reproducibly for a seed."""
+		matches = list(RandomOpponents(3, seed=7)(self.agents))
+		self.assertEqual(matches, list(RandomOpponents(3, seed=7)(self.agents)))
+		for agent in self.agents:
+			opponents = [id(opponent) for first, opponent in matches if first is agent]
+			self.assertEqual(3, len(set(opponents)))
+			self.assertNotIn(id(agent), opponents)
+
+	def test_swiss_pairing(self):
+		"""Test that Swiss rounds pair agents by score without rematches and rotate the bye."""
+		agents = [SimpleNamespace(memory=SimpleNamespace(payoffs=[score])) for score in (5, 4, 3, 2, 1)]
+		matches = list(SwissPairing(3, seed=0)(agents))
+		self.assertEqual((agents[0], agents[1]), matches[0])
+		self.assertEqual(6, len(matches))
+		self.assertEqual(6, len({frozenset(map(id, match)) for match in matches}))
+
+	def test_partition_balances_cost(self):
+		"""Test that partitions are contiguous, non-empty and balanced by estimated cost."""
+		matches = [(cost,) for cost in (8, 1, 1, 1, 1, 1, 1, 1, 1)]
+		parts = partition(matches, 2, cost=lambda match: match[0])
+		self.assertEqual(matches, [match for part in parts for match in part])
+		self.assertEqual([[(8,)], [(1,)] * 8], parts)
+		self.assertEqual(4, len(partition(matches[:4], 6)))
+
+
+if __name__ == "__main__":
+	unittest.main()
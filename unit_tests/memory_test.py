@@ -0,0 +1,67 @@
+import unittest
+import logging
+from magif.agent.memory import History, Memory, MoveHistory, MoveTable
+
+
+class TestMemory(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestMemory')
+
+	def test_histories_behave_as_lists(self):
+		"""Test that moves are interned and histories read back as lists."""
+		memory = Memory(table=MoveTable())
+		memory.moves.extend(["C", "D", "C"])
+		memory.opponent_moves.append(("C", "D"))
+		memory.payoffs.extend([3, 0.5])
+
+		self.assertEqual(["C", "D", "C"], memory.moves)
+		self.assertEqual("D", memory.moves[1])
+		self.assertEqual(["D", "C"], memory.moves[-2:])
+		self.assertEqual([("C", "D")], memory.opponent_moves)
+		self.assertEqual([0, 1, 0], memory.moves.view().tolist())
+		self.assertEqual(3.5, sum(memory.payoffs))
+
+	def test_window_keeps_recent_rounds(self):
+		"""Test that a bounded history keeps the last rounds while counting all of them."""
+		history = History(range(10), window=3)
+		self.assertEqual(10, len(history))
+		self.assertEqual([7.0, 8.0, 9.0], list(history))
+		self.assertEqual([8.0, 9.0], history[8:])
+		self.assertEqual([7.0, 8.0, 9.0], history[2:])
+		self.assertEqual([7.0, 8.0, 9.0], history.view().tolist())
+		with self.assertRaises(IndexError):
+			history[6]
+
+	def test_codes_widen_with_the_table(self):
+		"""Test that move codes are widened once the table outgrows their type."""
+		history = MoveHistory(range(300), table=MoveTable())
+		self.assertEqual(299, history[-1])
+		self.assertEqual(list(range(300)), history)
+
+	def test_integer_payoffs_stay_integers(self):
+		"""Test that integer payoffs read back as integers until a fractional payoff widens them."""
+		memory = Memory()
+		memory.payoffs.extend([3, 0])
+		memory.payoffs.append(5)
+		self.assertEqual([3, 0, 5], memory.payoffs)
+		self.assertTrue(all(isinstance(payoff, int) for payoff in memory.payoffs))
+		memory.payoffs.append(0.5)
+		self.assertEqual([3.0, 0.0, 5.0, 0.5], memory.payoffs)
+
+	def test_payoffs_must_be_numbers(self):
+		"""Test that payoffs that are not numbers are rejected, leaving the history unchanged."""
+		memory = Memory()
+		memory.payoffs.extend([True, 3])
+		for payoffs in (["2"], [1, None], [b"1"]):
+			with self.subTest(payoffs=payoffs):
+				with self.assertRaises(TypeError):
+					memory.payoffs.extend(payoffs)
+		for payoff in ("2", None):
+			with self.subTest(payoff=payoff):
+				with self.assertRaises(TypeError):
+					memory.payoffs.append(payoff)
+		self.assertEqual([1, 3], memory.payoffs)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import logging
+from magif.game.payoff_tensor import PayoffTensor
+
+
+class TestPayoffTensor(unittest.TestCase):
+	def setUp(self):
+		"""
+		Set up profiles in the format returned by the payoff_profiles/1 solver predicate.
+		"""
+		logging.debug('Setting up TestPayoffTensor')
+		self.players = ["player1", "player2"]
+		self.profiles = [
+			[[["player1", "Move1"], ["player2", "Move1"]], [["player1", 0], ["player2", 0]]],
+			[[["player1", "Move1"], ["player2", "Move2"]], [["player1", 1], ["player2", -1]]],
+			[[["player1", "Move2"], ["player2", "Move1"]], [["player1", -1], ["player2", 1]]],
+			[[["player1", "Move2"], ["player2", "Move2"]], [["player1", 2], ["player2", 2]]],
+			# The same profile reached with the moves made in the opposite order.
+			[[["player2", "Move2"], ["player1", "Move1"]], [["player1", 1], ["player2", -1]]],
+		]
+
+	def test_from_profiles(self):
+		"""Test that profiles are stored once, ordered by players."""
+		tensor = PayoffTensor.from_profiles(self.players, self.profiles)
+		self.assertEqual(4, len(tensor))
+		self.assertEqual((1, -1), tensor.get(["Move1", "Move2"]))
+		self.assertEqual(-1, tensor.payoff(["Move2", "Move1"]))
+		self.assertEqual(1, tensor.payoff(["Move2", "Move1"], player_index=1))
+		self.assertEqual(1.0, tensor.density())
+
+	def test_incomplete_profiles_skipped(self):
+		"""Test that profiles missing a player's move or utility are not stored."""
+		profiles = self.profiles + [[[["player1", "Move3"]], [["player1", 5], ["player2", 5]]]]
+		tensor = PayoffTensor.from_profiles(self.players, profiles)
+		self.assertNotIn(["Move3", "Move1"], tensor)
+		self.assertIsNone(tensor.payoff(["Move3", "Move1"]))
+
+	def test_three_players_sparse(self):
+		"""Test an n-player tensor where only some combinations are reachable."""
+		tensor = PayoffTensor(["a", "b", "c"])
+		tensor.set(["x", "x", "x"], [1, 1, 1])
+		tensor.set(["y", "y", "y"], [2, 2, 2])
+		self.assertEqual(0.25, tensor.density())
+		axes, dense = tensor.to_dense()
+		self.assertEqual((2, 2, 2, 3), dense.shape)
+		self.assertEqual(2, dense[1, 1, 1, 0])
+		with self.assertRaises(ValueError):
+			tensor.set(["x", "y"], [1, 2])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import logging
+from magif.environment.match_result import MatchResult
+from magif.environment.replication import estimate, replicate_seed, replicate_totals, summarize_replicates
+
+
+class TestReplication(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestReplication')
+
+	def test_replicate_seeds(self):
+		"""Test that seeds depend only on the base seed, the replicate and the agent."""
+		self.assertEqual(replicate_seed(3, 1, 2), replicate_seed(3, 1, 2))
+		seeds = {replicate_seed(3, replicate, agent) for replicate in range(10) for agent in range(10)}
+		self.assertEqual(100, len(seeds))
+
+	def test_estimate(self):
+		"""Test the mean, sample variance and normal confidence interval."""
+		payoff = estimate([1.0, 2.0, 3.0, 4.0])
+		self.assertEqual(2.5, payoff.mean)
+		self.assertAlmostEqual(5 / 3, payoff.variance)
+		self.assertAlmostEqual(1.96 * (5 / 12) ** 0.5, payoff.high - payoff.mean, places=3)
+		self.assertEqual((5.0, 5.0), (estimate([5.0]).low, estimate([5.0]).high))
+
+	def test_summarize_replicates(self):
+		"""Test that per-strategy payoffs average the agents with the strategy in each replicate."""
+		results = [MatchResult(0, (0, 1), payoffs={0: [3, 0], 1: [3, 5]}), MatchResult(1, (1, 2), payoffs={1: [1], 2: [1]})]
+		self.assertEqual([3.0, 9.0, 1.0], replicate_totals(results, 3))
+		result = summarize_replicates(["Ba", "Ce", "Di"], ["tft", "grim", "tft"], [[3.0, 9.0, 1.0], [5.0, 7.0, 3.0]],
+									  base_seed=0, replicates=[0, 1])
+		self.assertEqual([3.0, 5.0], result.samples["Ba"])
+		self.assertEqual(3.0, result.strategy_payoffs["tft"].mean)
+		self.assertEqual(8.0, result.strategy_payoffs["grim"].mean)
+
+
+if __name__ == '__main__':
+	unittest.main()
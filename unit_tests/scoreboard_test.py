@@ -0,0 +1,33 @@
+import unittest
+import logging
+from types import SimpleNamespace
+from magif.environment.scoreboard import Scoreboard
+
+
+class TestScoreboard(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestScoreboard')
+		self.agents = [SimpleNamespace(memory=SimpleNamespace(payoffs=payoffs)) for payoffs in ([3, 3], [5], [], [1])]
+		self.scoreboard = Scoreboard()
+		for agent in self.agents:
+			self.scoreboard.track(agent)
+
+	def test_running_totals(self):
+		"""Test that totals and averages follow the added payoffs without summing the memory again."""
+		self.agents[2].memory.payoffs.extend([0, 5])
+		self.scoreboard.add(self.agents[2], 5, 2)
+		self.assertEqual(5, self.scoreboard.total(self.agents[2]))
+		self.assertEqual(2.5, self.scoreboard.average(self.agents[2]))
+		self.assertEqual(3, self.scoreboard.average(self.agents[0]))
+
+	def test_ranking(self):
+		"""Test that top-k and winners follow the totals, keep ties in order and respect the ranked agents."""
+		self.scoreboard.add(self.agents[1], 1, 1)
+		self.assertEqual([self.agents[0], self.agents[1]], self.scoreboard.winners())
+		self.assertEqual([(self.agents[0], 6), (self.agents[1], 6), (self.agents[3], 1)], self.scoreboard.top(3))
+		self.assertEqual([self.agents[3]], self.scoreboard.winners(self.agents[2:]))
+		self.assertEqual([], self.scoreboard.winners([]))
+
+
+if __name__ == '__main__':
+	unittest.main()
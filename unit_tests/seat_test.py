@@ -0,0 +1,46 @@
+import unittest
+import logging
+from types import SimpleNamespace
+from magif.agent.seat import Seat, seat_seed
+from magif.agent.strategy_library import create_native_strategy
+from magif.game.game import Game
+
+
+class TestSeat(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestSeat')
+		self.agent = SimpleNamespace(game=Game(), native_strategy=create_native_strategy("grim-trigger", "C", "D", ["C", "D"]))
+
+	def test_record_round(self):
+		"""Test that round facts follow record_round/4: the last opponent move becomes the previous one."""
+		seat = Seat(self.agent)
+		seat.record_round("player1", "C", [("player2", "D")])
+		seat.record_round("player1", "D", [("player2", "C")])
+		self.assertEqual(
+			["own_last_move(player1, 'D')", "last_move(player2, 'C')", "previous_move(player2, 'D')"],
+			seat.fact_terms())
+
+	def test_seats_are_independent(self):
+		"""Test that seats of the same agent do not share history or native strategy state."""
+		first, second = Seat(self.agent), Seat(self.agent)
+		first.memory.moves.append("C")
+		first.native_strategy = None
+		self.assertEqual([], second.memory.moves)
+		self.assertIsNotNone(second.native_strategy)
+		self.assertIsNot(self.agent.native_strategy, second.native_strategy)
+
+	def test_seats_draw_their_own_random_sequences(self):
+		"""Test that seats of a seeded stochastic strategy draw a sequence per match, repeatable from the seed."""
+		agent = SimpleNamespace(game=Game(), native_strategy=create_native_strategy("seeded-random", "C", "D", ["C", "D"], seed=3))
+
+		def play(seat):
+			return [seat.native_strategy.select([], []) for _ in range(30)]
+
+		first, second = Seat(agent, seed=seat_seed(3, 0, 0)), Seat(agent, seed=seat_seed(3, 1, 0))
+		self.assertNotEqual(play(first), play(second))
+		self.assertEqual(play(Seat(agent, seed=seat_seed(3, 1, 0))), play(Seat(agent, seed=seat_seed(3, 1, 0))))
+		self.assertNotEqual(seat_seed(3, 0, 0), seat_seed(3, 0, 1))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+import logging
+from magif.agent.agent import Agent
+from magif.agent.mind import Mind
+from magif.game.payoff_tensor import PayoffTensor
+from magif.utils.utils import AgentStatus
+
+
+class TestSnapshot(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestSnapshot')
+
+	def _agent(self, name):
+		agent = Agent(autoformalization_on=False)
+		agent.mind = Mind(agent)
+		agent.name = name
+		agent.strategy_name = "tit-for-tat"
+		agent.status = AgentStatus.CORRECT
+		agent.game.game_rules = "possible(move(_, c), s0)."
+		agent.game.strategy_rules = "select(_, _, _, c)."
+		agent.game.game_players = ["player1", "player2"]
+		agent.game.game_moves = ["c", "d"]
+		agent.game.default_move = "c"
+		agent.game.set_payoff_tensor(PayoffTensor(["player1", "player2"], {("c", "c"): (3, 3), ("c", "d"): (0, 5)}))
+		agent.memory.moves = ["c", "d", "c"]
+		agent.memory.opponent_moves = ["d", "c", ("c", "d")]
+		agent.memory.payoffs = [0.0, 5.0, 3.0]
+		return agent
+
+	async def test_restore_without_starting_solver(self):
+		"""Test that a snapshot restores the agent's game and histories without starting its solver."""
+		with tempfile.TemporaryDirectory() as directory:
+			path = self._agent("Abc").save_snapshot(directory)
+			self._agent("Def").save_snapshot(directory)
+			# Both agents share their rules, stored once each.
+			self.assertEqual(2, len(os.listdir(os.path.join(directory, "rules"))))
+
+			agent = await Agent.restore(path)
+
+		self.assertEqual("Abc", agent.name)
+		self.assertEqual(AgentStatus.CORRECT, agent.status)
+		self.assertEqual("tit-for-tat", agent.strategy_name)
+		self.assertEqual("select(_, _, _, c).", agent.game.strategy_rules)
+		self.assertEqual(["c", "d", "c"], agent.memory.moves)
+		self.assertEqual(["d", "c", ("c", "d")], agent.memory.opponent_moves)
+		self.assertEqual([0.0, 5.0, 3.0], agent.memory.payoffs)
+		self.assertEqual((0, 5), agent.game.payoff_tensor.get(("c", "d")))
+		self.assertFalse(agent.solver.started)
+
+	async def test_missing_rules(self):
+		"""Test that restoring a snapshot whose rules are not in the store fails."""
+		with tempfile.TemporaryDirectory() as directory:
+			path = self._agent("Abc").save_snapshot(directory, rule_store_dir=os.path.join(directory, "store"))
+			with self.assertRaises(FileNotFoundError):
+				await Agent.restore(path)
+
+
+if __name__ == '__main__':
+	unittest.main()
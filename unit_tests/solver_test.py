@@ -0,0 +1,53 @@
+import json
+import unittest
+import logging
+from magif.solver.solver import Solver
+from magif.solver.solver_utils import solver_source
+from magif.utils.utils import normalize_path
+
+# The round facts of the game state.
+ROUND_FACTS = ("findall(F, (member(F, [own_last_move(_, _), last_move(_, _), previous_move(_, _)]), "
+			   "initially(F, s0)), Facts).")
+
+
+class TestSolver(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestSolver')
+
+	def test_engine_starts_lazily(self):
+		"""Test that constructing, updating and releasing an unused solver never starts an engine."""
+		solver = Solver(solver_source(), game_string="move(c).")
+		solver.strategy_string = "select(_, _, _, c)."
+		self.assertEqual([solver_source(), "move(c).", "select(_, _, _, c)."], solver.get_params())
+		solver.release()
+		self.assertFalse(solver.started)
+
+	def test_solver_source_is_read_once(self):
+		"""Test that the solver logic is read from disk once per process."""
+		self.assertIs(solver_source(), solver_source())
+		self.assertIn("select_in_state", solver_source())
+
+	def test_restored_state_matches_snapshot(self):
+		"""Test that restoring a snapshot brings back the round facts of the snapshot and the move they select."""
+		with open(normalize_path("unit_tests/LOGS/agent_Jekuti.json")) as f:
+			agent = json.load(f)
+		solver = Solver(solver_source(), agent["game_rules"], agent["strategy_rules"])
+		try:
+			solver.record_round("player1", "Move1", [("player2", "Move2")])
+			snapshot = solver.engine.query(ROUND_FACTS).data
+			success, move = solver.select_move("player1")
+			self.assertTrue(solver.snapshot_state("match_start")[0])
+
+			solver.record_round("player1", "Move2", [("player2", "Move1")])
+			solver.record_round("player1", "Move1", [("player2", "Move1")])
+			self.assertNotEqual(snapshot, solver.engine.query(ROUND_FACTS).data)
+
+			self.assertTrue(solver.restore_state("match_start")[0])
+			self.assertEqual(snapshot, solver.engine.query(ROUND_FACTS).data)
+			self.assertEqual((success, move), solver.select_move("player1"))
+		finally:
+			solver.release()
+
+
+if __name__ == '__main__':
+	unittest.main()
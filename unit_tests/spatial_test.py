@@ -0,0 +1,41 @@
+import unittest
+import logging
+import numpy as np
+from magif.environment.spatial import Graph, NeighborMatchMaker, imitation_step, neighborhood_payoffs, spatial_dynamics
+
+
+class TestSpatial(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestSpatial')
+		self.matrix = np.array([[3.0, 0.0], [5.0, 1.0]])
+
+	def test_lattice(self):
+		"""Test the degrees and edges of periodic and bounded lattices."""
+		torus = Graph.lattice(3, 4, "moore")
+		self.assertTrue((torus.degrees() == 8).all())
+		self.assertEqual(48, torus.num_edges)
+		grid = Graph.lattice(3, 4, periodic=False)
+		self.assertEqual([1, 4], list(grid.neighbors(0)))
+		self.assertEqual(17, len(list(NeighborMatchMaker(grid)(list(range(12))))))
+
+	def test_imitate_best_neighbor(self):
+		"""Test that nodes adopt the strategy of their best-paid neighbor only if it was paid more."""
+		graph = Graph.from_edges(4, [0, 1, 2], [1, 2, 3])
+		strategies = np.array([0, 0, 1, 0])
+		payoffs = neighborhood_payoffs(graph, self.matrix, strategies)
+		self.assertEqual([3, 3, 10, 0], list(payoffs))
+		self.assertEqual([0, 1, 1, 1], list(imitation_step(graph, strategies, payoffs)))
+
+	def test_dynamics_shares(self):
+		"""Test that the shares of every generation sum to one and that seeded runs are reproducible."""
+		graph = Graph.lattice(10, 10, "moore")
+		strategies = np.random.default_rng(0).integers(2, size=100)
+		history, _ = spatial_dynamics(graph, self.matrix, strategies, generations=5, rule="fermi", seed=1)
+		self.assertEqual((6, 2), history.shape)
+		self.assertTrue(np.allclose(1.0, history.sum(axis=1)))
+		again, _ = spatial_dynamics(graph, self.matrix, strategies, generations=5, rule="fermi", seed=1)
+		self.assertTrue((history == again).all())
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import logging
+from types import SimpleNamespace
+from magif.agent.memory import MoveTable
+from magif.agent.mind import Mind
+from magif.agent.seat import Seat
+from magif.agent.strategy_library import STRATEGY_LIBRARY, NativeStrategy, create_native_strategy
+
+
+class TestStrategyLibrary(unittest.TestCase):
+	def setUp(self):
+		logging.debug('Setting up TestStrategyLibrary')
+		self.moves = ["C", "D"]
+
+	def _play(self, name, opponent_moves, seed=None):
+		"""
+		Play a strategy against a fixed sequence of opponent moves and return its moves.
+		"""
+		strategy = create_native_strategy(name, "C", "D", self.moves, seed=seed)
+		own_moves = []
+		for i in range(len(opponent_moves)):
+			own_moves.append(strategy.select(own_moves, opponent_moves[:i]))
+		return own_moves
+
+	def test_library_names_match_prolog_files(self):
+		"""Test that every native strategy is registered under the name of its Prolog file."""
+		self.assertEqual({"generous-tit-for-tat", "pavlov", "grim-trigger", "tit-for-two-tats", "seeded-random"},
+						 set(STRATEGY_LIBRARY))
+		self.assertIsNone(create_native_strategy("tit-for-tat", "C", "D", self.moves))
+
+	def test_grim_trigger(self):
+		"""Test that grim trigger deviates forever after the opponent's first deviation."""
+		self.assertEqual(["C", "C", "D", "D", "D"], self._play("grim-trigger", ["C", "D", "C", "C", "C"]))
+
+	def test_tit_for_two_tats(self):
+		"""Test that tit-for-two-tats only answers two deviations in a row."""
+		self.assertEqual(["C", "C", "C", "C", "C", "D", "C"], self._play("tit-for-two-tats", ["C", "D", "C", "D", "D", "C", "C"]))
+
+	def test_pavlov(self):
+		"""Test that Pavlov stays after matching moves and shifts otherwise."""
+		self.assertEqual(["C", "C", "D", "C", "C"], self._play("pavlov", ["C", "D", "D", "C", "C"]))
+
+	def test_stochastic_strategies(self):
+		"""Test that stochastic strategies stay in their support and are repeatable with a seed."""
+		opponent_moves = ["D"] * 50
+		generous = self._play("generous-tit-for-tat", opponent_moves, seed=1)
+		self.assertEqual({"C", "D"}, set(generous))
+		self.assertEqual(generous, self._play("generous-tit-for-tat", opponent_moves, seed=1))
+		self.assertEqual(self._play("seeded-random", opponent_moves, seed=7),
+						 self._play("seeded-random", opponent_moves, seed=7))
+
+
+class ScriptedSolver:
+	"""A stand-in for an agent's solver, selecting moves from a fixed sequence."""
+
+	def __init__(self, moves):
+		self.moves = iter(moves)
+		self.queries = 0
+
+	def select_move_in_state(self, agent_name, facts):
+		self.queries += 1
+		return True, next(self.moves)
+
+
+class TestNativeCrossCheck(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		logging.debug('Setting up TestNativeCrossCheck')
+
+	def _seat(self, solver_moves, check_interval):
+		game = SimpleNamespace(game_players=["player1", "player2"], move_table=MoveTable())
+		agent = SimpleNamespace(name="Abc", strategy_name="grim-trigger", game=game, solver=ScriptedSolver(solver_moves),
+								native_check_interval=check_interval, websocket=None,
+								native_strategy=create_native_strategy("grim-trigger", "C", "D", ["C", "D"]))
+		agent.mind = Mind(agent)
+		return agent, Seat(agent)
+
+	async def _play(self, agent, seat, opponent_moves):
+		for opponent_move in opponent_moves:
+			await agent.mind.act(seat)
+			seat.memory.opponent_moves.append(opponent_move)
+
+	async def test_matching_native_strategy_is_kept(self):
+		"""Test that the solver is only queried every `native_check_interval` moves while the two agree."""
+		agent, seat = self._seat(["C", "D"], check_interval=2)
+		await self._play(agent, seat, ["D", "C", "C", "C"])
+		self.assertEqual(["C", "D", "D", "D"], seat.memory.moves)
+		self.assertEqual(2, agent.solver.queries)
+		self.assertIsNotNone(seat.native_strategy)
+
+	async def test_mismatch_falls_back_to_solver(self):
+		"""Test that a native strategy disagreeing with the solver is dropped and the solver's move played."""
+		agent, seat = self._seat(["C", "C", "C"], check_interval=2)
+		await self._play(agent, seat, ["D", "C", "C", "C"])
+		self.assertEqual(["C", "D", "C", "C"], seat.memory.moves)
+		self.assertIsNone(seat.native_strategy)
+		self.assertEqual(3, agent.solver.queries)
+		# The agent's own native strategy is untouched; only the seat falls back.
+		self.assertIsNotNone(agent.native_strategy)
+
+	def test_native_strategy_is_abstract(self):
+		"""Test that a native strategy must define its support."""
+		with self.assertRaises(TypeError):
+			NativeStrategy("C", "D", ["C", "D"])
+
+
+if __name__ == "__main__":
+	unittest.main()
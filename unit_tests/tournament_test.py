@@ -1,11 +1,14 @@
+import os
+import tempfile
 import unittest
 import itertools
 from magif.environment.environment import Environment
+from magif.environment.match_maker import RoundRobin
 from magif.agent.agent import Agent
 from magif.environment.agent_pool import AgentPool
 import logging
 from magif.utils.setup_logger import logger
-from magif.utils.utils import generate_agent_name, Mode, normalize_path
+from magif.utils.utils import generate_agent_name, AgentStatus, Mode, normalize_path
 from magif.utils.data_object import DataObject
 
 
@@ -37,6 +40,30 @@ class TestTournament(unittest.IsolatedAsyncioTestCase):
 			agent.name = generate_agent_name(3)
 			self.agent_pool.add_agent(agent)
 
+	async def test_load_many_matches_loading_one_at_a_time(self):
+		"""
+		Test that agents loaded concurrently are the agents loaded one at a time, in the order of their files, and
+		that a file which cannot be loaded gives an agent with the LOAD_ERROR status instead of raising.
+		"""
+		with tempfile.TemporaryDirectory() as directory:
+			broken_path = os.path.join(directory, "agent_broken.json")
+			with open(broken_path, "w") as f:
+				f.write("{\"name\": ")
+			paths = [self.agent_json_path, broken_path, self.agent_json_path]
+			agents = await Agent.load_many(paths, max_concurrency=2)
+
+			for path, agent in zip(paths, agents):
+				single = Agent(autoformalization_on=False)
+				if path == broken_path:
+					with self.assertRaises(ValueError):
+						await single.initialize(agent_json_path=path)
+					self.assertEqual(("agent_broken", AgentStatus.LOAD_ERROR), (agent.name, agent.status))
+				else:
+					await single.initialize(agent_json_path=path)
+					self.assertEqual(single.agent_log(), agent.agent_log())
+				single.release_solver()
+				agent.release_solver()
+
 	async def test_tournament_round_robin_play(self):
 		"""
 		Test that a tournament runs correctly with agents loaded from JSON files.
@@ -170,6 +197,55 @@ class TestTournament(unittest.IsolatedAsyncioTestCase):
 		)
 		self.agent_pool.clean_agents()
 
+	async def _play_pool(self, default_move=None, **options):
+		"""
+		Play a round robin of three agents, one of them with the anti-tit-for-tat strategy and another one with the
+		given default move, if any, and return the agents' histories and statuses and the match summaries.
+		"""
+		agents = await Agent.load_many([self.agent_json_path] * 3)
+		strategy_data = DataObject(rules_path=normalize_path("DATA/STRATEGIES/anti-tit-for-tat.pl"), mode=Mode.RULES_PATH)
+		await agents[1].set_strategy(strategy_data)
+		if default_move is not None:
+			agents[2].update_default_move(default_move)
+		agent_pool = AgentPool()
+		for i, agent in enumerate(agents):
+			agent.name = f"Agent{i}"
+			agent_pool.add_agent(agent)
+
+		tournament = Environment(agent_pool=agent_pool, num_rounds=self.num_rounds, match_maker=self.match_maker,
+								 **options)
+		await tournament.play_tournament()
+		results = ([(list(agent.memory.moves), list(agent.memory.opponent_moves), list(agent.memory.payoffs),
+					 agent.status) for agent in agents], tournament.match_summaries)
+		agent_pool.clean_agents()
+		return results
+
+	async def test_sharded_tournament_matches_serial(self):
+		"""
+		Test that sharding the matches across worker processes gives the histories, statuses and match summaries of
+		playing them one after another.
+		"""
+		serial_histories, serial_summaries = await self._play_pool()
+		sharded_histories, sharded_summaries = await self._play_pool(num_workers=2)
+		self.assertEqual(6, len(serial_summaries))
+		self.assertEqual(serial_histories, sharded_histories)
+		self.assertEqual(serial_summaries, sharded_summaries)
+
+	async def test_lazy_round_robin_matches_list(self):
+		"""Test that a tournament played with the lazy round-robin plays as with the list of its matches."""
+		expected = await self._play_pool()
+		self.assertEqual(6, len(expected[1]))
+		self.match_maker = RoundRobin(self_play=True)
+		self.assertEqual(expected, await self._play_pool())
+
+	async def test_sharded_tournament_keeps_updated_default_move(self):
+		"""Test that the worker processes play an agent with the default move it was updated to."""
+		serial_histories, serial_summaries = await self._play_pool(default_move="Move2")
+		sharded_histories, sharded_summaries = await self._play_pool(default_move="Move2", num_workers=2)
+		self.assertEqual("Move2", serial_histories[2][0][0])
+		self.assertEqual(serial_histories, sharded_histories)
+		self.assertEqual(serial_summaries, sharded_summaries)
+
 
 if __name__ == "__main__":
 	unittest.main()
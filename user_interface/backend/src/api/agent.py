@@ -346,4 +346,5 @@ async def websocket_endpoint(
         session_manager.remove_session(websocket)
         await websocket.close()
     except Exception as e:
-        print("Unexpected error:", e)
\ No newline at end of file
+        print("Unexpected error:", e)
+        session_manager.remove_session(websocket)
\ No newline at end of file
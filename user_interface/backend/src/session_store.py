@@ -9,13 +9,19 @@ class SessionManager:
         if websocket not in self.sessions:
             raise TypeError("Session does not exists")
 
+        previous = self.sessions[websocket].get(key)
         self.sessions[websocket][key] = value
+        # A replaced agent's Prolog engine would otherwise outlive the session.
+        if key == "agent" and previous is not None and previous is not value:
+            previous.release_solver()
 
     def get_session(self, websocket):
         return self.sessions.setdefault(websocket, {})
     
     def remove_session(self, websocket):
-        self.sessions.pop(websocket, None) 
+        session = self.sessions.pop(websocket, None)
+        if session and session.get("agent") is not None:
+            session["agent"].release_solver()
 
 # Single global instance
 session_manager = SessionManager()
\ No newline at end of file